@@ -122,10 +122,9 @@ class DemoSimulator:
         
         # Get pump power from optimization schedules (time_step 0 = current step)
         pump_power_map: Dict[str, float] = {}
-        if opt_result.schedules:
-            for schedule in opt_result.schedules:
-                if schedule.time_step == 0 and schedule.is_on:
-                    pump_power_map[schedule.pump_id] = schedule.power_kw
+        for schedule in opt_result.step0_schedules:
+            if schedule.is_on:
+                pump_power_map[schedule.pump_id] = schedule.power_kw
         
         # Determine pump type (big vs small)
         # Small pumps: 1.1, 2.1 (200 kW max)
@@ -177,36 +176,28 @@ class DemoSimulator:
                 "price_c_per_kwh": [],
             }
         
-        # Calculate baseline cost and energy for CURRENT STEP ONLY (15 minutes)
-        baseline_cost_eur = 0.0
-        baseline_energy_kwh = 0.0
-        baseline_outflow_m3_s = 0.0  # Total outflow (sum of all pumps)
-        if result.baseline_schedule:
-            dt_hours = self.reoptimize_interval_minutes / 60.0
-            for pump_id, pump_data in result.baseline_schedule.items():
-                if pump_data.get('is_on', False):
-                    power_kw = pump_data.get('power_kw', 0.0)
-                    flow_m3_s = pump_data.get('flow_m3_s', 0.0)
-                    baseline_energy_kwh += power_kw * dt_hours
-                    baseline_cost_eur += power_kw * dt_hours * (result.current_state.price_c_per_kwh / 100.0)
-                    baseline_outflow_m3_s += flow_m3_s  # Sum all pump flows
+        # Baseline cost and energy for CURRENT STEP ONLY (15 minutes), reduced from the
+        # prefetched baseline arrays when the step was recorded
+        baseline_cost_eur = result.baseline_step.cost_eur
+        baseline_energy_kwh = result.baseline_step.energy_kwh
+        baseline_outflow_m3_s = result.baseline_step.outflow_m3_s  # Total outflow (sum of all pumps)
         
         # Calculate optimized cost and energy for CURRENT STEP ONLY (time_step 0)
         # This matches baseline which is for 1 step
         optimized_cost_eur_current_step = 0.0
         optimized_energy_kwh_current_step = 0.0
-        dt_hours = self.reoptimize_interval_minutes / 60.0
         if opt_result.schedules and forecast:
             # Get price for current step (time_step 0)
             price_c_per_kwh_current = result.current_state.price_c_per_kwh
             if len(forecast.price_c_per_kwh) > 0:
                 price_c_per_kwh_current = forecast.price_c_per_kwh[0]
             
-            # Sum cost/energy for all pumps at time_step 0
-            for schedule in opt_result.schedules:
-                if schedule.time_step == 0 and schedule.is_on:
-                    optimized_energy_kwh_current_step += schedule.power_kw * dt_hours
-                    optimized_cost_eur_current_step += schedule.power_kw * dt_hours * (price_c_per_kwh_current / 100.0)
+            # Sum power for all pumps at time_step 0, then scale once
+            optimized_power_kw = sum(
+                s.power_kw for s in opt_result.step0_schedules if s.is_on
+            )
+            optimized_energy_kwh_current_step = optimized_power_kw * dt_hours
+            optimized_cost_eur_current_step = optimized_power_kw * dt_hours * (price_c_per_kwh_current / 100.0)
         
         # Calculate optimized outflow for smoothness (time series across horizon)
         optimized_outflow_m3_s = []
@@ -442,12 +433,20 @@ class DemoSimulator:
         # Use simulator's internal state
         simulated_l1 = initial_state.l1_m
         
+        # Historical state of every step with a single index lookup (one entry per
+        # loop iteration below, indexed by step_index)
+        tick_times = self.simulator._tick_times(start_time, end_time)
+        tick_states = self.data_loader.get_states_for_range(tick_times, include_pump_states=False)
+        # Baseline schedules and their per-step totals, same indexing
+        tick_baselines = self.data_loader.get_baseline_arrays_for_range(tick_times)
+        tick_baseline_steps = self.simulator._reduce_baseline_steps(tick_baselines, tick_states)
+        
         try:
             while current_time <= end_time:
                 logger.info(f"🔄 Processing step {step_index + 1}/{total_steps} at {current_time.isoformat()}")
                 
-                # Get current state
-                current_state = self.data_loader.get_state_at_time(current_time, include_pump_states=False)
+                # Get current state (prefetched above)
+                current_state = tick_states[step_index]
                 if current_state is None:
                     logger.warning(f"⚠️ No data available at {current_time}, skipping...")
                     current_time += timedelta(minutes=self.reoptimize_interval_minutes)
@@ -467,9 +466,8 @@ class DemoSimulator:
                     if prev_result.optimization_result.success and prev_result.optimization_result.schedules:
                         prev_pump_states = {}
                         # Only use schedules from time_step=0 (current step) of previous optimization
-                        for schedule in prev_result.optimization_result.schedules:
-                            if schedule.time_step == 0:  # Only current step from previous optimization
-                                prev_pump_states[schedule.pump_id] = (schedule.pump_id, schedule.is_on, schedule.frequency_hz)
+                        for schedule in prev_result.optimization_result.step0_schedules:
+                            prev_pump_states[schedule.pump_id] = (schedule.pump_id, schedule.is_on, schedule.frequency_hz)
                         
                         updated_pump_states = []
                         for pump_id, _, _ in current_state.pump_states:
@@ -554,7 +552,7 @@ class DemoSimulator:
                             max_l1_m=max(opt_result.l1_trajectory) if opt_result.l1_trajectory else current_state.l1_m,
                             num_pumps_used=len([s for s in opt_result.schedules if s.is_on]) if opt_result.schedules else 0,
                             avg_outflow_m3_s=sum(s.flow_m3_s for s in opt_result.schedules if s.is_on) / len(opt_result.schedules) if opt_result.schedules else 0.0,
-                            price_range_c_per_kwh=(min(forecast.price_c_per_kwh), max(forecast.price_c_per_kwh)),
+                            price_range_c_per_kwh=forecast.price_range(),
                             risk_level="normal",
                             optimization_mode=opt_result.mode.value if opt_result.mode else "full",
                         )
@@ -592,13 +590,12 @@ class DemoSimulator:
                 # This ensures the first message shows pumps that should be ON after optimization
                 if opt_result.success and opt_result.schedules:
                     optimized_pump_states = {}
-                    for schedule in opt_result.schedules:
-                        if schedule.time_step == 0:  # Only current step
-                            optimized_pump_states[schedule.pump_id] = (
-                                schedule.pump_id,
-                                schedule.is_on,
-                                schedule.frequency_hz
-                            )
+                    for schedule in opt_result.step0_schedules:
+                        optimized_pump_states[schedule.pump_id] = (
+                            schedule.pump_id,
+                            schedule.is_on,
+                            schedule.frequency_hz
+                        )
                     
                     # Update pump states in current_state to reflect optimization results
                     updated_pump_states = []
@@ -609,8 +606,8 @@ class DemoSimulator:
                             updated_pump_states.append((pump_id, False, 0.0))
                     current_state.pump_states = updated_pump_states
                 
-                # Get baseline schedule
-                baseline_schedule = self.data_loader.get_baseline_schedule_at_time(current_time)
+                # Get baseline schedule (prefetched above)
+                baseline_schedule = tick_baselines.schedule_at(step_index)
                 
                 # Create simulation result with LLM-generated content
                 result = SimulationResult(
@@ -621,6 +618,8 @@ class DemoSimulator:
                     explanation=explanation,  # LLM explanation
                     strategy=strategy,  # Strategic guidance
                     strategic_plan=strategic_plan,  # Strategic plan
+                    optimized_step=self.simulator._reduce_optimized_step(opt_result, current_state),
+                    baseline_step=tick_baseline_steps[step_index],
                 )
                 
                 simulation.results.append(result)
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Deque
 from datetime import datetime
 
 import httpx
@@ -14,6 +16,16 @@ logger = logging.getLogger(__name__)
 # Suppress httpx INFO level HTTP request logs (only show WARNING/ERROR)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+# Default Featherless model. Any OpenAI-compatible model id works here,
+# including quantized variants (set LLM_MODEL to switch).
+DEFAULT_LLM_MODEL = "llama-3.1-8b-instruct"
+
+# System prompts are kept byte-identical across calls so servers with
+# prefix caching (e.g. vLLM) can reuse the KV cache for the shared prefix.
+_EXPLANATION_SYSTEM_PROMPT = "You are an expert operator assistant for wastewater pumping optimization. Provide clear, concise explanations of pump schedules in 2-3 sentences."
+_STRATEGIC_PLAN_SYSTEM_PROMPT = "You are an expert wastewater pumping system strategist. Analyze 24-hour forecasts and generate a high-level strategic plan with time periods and recommended approach. Respond in a structured format."
+_EMERGENCY_SYSTEM_PROMPT = "You are an expert wastewater pumping system operator responding to forecast errors. Provide immediate, actionable emergency response strategies. Be specific about constraint adjustments and pumping actions."
+
 
 @dataclass
 class ScheduleMetrics:
@@ -74,22 +86,18 @@ class EmergencyResponse:
 @dataclass
 class ForecastQualityTracker:
     """Tracks forecast errors over time and learns patterns."""
-    inflow_errors: List[float] = None  # List of percentage errors
-    price_errors: List[float] = None  # List of percentage errors
-    l1_errors: List[float] = None  # List of absolute errors (meters)
-    error_timestamps: List[datetime] = None
+    inflow_errors: Deque[float] = None  # Percentage errors
+    price_errors: Deque[float] = None  # Percentage errors
+    l1_errors: Deque[float] = None  # Absolute errors (meters)
+    error_timestamps: Deque[datetime] = None
     window_size: int = 50  # Track last N errors
     
     def __post_init__(self):
-        """Initialize lists if None."""
-        if self.inflow_errors is None:
-            self.inflow_errors = []
-        if self.price_errors is None:
-            self.price_errors = []
-        if self.l1_errors is None:
-            self.l1_errors = []
-        if self.error_timestamps is None:
-            self.error_timestamps = []
+        """Initialize bounded histories (oldest entries drop off on append)."""
+        self.inflow_errors = deque(self.inflow_errors or (), maxlen=self.window_size)
+        self.price_errors = deque(self.price_errors or (), maxlen=self.window_size)
+        self.l1_errors = deque(self.l1_errors or (), maxlen=self.window_size)
+        self.error_timestamps = deque(self.error_timestamps or (), maxlen=self.window_size)
     
     def add_error(
         self,
@@ -110,23 +118,13 @@ class ForecastQualityTracker:
             self.l1_errors.append(l1_error)
         
         self.error_timestamps.append(timestamp)
-        
-        # Keep only last N errors
-        if len(self.inflow_errors) > self.window_size:
-            self.inflow_errors.pop(0)
-        if len(self.price_errors) > self.window_size:
-            self.price_errors.pop(0)
-        if len(self.l1_errors) > self.window_size:
-            self.l1_errors.pop(0)
-        if len(self.error_timestamps) > self.window_size:
-            self.error_timestamps.pop(0)
     
     def get_recent_errors(self, n: int = 10) -> Dict[str, List[float]]:
         """Get last N errors for each type."""
         return {
-            'inflow': self.inflow_errors[-n:] if len(self.inflow_errors) >= n else self.inflow_errors,
-            'price': self.price_errors[-n:] if len(self.price_errors) >= n else self.price_errors,
-            'l1': self.l1_errors[-n:] if len(self.l1_errors) >= n else self.l1_errors,
+            'inflow': list(self.inflow_errors)[-n:],
+            'price': list(self.price_errors)[-n:],
+            'l1': list(self.l1_errors)[-n:],
         }
     
     def get_error_patterns(self) -> Dict[str, Any]:
@@ -161,8 +159,9 @@ class ForecastQualityTracker:
         # Analyze trend (if enough data)
         trend = 'stable'
         if len(self.inflow_errors) >= 10:
-            recent_errors = self.inflow_errors[-10:]
-            older_errors = self.inflow_errors[-20:-10] if len(self.inflow_errors) >= 20 else self.inflow_errors[:-10]
+            inflow_errors = list(self.inflow_errors)
+            recent_errors = inflow_errors[-10:]
+            older_errors = inflow_errors[-20:-10]
             if older_errors:
                 recent_avg = np.mean([abs(e) for e in recent_errors])
                 older_avg = np.mean([abs(e) for e in older_errors])
@@ -201,7 +200,7 @@ class ForecastQualityTracker:
         
         # Check if inflow errors are higher during surge-like conditions
         # If forecast is high (>1.5x average), assess confidence
-        recent_errors = self.inflow_errors[-20:] if len(self.inflow_errors) >= 20 else self.inflow_errors
+        recent_errors = list(self.inflow_errors)[-20:]
         avg_error = np.mean([abs(e) for e in recent_errors])
         
         # High error rate = low confidence in forecasts
@@ -220,11 +219,48 @@ class LLMExplainer:
         self,
         api_base: Optional[str] = None,
         api_key: Optional[str] = None,
-        model: str = "llama-3.1-8b-instruct",
+        model: str = DEFAULT_LLM_MODEL,
     ):
         self.api_base = api_base
         self.api_key = api_key
         self.model = model
+        # Shared HTTP client (keep-alive pool reused across LLM calls)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.api_base or "",
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_keepalive_connections=16),
+        )
+
+    async def _post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST with the pooled client of the event loop that opened it.
+
+        httpx connections are bound to the event loop that opened them. Calls
+        from any other loop (e.g. run_async_in_sync's worker-thread fallback,
+        which closes its loop right after the call) use a client scoped to the
+        request, so no open client is left behind on a dead loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop.is_closed():
+            self._client = self._new_client()
+            self._client_loop = loop
+        if self._client_loop is loop:
+            return await self._client.post(url, **kwargs)
+        async with self._new_client() as client:
+            return await client.post(url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     async def generate_explanation(
         self,
@@ -256,52 +292,48 @@ class LLMExplainer:
             logger.debug(f"LLM Prompt: {prompt[:200]}...")  # Log first 200 chars of prompt
             logger.debug(f"LLM Full Prompt:\n{prompt}")  # Full prompt at DEBUG level
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.api_base}/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert operator assistant for wastewater pumping optimization. Provide clear, concise explanations of pump schedules in 2-3 sentences.",
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt,
-                            },
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 200,
-                    },
-                )
-                response.raise_for_status()
-                
-                # Try to parse JSON response with better error handling
-                try:
-                    data = response.json()
-                except ValueError as json_err:
-                    # Log the raw response for debugging
-                    response_text = response.text
-                    logger.error(f"LLM: JSON parsing error: {json_err}")
-                    logger.error(f"LLM: Response status: {response.status_code}")
-                    logger.error(f"LLM: Response text (first 500 chars): {response_text[:500]}")
-                    logger.error(f"LLM: Response text (around error position 810): {response_text[max(0, 800):min(len(response_text), 820)]}")
-                    return None
-                
-                # Validate response structure
-                if "choices" not in data or len(data["choices"]) == 0:
-                    logger.error(f"LLM: Invalid response structure - no choices found: {data}")
-                    return None
-                
-                explanation = data["choices"][0]["message"]["content"].strip()
-                logger.debug(f"LLM: Successfully received explanation ({len(explanation)} chars)")
-                logger.debug(f"LLM Response: {explanation}")
-                return explanation
+            response = await self._post(
+                "/v1/chat/completions",
+                timeout=10.0,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": _EXPLANATION_SYSTEM_PROMPT,
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt,
+                        },
+                    ],
+                    "temperature": 0.7,
+                    "max_tokens": 200,
+                },
+            )
+            response.raise_for_status()
+            
+            # Try to parse JSON response with better error handling
+            try:
+                data = response.json()
+            except ValueError as json_err:
+                # Log the raw response for debugging
+                response_text = response.text
+                logger.error(f"LLM: JSON parsing error: {json_err}")
+                logger.error(f"LLM: Response status: {response.status_code}")
+                logger.error(f"LLM: Response text (first 500 chars): {response_text[:500]}")
+                logger.error(f"LLM: Response text (around error position 810): {response_text[max(0, 800):min(len(response_text), 820)]}")
+                return None
+            
+            # Validate response structure
+            if "choices" not in data or len(data["choices"]) == 0:
+                logger.error(f"LLM: Invalid response structure - no choices found: {data}")
+                return None
+            
+            explanation = data["choices"][0]["message"]["content"].strip()
+            logger.debug(f"LLM: Successfully received explanation ({len(explanation)} chars)")
+            logger.debug(f"LLM Response: {explanation}")
+            return explanation
         except httpx.TimeoutException as e:
             logger.error(f"LLM: Request timeout after 10s: {e} - returning None (no fallback)")
             return None
@@ -384,6 +416,39 @@ Focus on the strategic reasoning and decision logic, not just what the schedule
         
         return prompt
 
+    async def explain_many(
+        self,
+        requests: List[Dict[str, Any]],
+        concurrency: int = 16,
+    ) -> List[Optional[str]]:
+        """Generate explanations for many steps concurrently.
+        
+        Args:
+            requests: Keyword arguments for generate_explanation, one dict per step
+            concurrency: Maximum number of in-flight LLM requests
+        
+        Returns:
+            Explanations in the same order as requests (None where the LLM failed)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _explain(kwargs: Dict[str, Any]) -> Optional[str]:
+            async with semaphore:
+                return await self.generate_explanation(**kwargs)
+        
+        results = await asyncio.gather(
+            *(_explain(kwargs) for kwargs in requests), return_exceptions=True
+        )
+        explanations: List[Optional[str]] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                # One failed step must not drop the whole batch
+                logger.error(f"LLM: Batched explanation failed: {result} - returning None (no fallback)")
+                explanations.append(None)
+            else:
+                explanations.append(result)
+        return explanations
+
     async def generate_strategic_plan(
         self,
         forecast_24h_timestamps: List[datetime],
@@ -426,62 +491,58 @@ Focus on the strategic reasoning and decision logic, not just what the schedule
             logger.debug("LLM: Generating 24-hour strategic plan...")
             logger.debug(f"Strategic Plan Prompt:\n{prompt}")
             
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    f"{self.api_base}/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert wastewater pumping system strategist. Analyze 24-hour forecasts and generate a high-level strategic plan with time periods and recommended approach. Respond in a structured format.",
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt,
-                            },
-                        ],
-                        "temperature": 0.5,  # Lower temperature for more consistent strategic planning
-                        "max_tokens": 400,
-                    },
-                )
-                response.raise_for_status()
-                
-                # Try to parse JSON response with better error handling
-                try:
-                    data = response.json()
-                except ValueError as json_err:
-                    # Log the raw response for debugging
-                    response_text = response.text
-                    logger.error(f"LLM: JSON parsing error in strategic plan: {json_err}")
-                    logger.error(f"LLM: Response status: {response.status_code}")
-                    logger.error(f"LLM: Response text (first 500 chars): {response_text[:500]}")
-                    return None
-                
-                # Validate response structure
-                if "choices" not in data or len(data["choices"]) == 0:
-                    logger.error(f"LLM: Invalid response structure - no choices found: {data}")
-                    return None
-                
-                plan_text = data["choices"][0]["message"]["content"].strip()
-                
-                logger.debug(f"LLM: Successfully received strategic plan ({len(plan_text)} chars)")
-                logger.debug(f"Strategic Plan Response: {plan_text}")
-                
-                # Parse the strategic plan from LLM response
-                parsed_plan = self._parse_strategic_plan(plan_text, forecast_24h_timestamps)
-                
-                # If forecast_confidence not set by LLM, use quality tracker's confidence
-                if parsed_plan and not parsed_plan.forecast_confidence and forecast_quality_tracker:
-                    quality_patterns = forecast_quality_tracker.get_error_patterns()
-                    parsed_plan.forecast_confidence = quality_patterns.get('confidence', 'medium')
-                
-                return parsed_plan
-                
+            response = await self._post(
+                "/v1/chat/completions",
+                timeout=15.0,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": _STRATEGIC_PLAN_SYSTEM_PROMPT,
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt,
+                        },
+                    ],
+                    "temperature": 0.5,  # Lower temperature for more consistent strategic planning
+                    "max_tokens": 400,
+                },
+            )
+            response.raise_for_status()
+            
+            # Try to parse JSON response with better error handling
+            try:
+                data = response.json()
+            except ValueError as json_err:
+                # Log the raw response for debugging
+                response_text = response.text
+                logger.error(f"LLM: JSON parsing error in strategic plan: {json_err}")
+                logger.error(f"LLM: Response status: {response.status_code}")
+                logger.error(f"LLM: Response text (first 500 chars): {response_text[:500]}")
+                return None
+            
+            # Validate response structure
+            if "choices" not in data or len(data["choices"]) == 0:
+                logger.error(f"LLM: Invalid response structure - no choices found: {data}")
+                return None
+            
+            plan_text = data["choices"][0]["message"]["content"].strip()
+            
+            logger.debug(f"LLM: Successfully received strategic plan ({len(plan_text)} chars)")
+            logger.debug(f"Strategic Plan Response: {plan_text}")
+            
+            # Parse the strategic plan from LLM response
+            parsed_plan = self._parse_strategic_plan(plan_text, forecast_24h_timestamps)
+            
+            # If forecast_confidence not set by LLM, use quality tracker's confidence
+            if parsed_plan and not parsed_plan.forecast_confidence and forecast_quality_tracker:
+                quality_patterns = forecast_quality_tracker.get_error_patterns()
+                parsed_plan.forecast_confidence = quality_patterns.get('confidence', 'medium')
+            
+            return parsed_plan
+            
         except Exception as e:
             logger.warning(f"LLM: Failed to generate strategic plan: {e}")
             return None
@@ -552,56 +613,52 @@ Focus on the strategic reasoning and decision logic, not just what the schedule
             logger.info(f"LLM: Generating emergency response for {error_type} (severity: {severity})")
             logger.debug(f"Emergency Response Prompt:\n{prompt}")
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.api_base}/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are an expert wastewater pumping system operator responding to forecast errors. Provide immediate, actionable emergency response strategies. Be specific about constraint adjustments and pumping actions.",
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt,
-                            },
-                        ],
-                        "temperature": 0.3,  # Low temperature for consistent emergency responses
-                        "max_tokens": 300,
-                    },
-                )
-                response.raise_for_status()
-                
-                # Try to parse JSON response with better error handling
-                try:
-                    data = response.json()
-                except ValueError as json_err:
-                    # Log the raw response for debugging
-                    response_text_raw = response.text
-                    logger.error(f"LLM: JSON parsing error in emergency response: {json_err}")
-                    logger.error(f"LLM: Response status: {response.status_code}")
-                    logger.error(f"LLM: Response text (first 500 chars): {response_text_raw[:500]}")
-                    return None
-                
-                # Validate response structure
-                if "choices" not in data or len(data["choices"]) == 0:
-                    logger.error(f"LLM: Invalid response structure - no choices found: {data}")
-                    return None
-                
-                response_text = data["choices"][0]["message"]["content"].strip()
-                
-                logger.debug(f"LLM Emergency Response: {response_text}")
-                
-                # Parse the emergency response
-                return self._parse_emergency_response(
-                    response_text, error_type, severity, error_magnitude
-                )
-                
+            response = await self._post(
+                "/v1/chat/completions",
+                timeout=10.0,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": _EMERGENCY_SYSTEM_PROMPT,
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt,
+                        },
+                    ],
+                    "temperature": 0.3,  # Low temperature for consistent emergency responses
+                    "max_tokens": 300,
+                },
+            )
+            response.raise_for_status()
+            
+            # Try to parse JSON response with better error handling
+            try:
+                data = response.json()
+            except ValueError as json_err:
+                # Log the raw response for debugging
+                response_text_raw = response.text
+                logger.error(f"LLM: JSON parsing error in emergency response: {json_err}")
+                logger.error(f"LLM: Response status: {response.status_code}")
+                logger.error(f"LLM: Response text (first 500 chars): {response_text_raw[:500]}")
+                return None
+            
+            # Validate response structure
+            if "choices" not in data or len(data["choices"]) == 0:
+                logger.error(f"LLM: Invalid response structure - no choices found: {data}")
+                return None
+            
+            response_text = data["choices"][0]["message"]["content"].strip()
+            
+            logger.debug(f"LLM Emergency Response: {response_text}")
+            
+            # Parse the emergency response
+            return self._parse_emergency_response(
+                response_text, error_type, severity, error_magnitude
+            )
+            
         except Exception as e:
             logger.warning(f"LLM: Failed to generate emergency response: {e}")
             return None
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import os
+import threading
+import weakref
 from datetime import datetime, timedelta
 from typing import Any, List, Optional
 
 import httpx
+import numpy as np
 from pydantic import BaseModel
 
 from agents.common import BaseMCPAgent
@@ -18,7 +22,7 @@ logger = logging.getLogger(__name__)
 # Suppress httpx INFO level HTTP request logs (only show WARNING/ERROR)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-from .explainability import LLMExplainer, ScheduleMetrics, StrategicPlan, ForecastQualityTracker
+from .explainability import DEFAULT_LLM_MODEL, LLMExplainer, ScheduleMetrics, StrategicPlan, ForecastQualityTracker
 from .optimizer import (
     CurrentState,
     ForecastData,
@@ -49,6 +53,24 @@ class OptimizationResponse(BaseModel):
     optimization_mode: str = "full"
 
 
+def _close_llm_loop(runner: asyncio.Runner, explainer: LLMExplainer) -> None:
+    """Close an agent's LLM client and the event loop it is bound to.
+
+    The runner cannot run while another event loop is running in this thread
+    (close() from an async handler, or collection on a loop thread), so the
+    close is then handed to a worker thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        try:
+            runner.run(explainer.aclose())
+        finally:
+            runner.close()
+        return
+    threading.Thread(target=_close_llm_loop, args=(runner, explainer), name="llm-loop-close").start()
+
+
 class OptimizationAgent(BaseMCPAgent):
     """Optimizer Agent implementing MPC-style optimization."""
 
@@ -79,8 +101,13 @@ class OptimizationAgent(BaseMCPAgent):
         self.explainer = LLMExplainer(
             api_base=featherless_api_base or os.getenv("FEATHERLESS_API_BASE"),
             api_key=featherless_api_key or os.getenv("FEATHERLESS_API_KEY"),
-            model=os.getenv("LLM_MODEL", "llama-3.1-8b-instruct"),
+            model=os.getenv("LLM_MODEL", DEFAULT_LLM_MODEL),
         )
+        # One event loop reused by every LLM call (and the explainer's pooled HTTP client bound to it)
+        self._runner: Optional[asyncio.Runner] = asyncio.Runner()
+        # Closes the loop and client once: on close(), when the agent is collected, or at
+        # interpreter exit (the finalizer holds no reference to the agent itself)
+        self._finalizer = weakref.finalize(self, _close_llm_loop, self._runner, self.explainer)
         # Initialize forecast quality tracker for recalibration loop
         self.forecast_quality_tracker = ForecastQualityTracker()
         
@@ -100,6 +127,27 @@ class OptimizationAgent(BaseMCPAgent):
         self._previous_prediction_timestamp: Optional[datetime] = None  # When prediction was made
         self._prediction_state_ttl_minutes: int = 30  # Expire state after 30 minutes
 
+    def close(self) -> None:
+        """Close the explainer's HTTP client and the LLM event loop (no LLM calls afterwards).
+
+        Callers should close the agent (or use it as a context manager) when done;
+        agents left open are only closed when collected or at interpreter exit.
+        Safe to call from async code, where the close finishes on a worker thread;
+        await aclose() there to wait for it.
+        """
+        self._finalizer()
+        self._runner = None
+
+    async def aclose(self) -> None:
+        """Close the agent from async code, waiting until the client and loop are closed."""
+        await asyncio.to_thread(self.close)
+
+    def __enter__(self) -> OptimizationAgent:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _init_optimizer(self):
         """Initialize the MPC optimizer with pump specifications.
 
@@ -202,14 +250,7 @@ class OptimizationAgent(BaseMCPAgent):
                 # Generate emergency response if divergence detected and LLM available
                 if divergence and self.explainer.api_base and self.explainer.api_key:
                     try:
-                        import asyncio
-                        try:
-                            loop = asyncio.get_event_loop()
-                        except RuntimeError:
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                        
-                        emergency_response = loop.run_until_complete(
+                        emergency_response = self._runner.run(
                             self.explainer.generate_emergency_response(
                                 error_type=divergence['error_type'],
                                 error_magnitude=divergence['error_magnitude'],
@@ -254,9 +295,9 @@ class OptimizationAgent(BaseMCPAgent):
             
             # Update cumulative pump usage hours based on final result (first step only)
             dt_hours = self.optimizer.time_step_minutes / 60.0
-            if result.success and result.schedules:
-                for sched in result.schedules:
-                    if sched.time_step == 0 and sched.is_on:
+            if result.success:
+                for sched in result.step0_schedules:
+                    if sched.is_on:
                         pid = sched.pump_id
                         self.pump_usage_hours[pid] = self.pump_usage_hours.get(pid, 0.0) + dt_hours
             
@@ -597,23 +638,30 @@ class OptimizationAgent(BaseMCPAgent):
                 optimization_mode=result.mode.value,
             )
         
-        pumps_used = len(set(s.pump_id for s in result.schedules if s.is_on))
-        total_outflow = sum(s.flow_m3_s for s in result.schedules if s.is_on)
-        num_on_steps = len([s for s in result.schedules if s.is_on])
-        avg_outflow = total_outflow / max(1, num_on_steps) if num_on_steps > 0 else 0.0
+        # Single pass over the schedules for pump count and mean on-flow
+        on_pumps = set()
+        total_outflow = 0.0
+        num_on_steps = 0
+        for s in result.schedules:
+            if s.is_on:
+                on_pumps.add(s.pump_id)
+                total_outflow += s.flow_m3_s
+                num_on_steps += 1
+        pumps_used = len(on_pumps)
+        avg_outflow = total_outflow / num_on_steps if num_on_steps > 0 else 0.0
         
         # Forecast prices are already in c/kWh in ForecastData
-        min_price = min(forecast.price_c_per_kwh)
-        max_price = max(forecast.price_c_per_kwh)
+        price_range = forecast.price_range()
+        l1 = np.asarray(result.l1_trajectory, dtype=float)
         return ScheduleMetrics(
             total_energy_kwh=result.total_energy_kwh,
             total_cost_eur=result.total_cost_eur,
-            avg_l1_m=sum(result.l1_trajectory) / len(result.l1_trajectory),
-            min_l1_m=min(result.l1_trajectory),
-            max_l1_m=max(result.l1_trajectory),
+            avg_l1_m=float(l1.mean()),
+            min_l1_m=float(l1.min()),
+            max_l1_m=float(l1.max()),
             num_pumps_used=pumps_used,
             avg_outflow_m3_s=avg_outflow,
-            price_range_c_per_kwh=(min_price, max_price),
+            price_range_c_per_kwh=price_range,
             risk_level="normal",  # Could be computed from optimizer
             optimization_mode=result.mode.value,
         )
@@ -647,16 +695,8 @@ class OptimizationAgent(BaseMCPAgent):
         if self.explainer.api_base and self.explainer.api_key:
             logger.debug("LLM explainer: Attempting to generate explanation via LLM")
             try:
-                import asyncio
-                # Try to get existing event loop, or create new one
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                
                 # Run async LLM call
-                explanation = loop.run_until_complete(
+                explanation = self._runner.run(
                     self.explainer.generate_explanation(
                         metrics=metrics,
                         strategic_guidance=strategic_guidance,
@@ -754,13 +794,6 @@ class OptimizationAgent(BaseMCPAgent):
     def _get_strategic_plan(self, current_state: CurrentState, previous_prediction: Optional[float] = None) -> Optional[Any]:
         """Get strategic plan, using cache if appropriate."""
         try:
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
             # Get 24h forecast for strategic planning
             forecast_24h = self._get_forecasts(1440)  # 24 hours
             if not forecast_24h:
@@ -773,7 +806,7 @@ class OptimizationAgent(BaseMCPAgent):
             
             # Fetch new strategic plan
             logger.info("Fetching new strategic plan (forecasts changed or cache expired)")
-            strategic_plan = loop.run_until_complete(
+            strategic_plan = self._runner.run(
                     self.explainer.generate_strategic_plan(
                         forecast_24h_timestamps=forecast_24h.timestamps,
                         forecast_24h_inflow=forecast_24h.inflow_m3_s,
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import random
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import List, Optional, Tuple, Any, Dict
@@ -64,7 +65,7 @@ class SystemConstraints:
     l1_violation_penalty: float = 1000.0  # Penalty weight for violations (not used when allow_l1_violations=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class ForecastData:
     """Forecasted data for optimization horizon.
 
@@ -76,8 +77,13 @@ class ForecastData:
     inflow_m3_s: List[float]
     price_c_per_kwh: List[float]
 
+    def price_range(self) -> Tuple[float, float]:
+        """(min, max) forecast price in c/kWh."""
+        prices = np.asarray(self.price_c_per_kwh, dtype=float)
+        return float(prices.min()), float(prices.max())
 
-@dataclass
+
+@dataclass(slots=True)
 class CurrentState:
     """Current system state.
 
@@ -93,7 +99,7 @@ class CurrentState:
     price_c_per_kwh: float
 
 
-@dataclass
+@dataclass(slots=True)
 class PumpSchedule:
     """Optimal pump schedule entry."""
     pump_id: str
@@ -117,6 +123,36 @@ class OptimizationResult:
     solve_time_seconds: float
     l1_violations: int = 0  # Count of L1 constraint violations
     max_violation_m: float = 0.0  # Maximum violation magnitude
+    step0_schedules: List[PumpSchedule] = field(default_factory=list)  # Schedules with time_step == 0
+
+
+# L1 safety margins per forecast quality level:
+# (max-margin % of inflow MAE, max-margin cap m, min margin m); 'good' keeps the base bounds
+_QUALITY_MARGINS: Dict[str, Tuple[float, float, float]] = {
+    'poor': (5.0, 1.5, 0.3),  # Large errors: reduce max by up to 1.5m against surges, raise min by 0.3m
+    'fair': (3.0, 0.8, 0.2),  # Medium errors: moderate safety margins
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _strategic_guidance(prices: Tuple[float, ...], inflows: Tuple[float, ...]) -> Tuple[str, ...]:
+    """Classify each forecast step as CHEAP / EXPENSIVE / SURGE_RISK / NORMAL."""
+    guidance = []
+    avg_price = np.mean(prices)
+    price_std = np.std(prices)
+    surge_threshold = np.mean(inflows) * 1.3 if inflows else 0.0
+    
+    for i, price in enumerate(prices):
+        if price < avg_price - 0.5 * price_std:
+            guidance.append("CHEAP")
+        elif price > avg_price + 0.5 * price_std:
+            guidance.append("EXPENSIVE")
+        elif i < len(inflows) and inflows[i] > surge_threshold:
+            guidance.append("SURGE_RISK")
+        else:
+            guidance.append("NORMAL")
+    
+    return tuple(guidance)
 
 
 class MPCOptimizer:
@@ -129,14 +165,28 @@ class MPCOptimizer:
         time_step_minutes: int = 15,
         tactical_horizon_minutes: int = 120,  # 2h tactical horizon
         strategic_horizon_minutes: int = 1440,  # 24h strategic
+        integer_horizon_steps: Optional[int] = None,  # Binary on/off only for the first N steps (None = all)
     ):
         self.pumps = {p.pump_id: p for p in pumps}
+        # Struct-of-arrays view of the pump specs, indexed via pump_index
+        specs = list(self.pumps.values())
+        self.pump_index = {pid: i for i, pid in enumerate(self.pumps)}
+        self.max_flow = np.array([p.max_flow_m3_s for p in specs], dtype=float)
+        self.max_power = np.array([p.max_power_kw for p in specs], dtype=float)
+        self.min_freq = np.array([p.min_frequency_hz for p in specs], dtype=float)
+        self.max_freq = np.array([p.max_frequency_hz for p in specs], dtype=float)
+        self.power_l1_slope = np.array([p.power_vs_l1_slope_kw_per_m for p in specs], dtype=float)
+        self.power_l1_reference = np.array([p.power_l1_reference_m for p in specs], dtype=float)
+        self._init_power_model()
         self.constraints = constraints
         self.time_step_minutes = time_step_minutes
         self.tactical_horizon_minutes = tactical_horizon_minutes
         self.strategic_horizon_minutes = strategic_horizon_minutes
         self.tactical_steps = tactical_horizon_minutes // time_step_minutes
         self.strategic_steps = strategic_horizon_minutes // time_step_minutes
+        # Only the first step of each plan is applied (receding horizon), so the
+        # on/off decisions of later steps may be relaxed to [0, 1] to cut solve time
+        self.integer_horizon_steps = integer_horizon_steps
         
         # Log multi-threading configuration
         import logging
@@ -145,6 +195,24 @@ class MPCOptimizer:
         self.num_threads = num_threads
         logger.info(f"✓ Optimizer initialized with multi-threading: {num_threads} CPU cores available")
 
+    def _init_power_model(self) -> None:
+        """Precompute per-pump flow/power model coefficients from the spec arrays.
+
+        These only depend on the pump specs, so they are computed once here
+        instead of for every pump and time step of every solve. Pumps with an
+        invalid max_frequency_hz get NaN coefficients; the solver rejects them.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.max_freq_inv = 1.0 / self.max_freq
+            self.min_freq_ratio = self.min_freq / self.max_freq
+        # Base power at minimum frequency (approximate cubic: ~85% at 95% freq)
+        self.base_power_freq = self.max_power * self.min_freq_ratio ** 2.5
+        # Linear slope = (max - base) / (1 - min_ratio), with fallback near zero
+        denominator = 1.0 - self.min_freq_ratio
+        denominator = np.where(np.abs(denominator) < 0.01, 0.5, denominator)
+        # Scale slope by 1.5x to better approximate cubic curve in the operating range
+        self.power_slope_adjusted = (self.max_power - self.base_power_freq) / denominator * 1.5
+
     def assess_risk_level(self, current_state: CurrentState, forecast: ForecastData) -> RiskLevel:
         """Assess risk level based on L1 proximity to bounds and expected inflow."""
         l1 = current_state.l1_m
@@ -285,32 +353,22 @@ class MPCOptimizer:
         Returns:
             Dict with adjusted 'l1_min_m' and 'l1_max_m'
         """
-        quality_level = forecast_quality.get('quality_level', 'good')
-        inflow_mae = forecast_quality.get('inflow_mae', 0)
-        
-        # Base constraints
-        adjusted_min = self.constraints.l1_min_m
-        adjusted_max = self.constraints.l1_max_m
-        
-        # Add safety margins based on forecast quality
-        if quality_level == 'poor':
-            # Large errors: significant safety margins
-            # Reduce max by up to 1.5m to protect against surge, increase min by 0.3m for buffer
-            safety_margin_max = min(1.5, inflow_mae / 100 * 5)  # Proportional to error
-            safety_margin_min = 0.3
-            adjusted_max = self.constraints.l1_max_m - safety_margin_max
-            adjusted_min = self.constraints.l1_min_m + safety_margin_min
-        elif quality_level == 'fair':
-            # Medium errors: moderate safety margins
-            safety_margin_max = min(0.8, inflow_mae / 100 * 3)
-            safety_margin_min = 0.2
-            adjusted_max = self.constraints.l1_max_m - safety_margin_max
-            adjusted_min = self.constraints.l1_min_m + safety_margin_min
-        # 'good' quality: use base constraints
+        l1_min = self.constraints.l1_min_m
+        l1_max = self.constraints.l1_max_m
+        
+        # Base constraints ('good' quality), plus safety margins for poorer forecasts
+        adjusted_min = l1_min
+        adjusted_max = l1_max
+        margins = _QUALITY_MARGINS.get(forecast_quality.get('quality_level', 'good'))
+        if margins is not None:
+            pct_of_mae, max_margin_cap, safety_margin_min = margins
+            inflow_mae = forecast_quality.get('inflow_mae', 0)
+            adjusted_max = l1_max - min(max_margin_cap, inflow_mae / 100 * pct_of_mae)  # Proportional to error
+            adjusted_min = l1_min + safety_margin_min
         
         # Ensure adjusted constraints are still valid
-        adjusted_min = max(self.constraints.l1_min_m * 0.8, adjusted_min)  # Don't go too low
-        adjusted_max = min(self.constraints.l1_max_m * 1.1, adjusted_max)  # Don't go too high
+        adjusted_min = max(l1_min * 0.8, adjusted_min)  # Don't go too low
+        adjusted_max = min(l1_max * 1.1, adjusted_max)  # Don't go too high
         adjusted_max = max(adjusted_min + 0.5, adjusted_max)  # Ensure min < max
         
         return {
@@ -321,22 +379,14 @@ class MPCOptimizer:
     def derive_strategic_guidance(
         self, forecast_24h: ForecastData
     ) -> List[str]:
-        """Derive strategic guidance from 24h forecast (algorithmic method)."""
-        guidance = []
-        avg_price = np.mean(forecast_24h.price_c_per_kwh)
-        price_std = np.std(forecast_24h.price_c_per_kwh)
-        
-        for i, price in enumerate(forecast_24h.price_c_per_kwh):
-            if price < avg_price - 0.5 * price_std:
-                guidance.append("CHEAP")
-            elif price > avg_price + 0.5 * price_std:
-                guidance.append("EXPENSIVE")
-            elif i < len(forecast_24h.inflow_m3_s) and forecast_24h.inflow_m3_s[i] > np.mean(forecast_24h.inflow_m3_s) * 1.3:
-                guidance.append("SURGE_RISK")
-            else:
-                guidance.append("NORMAL")
+        """Derive strategic guidance from 24h forecast (algorithmic method).
         
-        return guidance
+        Pure function of the forecast values, so results are memoized by
+        (prices, inflows) across calls.
+        """
+        return list(_strategic_guidance(
+            tuple(forecast_24h.price_c_per_kwh), tuple(forecast_24h.inflow_m3_s)
+        ))
     
     def get_strategy_for_time_period(
         self,
@@ -756,8 +806,17 @@ class MPCOptimizer:
         # l1[t] = tunnel level at time t
         l1 = {}
         
+        integer_steps = num_steps
+        if self.integer_horizon_steps is not None:
+            integer_steps = max(1, min(num_steps, self.integer_horizon_steps))
+        
         for pid in pump_ids:
-            pump_on[pid] = [solver.BoolVar(f"on_{pid}_{t}") for t in range(num_steps)]
+            # Binary on/off within the integer horizon, relaxed to [0, 1] beyond it
+            pump_on[pid] = [
+                solver.BoolVar(f"on_{pid}_{t}") if t < integer_steps
+                else solver.NumVar(0.0, 1.0, f"on_{pid}_{t}")
+                for t in range(num_steps)
+            ]
             # Frequency can be 0 when pump is off, or between min/max when on
             # Lower bound is 0.0 (constraints enforce min when pump is on)
             pump_freq[pid] = [
@@ -809,148 +868,116 @@ class MPCOptimizer:
             "l1_initial"
         )
         
+        # Per-pump model coefficients (precomputed in __init__), in pump_ids order
+        for pid in pump_ids:
+            if self.pumps[pid].max_frequency_hz < 1.0:
+                raise ValueError(f"Invalid max_frequency_hz={self.pumps[pid].max_frequency_hz} for pump {pid}. Must be >= 1.0 Hz")
+        spec_idx = [self.pump_index[pid] for pid in pump_ids]
+        min_freq = self.min_freq[spec_idx].tolist()
+        max_freq = self.max_freq[spec_idx].tolist()
+        max_flow = self.max_flow[spec_idx].tolist()
+        max_power = self.max_power[spec_idx].tolist()
+        max_freq_inv = self.max_freq_inv[spec_idx].tolist()
+        min_freq_ratio = self.min_freq_ratio[spec_idx].tolist()
+        base_power_freq = self.base_power_freq[spec_idx].tolist()
+        adjusted_slope = self.power_slope_adjusted[spec_idx].tolist()
+        l1_slope = self.power_l1_slope[spec_idx].tolist()
+        l1_reference = self.power_l1_reference[spec_idx].tolist()
+        
+        # Expected L1 at each step for the lifting-height power correction
+        # (approximate from forecast, assuming outflow at 50% of total capacity)
+        avg_outflow = sum(max_flow) * 0.5
+        dt_sec = self.time_step_minutes * 60
+        expected_l1_traj = []
+        expected_l1 = current_state.l1_m  # Start from current
+        for t in range(num_steps):
+            if t < len(forecast.inflow_m3_s):
+                expected_l1 += (forecast.inflow_m3_s[t] - avg_outflow) * dt_sec / self.constraints.tunnel_volume_m3
+            expected_l1_traj.append(expected_l1)
+        
+        # Total outflow per step, built once and shared by the mass balance
+        # and the smoothness objective
+        outflow_exprs = [
+            solver.Sum([pump_flow[pid][t] for pid in pump_ids]) for t in range(num_steps)
+        ]
+        
         # Constraints
         for t in range(num_steps):
             # At least min_pumps_on pumps must be running
             solver.Add(
-                sum(pump_on[pid][t] for pid in pump_ids) >= self.constraints.min_pumps_on
+                solver.Sum([pump_on[pid][t] for pid in pump_ids]) >= self.constraints.min_pumps_on
             )
             
             # Frequency only if pump is on
-            for pid in pump_ids:
-                pump_spec = self.pumps[pid]
+            for k, pid in enumerate(pump_ids):
                 # If pump is on, frequency must be >= min_frequency
                 solver.Add(
-                    pump_freq[pid][t] >= pump_on[pid][t] * pump_spec.min_frequency_hz
+                    pump_freq[pid][t] >= pump_on[pid][t] * min_freq[k]
                 )
                 solver.Add(
-                    pump_freq[pid][t] <= pump_on[pid][t] * pump_spec.max_frequency_hz
+                    pump_freq[pid][t] <= pump_on[pid][t] * max_freq[k]
                 )
                 
                 # Simplified flow model: flow ≈ freq_factor * max_flow (linear)
                 # Use linear approximation: flow proportional to frequency
-                # Division by constant is allowed: flow = freq / max_freq * max_flow
-                # Flow bounds: flow proportional to frequency when pump is on
-                # Safety check: ensure max_frequency_hz is valid (avoid division by zero)
-                if pump_spec.max_frequency_hz < 1.0:
-                    raise ValueError(f"Invalid max_frequency_hz={pump_spec.max_frequency_hz} for pump {pid}. Must be >= 1.0 Hz")
-                max_freq_inv = 1.0 / pump_spec.max_frequency_hz
+                # flow = freq / max_freq * max_flow
                 solver.Add(
-                    pump_flow[pid][t] >= (pump_freq[pid][t] * max_freq_inv) * pump_spec.max_flow_m3_s * 0.9
+                    pump_flow[pid][t] >= (pump_freq[pid][t] * max_freq_inv[k]) * max_flow[k] * 0.9
                 )
                 solver.Add(
-                    pump_flow[pid][t] <= (pump_freq[pid][t] * max_freq_inv) * pump_spec.max_flow_m3_s * 1.1
+                    pump_flow[pid][t] <= (pump_freq[pid][t] * max_freq_inv[k]) * max_flow[k] * 1.1
                 )
                 
                 # Power model: improved approximation accounting for:
-                # 1. Frequency (cubic relationship: P ∝ f³)
+                # 1. Frequency (cubic relationship: P ∝ f³, linearized with a steeper slope)
                 # 2. L1 / Lifting height (higher L1 = less lifting height needed = less power)
                 # 3. Flow and efficiency (embedded in max_power_kw from pump curves)
-                # 
-                # Power = f(frequency) - f(L1) + base
-                # Where:
-                #   f(frequency) ≈ base_power + slope * (freq - min_freq) [cubic approximation]
-                #   f(L1) = power_vs_l1_slope * (L1 - L1_reference) [lifting height effect]
-                #   Higher L1 = less power needed (negative slope in data analysis)
-                
-                # Safety check: ensure max_frequency_hz is valid before division
-                if pump_spec.max_frequency_hz < 1.0:
-                    raise ValueError(f"Invalid max_frequency_hz={pump_spec.max_frequency_hz} for pump {pid}. Must be >= 1.0 Hz")
-                min_freq_ratio = pump_spec.min_frequency_hz / pump_spec.max_frequency_hz
-                # Base power at minimum frequency (approximate cubic: ~85% at 95% freq)
-                base_power_ratio = min_freq_ratio ** 2.5  # 0.95^2.5 ≈ 0.87
-                base_power_freq = pump_spec.max_power_kw * base_power_ratio
-                
-                # Power slope: approximate cubic by using steeper linear slope
-                # At 50Hz, power = max_power
-                # At 47.8Hz, power ≈ 87% of max
-                # Linear slope = (max - base) / (1 - min_ratio)
-                denominator = 1.0 - min_freq_ratio
-                if abs(denominator) < 0.01:  # Avoid division by zero
-                    power_slope = (pump_spec.max_power_kw - base_power_freq) / 0.5  # Fallback
-                else:
-                    power_slope = (pump_spec.max_power_kw - base_power_freq) / denominator
-                
-                # Simplified linear approximation with adjusted slope for cubic behavior
-                # Scale slope by 1.5x to better approximate cubic curve in the operating range
-                adjusted_slope = power_slope * 1.5
+                # See _init_power_model for the frequency coefficients.
                 
                 # Power vs frequency component
-                freq_excess = pump_freq[pid][t] * max_freq_inv - min_freq_ratio * pump_on[pid][t]
+                freq_excess = pump_freq[pid][t] * max_freq_inv[k] - min_freq_ratio[k] * pump_on[pid][t]
                 
                 # Power vs L1 component (lifting height correction)
-                # Higher L1 = less lifting height needed = less power
-                # Power correction: power_reduction = slope * (L1[t] - L1_reference)
-                # Since L1[t] is a variable, we can use it directly in linear constraints
-                l1_reference = pump_spec.power_l1_reference_m
-                l1_slope = pump_spec.power_vs_l1_slope_kw_per_m
-                
-                # Power reduction from L1 (lifting height effect)
-                # When L1 is higher than reference, less power needed
-                # power_l1_reduction = l1_slope * (l1[t] - l1_reference)
-                # This is linear and can be added directly to constraints
-                
-                # Total power = power_from_freq - power_l1_reduction
-                # But we need to be careful: l1_slope * l1[t] creates a bilinear term if multiplied by pump_on
-                # Approximation: apply L1 correction only when pump is on
-                # Use conservative approximation: apply correction factor based on expected L1
-                # For now, use forecasted L1 to estimate correction (small change assumption)
-                if l1_slope > 0.01:  # Only apply if significant slope
-                    # Estimate L1 at time t (approximate from forecast)
-                    expected_l1 = current_state.l1_m  # Start from current
-                    dt_sec = self.time_step_minutes * 60
-                    for s in range(t + 1):
-                        if s < len(forecast.inflow_m3_s):
-                            # Approximate outflow as average (conservative)
-                            avg_outflow = sum(self.pumps[p].max_flow_m3_s for p in pump_ids) * 0.5
-                            expected_l1 += (forecast.inflow_m3_s[s] - avg_outflow) * dt_sec / self.constraints.tunnel_volume_m3
-                    
+                # L1[t] * pump_on would be bilinear, so use the forecast-based
+                # expected L1 instead (small change assumption)
+                if l1_slope[k] > 0.01:  # Only apply if significant slope
                     # L1 correction (subtract from power when L1 is high)
-                    l1_correction = l1_slope * (expected_l1 - l1_reference)
+                    l1_correction = l1_slope[k] * (expected_l1_traj[t] - l1_reference[k])
                     # Clamp correction to reasonable range (±20% of base power)
-                    max_correction = base_power_freq * 0.2
+                    max_correction = base_power_freq[k] * 0.2
                     l1_correction = max(-max_correction, min(max_correction, l1_correction))
                     
                     # Apply L1 correction: subtract from frequency-based power
-                    base_power = base_power_freq - l1_correction
+                    base_power = base_power_freq[k] - l1_correction
                 else:
                     # No L1 correction (slope too small)
-                    base_power = base_power_freq
+                    base_power = base_power_freq[k]
                 
                 solver.Add(
                     pump_power[pid][t] >= base_power * pump_on[pid][t] + 
-                    freq_excess * adjusted_slope * 0.85
+                    freq_excess * adjusted_slope[k] * 0.85
                 )
                 solver.Add(
                     pump_power[pid][t] <= base_power * pump_on[pid][t] + 
-                    freq_excess * adjusted_slope * 1.15
+                    freq_excess * adjusted_slope[k] * 1.15
                 )
                 
                 # Bounds: power must be between adjusted base and max when on
-                adjusted_min_power = max(0.1 * pump_spec.max_power_kw, base_power * 0.8)
+                adjusted_min_power = max(0.1 * max_power[k], base_power * 0.8)
                 solver.Add(
                     pump_power[pid][t] >= adjusted_min_power * pump_on[pid][t]
                 )
                 solver.Add(
-                    pump_power[pid][t] <= pump_spec.max_power_kw * pump_on[pid][t]
+                    pump_power[pid][t] <= max_power[k] * pump_on[pid][t]
                 )
             
             # L1 dynamics: simplified mass balance
-            if t == 0:
-                inflow = forecast.inflow_m3_s[t]
-                outflow = sum(pump_flow[pid][t] for pid in pump_ids)
-                # Change in volume = (inflow - outflow) * dt
-                dt_seconds = self.time_step_minutes * 60
-                volume_change_m3 = (inflow - outflow) * dt_seconds
-                level_change_m = volume_change_m3 / self.constraints.tunnel_volume_m3
-                solver.Add(l1[t] == l1_initial + level_change_m)
-            else:
-                inflow = forecast.inflow_m3_s[t]
-                outflow = sum(pump_flow[pid][t] for pid in pump_ids)
-                dt_seconds = self.time_step_minutes * 60
-                volume_change_m3 = (inflow - outflow) * dt_seconds
-                level_change_m = volume_change_m3 / self.constraints.tunnel_volume_m3
-                solver.Add(l1[t] == l1[t - 1] + level_change_m)
+            inflow = forecast.inflow_m3_s[t]
+            # Change in volume = (inflow - outflow) * dt
+            volume_change_m3 = (inflow - outflow_exprs[t]) * dt_sec
+            level_change_m = volume_change_m3 / self.constraints.tunnel_volume_m3
+            prev_l1 = l1_initial if t == 0 else l1[t - 1]
+            solver.Add(l1[t] == prev_l1 + level_change_m)
             
             # L1 bounds - constraints handled via variable bounds and penalties
             # If soft constraints enabled, bounds are already expanded above
@@ -1085,9 +1112,9 @@ class MPCOptimizer:
         
         # Cost: total energy cost
         # price_c_per_kwh is in c/kWh from inputs
+        dt_hours = self.time_step_minutes / 60.0
         for t in range(num_steps):
             price_eur_per_kwh = forecast.price_c_per_kwh[t] / 100.0  # c/kWh -> EUR/kWh
-            dt_hours = self.time_step_minutes / 60.0
             for pid in pump_ids:
                 energy_kwh = pump_power[pid][t] * dt_hours
                 cost_obj += energy_kwh * price_eur_per_kwh
@@ -1095,9 +1122,7 @@ class MPCOptimizer:
         # Smoothness: minimize F2 variance (linear approximation)
         # Approach: Minimize deviation from target constant outflow
         # Target is the average of current outflow and expected average outflow
-        outflow_vars = [
-            sum(pump_flow[pid][t] for pid in pump_ids) for t in range(num_steps)
-        ]
+        outflow_vars = outflow_exprs
         
         if len(outflow_vars) > 0:
             # Calculate target constant outflow based on current state and forecast
@@ -1143,7 +1168,6 @@ class MPCOptimizer:
         # Since we can't divide directly or use quadratic terms, use linear approximation
         target_specific_energy = 0.08  # kWh/m³ target (better than baseline ~0.092 to encourage improvement)
         for t in range(num_steps):
-            dt_hours = self.time_step_minutes / 60.0
             for pid in pump_ids:
                 energy = pump_power[pid][t] * dt_hours
                 flow_m3 = pump_flow[pid][t] * dt_hours
@@ -1425,6 +1449,7 @@ class MPCOptimizer:
             for t in range(num_steps):
                 l1_val = l1[t].solution_value()
                 l1_traj.append(l1_val)
+                price_eur_per_kwh = forecast.price_c_per_kwh[t] / 100.0  # c/kWh -> EUR/kWh
                 
                 # Check for violations
                 if l1_val < self.constraints.l1_min_m:
@@ -1468,11 +1493,9 @@ class MPCOptimizer:
                     )
                     
                     if is_on:
-                        dt_hours = self.time_step_minutes / 60.0
                         energy = power * dt_hours
                         total_energy += energy
-                        # price_c_per_kwh is in c/kWh → convert to EUR/kWh
-                        total_cost += energy * (forecast.price_c_per_kwh[t] / 100.0)
+                        total_cost += energy * price_eur_per_kwh
             
             solve_time = time.time() - start_time
             
@@ -1504,6 +1527,7 @@ class MPCOptimizer:
                 solve_time_seconds=solve_time,
                 l1_violations=violations,
                 max_violation_m=max_violation,
+                step0_schedules=schedules[:len(pump_ids)],  # Built step-major, pumps in pump_ids order
             )
         else:
             return OptimizationResult(
@@ -1554,8 +1578,10 @@ class MPCOptimizer:
         if not active_pumps:
             active_pumps = [pump_ids[0]]  # At least one pump on
         
+        dt_hours = self.time_step_minutes / 60.0
         for t in range(num_steps):
             inflow = forecast.inflow_m3_s[t]
+            price_eur_per_kwh = forecast.price_c_per_kwh[t] / 100.0  # c/kWh -> EUR/kWh
             
             # Adjust pumping based on L1
             if l1_current > l1_threshold_high:
@@ -1587,11 +1613,9 @@ class MPCOptimizer:
                 )
                 
                 outflow += flow
-                dt_hours = self.time_step_minutes / 60.0
                 energy = power * dt_hours
                 total_energy += energy
-                # price_c_per_kwh is in c/kWh → convert to EUR/kWh
-                total_cost += energy * (forecast.price_c_per_kwh[t] / 100.0)
+                total_cost += energy * price_eur_per_kwh
             
             # Add off pumps
             for pid in pump_ids:
@@ -1626,5 +1650,6 @@ class MPCOptimizer:
             total_cost_eur=total_cost,
             explanation="Rule-based safe schedule (optimizer fallback mode)",
             solve_time_seconds=0.0,
+            step0_schedules=schedules[:len(pump_ids)],
         )
 
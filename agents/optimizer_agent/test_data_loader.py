@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
+from enum import StrEnum
 from typing import List, Optional, Tuple
 
 import numpy as np
@@ -11,6 +13,57 @@ import pandas as pd
 from .optimizer import CurrentState, ForecastData
 
 
+class ForecastMethod(StrEnum):
+    """Forecast generation methods supported by the data loader."""
+    PERFECT = "perfect"  # Historical future values with added noise
+    PERSISTENCE = "persistence"  # Last known value repeated
+
+
+class PriceType(StrEnum):
+    """Electricity price column to read from the dataset."""
+    NORMAL = "normal"
+    HIGH = "high"
+
+
+# Pump IDs as they appear in the dataset columns (1.1-1.4, 2.1-2.4)
+BASELINE_PUMP_IDS = ('1.1', '1.2', '1.3', '1.4', '2.1', '2.2', '2.3', '2.4')
+
+
+@dataclass(slots=True)
+class BaselineSchedules:
+    """Historical pump schedules for many ticks as (ticks, pumps) arrays.
+
+    Column j of each 2-D array belongs to pump_ids[j]; rows of ticks with no
+    matching data are all zeros (available[tick] is False).
+    """
+    pump_ids: List[str]
+    available: np.ndarray
+    is_on: np.ndarray
+    frequency_hz: np.ndarray
+    flow_m3_s: np.ndarray
+    power_kw: np.ndarray
+
+    def schedule_at(self, tick: int) -> dict:
+        """Baseline schedule of one tick as {pump_id: {is_on, frequency_hz, flow_m3_s, power_kw}}."""
+        if not self.available[tick]:
+            return {}
+        return {
+            pump_id: {
+                'is_on': is_on,
+                'frequency_hz': freq_hz,
+                'flow_m3_s': flow_m3_s,
+                'power_kw': power_kw,
+            }
+            for pump_id, is_on, freq_hz, flow_m3_s, power_kw in zip(
+                self.pump_ids,
+                self.is_on[tick].tolist(),
+                self.frequency_hz[tick].tolist(),
+                self.flow_m3_s[tick].tolist(),
+                self.power_kw[tick].tolist(),
+            )
+        }
+
+
 class HSYDataLoader:
     """Load and parse Hackathon_HSY_data.xlsx for testing."""
 
@@ -128,7 +181,26 @@ class HSYDataLoader:
         if len(closest_indices) == 0 or closest_indices[0] == -1:
             return None
         
-        closest_idx = closest_indices[0]
+        return self._state_at_index(closest_indices[0], include_pump_states)
+
+    def get_states_for_range(
+        self, timestamps: List[datetime], include_pump_states: bool = False
+    ) -> List[Optional[CurrentState]]:
+        """Get CurrentState objects for many timestamps with a single index lookup.
+        
+        Equivalent to calling get_state_at_time for each timestamp.
+        """
+        if self.df is None:
+            return [None] * len(timestamps)
+        
+        closest_indices = self.df.index.get_indexer(timestamps, method='nearest')
+        return [
+            self._state_at_index(idx, include_pump_states) if idx != -1 else None
+            for idx in closest_indices
+        ]
+
+    def _state_at_index(self, closest_idx: int, include_pump_states: bool) -> CurrentState:
+        """Build a CurrentState from the row at a positional index."""
         row = self.df.iloc[closest_idx]
         actual_time = self.df.index[closest_idx]
         
@@ -185,8 +257,32 @@ class HSYDataLoader:
         except (KeyError, ValueError):
             return None
         
-        end_idx = min(start_idx + horizon_steps, len(self.df))
+        return self._forecast_at_index(timestamp, start_idx, horizon_steps, method)
+
+    def get_forecasts_for_range(
+        self, timestamps: List[datetime], horizon_steps: int, method: str = 'perfect'
+    ) -> List[Optional[ForecastData]]:
+        """Get ForecastData for many start timestamps with a single index lookup.
+        
+        Equivalent to calling get_forecast_from_time for each timestamp (forecast
+        noise is seeded per timestamp, so results do not depend on call order).
+        """
+        if self.df is None:
+            return [None] * len(timestamps)
         
+        try:
+            start_indices = self.df.index.get_indexer(timestamps, method='nearest')
+        except (KeyError, ValueError):
+            return [None] * len(timestamps)
+        return [
+            self._forecast_at_index(timestamp, start_idx, horizon_steps, method) if start_idx != -1 else None
+            for timestamp, start_idx in zip(timestamps, start_indices)
+        ]
+
+    def _forecast_at_index(
+        self, timestamp: datetime, start_idx: int, horizon_steps: int, method: str
+    ) -> Optional[ForecastData]:
+        """Build ForecastData starting at a positional index."""
         if method == 'perfect':
             # Use historical future data as "perfect forecast"
             # Start from start_idx+1 to get the NEXT step (future forecast)
@@ -258,40 +354,51 @@ class HSYDataLoader:
 
     def get_baseline_schedule_at_time(self, timestamp: datetime) -> dict:
         """Get baseline pump schedule from historical data."""
-        if self.df is None:
-            return {}
-        
-        try:
-            row_indices = self.df.index.get_indexer([timestamp], method='nearest')
-            if len(row_indices) == 0 or row_indices[0] == -1:
-                return {}
-            row_idx = row_indices[0]
-            row = self.df.iloc[row_idx]
-        except (KeyError, IndexError, ValueError):
-            return {}
-        
-        schedule = {}
-        for pump_num in ['1.1', '1.2', '1.3', '1.4', '2.1', '2.2', '2.3', '2.4']:
-            # Use dataset pump ID directly (1.1-1.4, 2.1-2.4)
-            pump_id = pump_num
-            
-            flow_col = f'Pump flow {pump_num}'
-            freq_col = f'Pump frequency {pump_num}'
-            power_col = f'Pump power uptake {pump_num}'
-            
-            flow_m3_s = row.get(f'{flow_col}_m3_s', row.get(flow_col, 0.0) / 3600.0)
-            freq_hz = row.get(freq_col, 0.0)
-            power_kw = row.get(power_col, 0.0)
-            is_on = flow_m3_s > 0.01 and freq_hz > 10.0
+        return self.get_baseline_schedules_for_range([timestamp])[0]
+
+    def get_baseline_schedules_for_range(self, timestamps: List[datetime]) -> List[dict]:
+        """Get baseline pump schedules for many timestamps with a single index lookup."""
+        baseline = self.get_baseline_arrays_for_range(timestamps)
+        return [baseline.schedule_at(tick) for tick in range(len(timestamps))]
+
+    def get_baseline_arrays_for_range(self, timestamps: List[datetime]) -> BaselineSchedules:
+        """Get baseline pump schedules for many timestamps as (ticks, pumps) arrays."""
+        num_ticks = len(timestamps)
+        num_pumps = len(BASELINE_PUMP_IDS)
+        available = np.zeros(num_ticks, dtype=bool)
+        columns = {
+            name: np.zeros((num_ticks, num_pumps), dtype=float)
+            for name in ('frequency_hz', 'flow_m3_s', 'power_kw')
+        }
+        
+        if self.df is not None and num_ticks:
+            try:
+                row_indices = self.df.index.get_indexer(timestamps, method='nearest')
+            except (KeyError, ValueError):
+                row_indices = np.full(num_ticks, -1)
+            available = row_indices != -1
+            rows = row_indices[available]
             
-            schedule[pump_id] = {
-                'is_on': bool(is_on),
-                'frequency_hz': float(freq_hz),
-                'flow_m3_s': float(flow_m3_s),
-                'power_kw': float(power_kw),
-            }
-        
-        return schedule
+            for j, pump_num in enumerate(BASELINE_PUMP_IDS):
+                flow_col = f'Pump flow {pump_num}'
+                if f'{flow_col}_m3_s' in self.df.columns:
+                    columns['flow_m3_s'][available, j] = self.df[f'{flow_col}_m3_s'].to_numpy(dtype=float)[rows]
+                elif flow_col in self.df.columns:
+                    columns['flow_m3_s'][available, j] = self.df[flow_col].to_numpy(dtype=float)[rows] / 3600.0
+                for name, col in (
+                    ('frequency_hz', f'Pump frequency {pump_num}'),
+                    ('power_kw', f'Pump power uptake {pump_num}'),
+                ):
+                    if col in self.df.columns:
+                        columns[name][available, j] = self.df[col].to_numpy(dtype=float)[rows]
+        
+        is_on = (columns['flow_m3_s'] > 0.01) & (columns['frequency_hz'] > 10.0)
+        return BaselineSchedules(
+            pump_ids=list(BASELINE_PUMP_IDS),
+            available=available,
+            is_on=is_on,
+            **columns,
+        )
 
     def get_data_range(self) -> Tuple[datetime, datetime]:
         """Get the time range of available data."""
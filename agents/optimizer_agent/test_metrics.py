@@ -68,7 +68,7 @@ class MetricsCalculator:
             "=" * 70,
             "",
             f"Simulation Period: {simulation.start_time.strftime('%Y-%m-%d %H:%M')} to {simulation.end_time.strftime('%Y-%m-%d %H:%M')}",
-            f"Total Optimization Steps: {len(simulation.results)}",
+            f"Total Optimization Steps: {simulation.num_steps}",
             "",
             "ENERGY CONSUMPTION:",
             f"  Baseline:     {energy_metrics.get('baseline', 0.0):>12.2f} kWh",
@@ -207,9 +207,9 @@ class MetricsCalculator:
                 overall_metrics = ScheduleMetrics(
                     total_energy_kwh=energy_metrics.get('optimized', 0.0),
                     total_cost_eur=cost_metrics.get('optimized', 0.0),
-                    avg_l1_m=sum(simulation.optimized_l1_trajectory) / len(simulation.optimized_l1_trajectory) if simulation.optimized_l1_trajectory else 0.0,
-                    min_l1_m=min(simulation.optimized_l1_trajectory) if simulation.optimized_l1_trajectory else 0.0,
-                    max_l1_m=max(simulation.optimized_l1_trajectory) if simulation.optimized_l1_trajectory else 0.0,
+                    avg_l1_m=float(simulation.optimized_l1_trajectory.mean()) if simulation.num_steps else 0.0,
+                    min_l1_m=float(simulation.optimized_l1_trajectory.min()) if simulation.num_steps else 0.0,
+                    max_l1_m=float(simulation.optimized_l1_trajectory.max()) if simulation.num_steps else 0.0,
                     num_pumps_used=len([h for h in pump_hours.get('optimized', {}).values() if h > 0]),
                     avg_outflow_m3_s=0.0,  # Could calculate from simulation if needed
                     # 70-100 EUR/MWh → 7-10 c/kWh
@@ -223,20 +223,19 @@ class MetricsCalculator:
                 strategy_summary = ", ".join(set(strategic_guidance))
                 logger.info(f"Strategy: {strategy_summary}")
                 
-                # Generate LLM explanation asynchronously
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                
-                summary_explanation = loop.run_until_complete(
-                    self.llm_explainer.generate_explanation(
-                        metrics=overall_metrics,
-                        strategic_guidance=strategic_guidance,
-                        current_state_description=f"Simulation from {simulation.start_time} to {simulation.end_time}",
-                    )
-                )
+                # Generate LLM explanation on a short-lived event loop, closing the
+                # explainer's HTTP client (bound to that loop) before the loop goes away
+                with asyncio.Runner() as runner:
+                    try:
+                        summary_explanation = runner.run(
+                            self.llm_explainer.generate_explanation(
+                                metrics=overall_metrics,
+                                strategic_guidance=strategic_guidance,
+                                current_state_description=f"Simulation from {simulation.start_time} to {simulation.end_time}",
+                            )
+                        )
+                    finally:
+                        runner.run(self.llm_explainer.aclose())
                 
                 # Add LLM explanation to key findings if available
                 if summary_explanation:
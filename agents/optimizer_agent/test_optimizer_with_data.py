@@ -3,21 +3,35 @@
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 
 import os
 from dotenv import load_dotenv
 
-from .test_data_loader import HSYDataLoader
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+from .test_data_loader import ForecastMethod, HSYDataLoader, PriceType
 from .test_simulator import RollingMPCSimulator
 from .test_metrics import MetricsCalculator
 from .optimizer import MPCOptimizer, PumpSpec, SystemConstraints
-from .explainability import LLMExplainer, ScheduleMetrics
+from .explainability import DEFAULT_LLM_MODEL, LLMExplainer, ScheduleMetrics
+
+_HERE = Path(__file__).resolve().parent
+_PROJECT_ROOT = _HERE.parent.parent
 
 
-def create_optimizer_from_data(data_loader: HSYDataLoader) -> MPCOptimizer:
+def create_optimizer_from_data(
+    data_loader: HSYDataLoader,
+    integer_horizon_steps: Optional[int] = None,
+) -> MPCOptimizer:
     """Create optimizer with hardcoded pump specifications.
     
     These specs represent physical pump capacities (not old system strategy):
@@ -74,38 +88,76 @@ def create_optimizer_from_data(data_loader: HSYDataLoader) -> MPCOptimizer:
         time_step_minutes=15,
         tactical_horizon_minutes=120,  # 2-hour tactical horizon
         strategic_horizon_minutes=1440,
+        integer_horizon_steps=integer_horizon_steps,
     )
     
     return optimizer
 
 
+def _json_default(obj):
+    """Fallback encoder for values the stdlib json module can't serialize."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "item"):  # numpy scalars
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _log_level(value: str) -> int:
+    """Convert a --log-level name into its logging level number."""
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        raise argparse.ArgumentTypeError(f"invalid log level: {value!r}")
+    return level
+
+
+def write_json_output(output_path: Path, output_data: dict) -> None:
+    """Write results as indented JSON, using orjson when installed."""
+    if orjson is not None:
+        # orjson handles datetimes and numpy values natively
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(output_data, f, indent=2, default=_json_default)
+
+
 def main():
     """Main test function."""
     # Load environment variables from .env file
-    # Priority: agent's own .env, then project root, then current dir
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent.parent.parent
-    env_files = [
-        script_dir / ".env",  # Agent's own .env (highest priority)
-        project_root / ".env",  # Project root
-        Path(".env"),  # Current directory
-    ]
-    
+    # Skipped entirely if credentials are already in the process environment
+    # (CI / secrets manager). OPTIMIZER_ENV_FILE points at an explicit file;
+    # otherwise priority is: agent's own .env, then project root, then current dir
+    env_preloaded = os.environ.get("FEATHERLESS_API_KEY") is not None
+    explicit_env_file = os.environ.get("OPTIMIZER_ENV_FILE")
     env_loaded = False
     loaded_from = None
-    for env_file in env_files:
-        if env_file.exists():
-            load_dotenv(env_file, override=False)  # Don't override existing env vars
-            env_loaded = True
-            loaded_from = env_file
-            break
-    
-    if not env_loaded:
-        # Try loading from current directory as fallback (load_dotenv searches automatically)
-        result = load_dotenv(override=False)
-        if result:
-            env_loaded = True
-            loaded_from = "auto-detected"
+
+    if env_preloaded:
+        pass  # Nothing to load - avoid touching the filesystem
+    elif explicit_env_file:
+        env_loaded = load_dotenv(explicit_env_file, override=False)
+        loaded_from = explicit_env_file
+    else:
+        env_files = [
+            _HERE / ".env",  # Agent's own .env (highest priority)
+            _PROJECT_ROOT / ".env",  # Project root
+            Path(".env"),  # Current directory
+        ]
+
+        for env_file in env_files:
+            if env_file.exists():
+                load_dotenv(env_file, override=False)  # Don't override existing env vars
+                env_loaded = True
+                loaded_from = env_file
+                break
+
+        if not env_loaded:
+            # Try loading from current directory as fallback (load_dotenv searches automatically)
+            result = load_dotenv(override=False)
+            if result:
+                env_loaded = True
+                loaded_from = "auto-detected"
     
     # Log which .env file was loaded (after logging is set up)
     
@@ -124,10 +176,9 @@ def main():
     )
     parser.add_argument(
         "--log-level",
-        type=str,
-        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
-        default="INFO",
-        help="Logging level (default: INFO)",
+        type=_log_level,
+        default=logging.INFO,
+        help="Logging level: DEBUG, INFO, WARNING or ERROR (default: INFO)",
     )
     parser.add_argument(
         "--data-file",
@@ -149,9 +200,9 @@ def main():
     )
     parser.add_argument(
         "--forecast-method",
-        type=str,
-        choices=["perfect", "persistence"],
-        default="perfect",
+        type=ForecastMethod,
+        choices=list(ForecastMethod),
+        default=ForecastMethod.PERFECT,
         help="Forecast method: 'perfect' uses historical data, 'persistence' uses last value (default: perfect)",
     )
     parser.add_argument(
@@ -169,11 +220,50 @@ def main():
         action="store_true",
         help="Enable per-step LLM explanations (slow, requires --use-llm)",
     )
+    parser.add_argument(
+        "--inline-explanations",
+        action="store_true",
+        help="Request each per-step explanation inside the simulation loop (default: batch them concurrently after the run)",
+    )
     parser.add_argument(
         "--no-strategic-plan",
         action="store_true",
         help="Disable LLM strategic planning (faster, but less optimal decisions)",
     )
+    parser.add_argument(
+        "--open-loop",
+        action="store_true",
+        help="Open-loop backtest: solve every step from the recorded plant state in parallel (no rotation/flush/LLM feedback)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --open-loop (default: CPU count)",
+    )
+    parser.add_argument(
+        "--sink",
+        type=str,
+        default=None,
+        help="Stream every simulation step to this Arrow IPC file (requires pyarrow)",
+    )
+    parser.add_argument(
+        "--keep-results",
+        type=int,
+        default=None,
+        help="With --sink, keep only the last N step results in memory",
+    )
+    parser.add_argument(
+        "--integer-horizon",
+        type=int,
+        default=None,
+        help="Keep pump on/off decisions binary only for the first N steps of each horizon, relaxing the rest (faster solves; default: all steps binary)",
+    )
+    parser.add_argument(
+        "--async-logging",
+        action="store_true",
+        help="Write simulation log records and tables from a background thread",
+    )
     parser.add_argument(
         "--show-log-prefix",
         action="store_true",
@@ -181,26 +271,30 @@ def main():
     )
     parser.add_argument(
         "--price-type",
-        type=str,
-        choices=["normal", "high"],
-        default="normal",
+        type=PriceType,
+        choices=list(PriceType),
+        default=PriceType.NORMAL,
         help="Electricity price column to use: 'normal' (everyday) or 'high' (peak variation) (default: normal)",
     )
     
     args = parser.parse_args()
     
     # Set logging level
-    logging.getLogger().setLevel(getattr(logging, args.log_level))
+    logging.getLogger().setLevel(args.log_level)
     logger = logging.getLogger(__name__)
     
     # Log .env loading status
-    if env_loaded:
+    if env_preloaded:
+        logger.info("✓ LLM credentials already set in environment, skipped .env lookup")
+    elif env_loaded:
         logger.info(f"✓ Loaded .env file from: {loaded_from}")
+    elif explicit_env_file:
+        logger.warning(f"⚠ OPTIMIZER_ENV_FILE could not be loaded: {explicit_env_file}")
     else:
         logger.warning("⚠ No .env file found in any checked location")
     
     # Load data
-    data_file_path = Path(__file__).parent / args.data_file
+    data_file_path = _HERE / args.data_file
     if not data_file_path.exists():
         print(f"Error: Data file not found: {data_file_path}")
         return 1
@@ -228,7 +322,7 @@ def main():
     
     # Create optimizer
     print("Initializing optimizer with hardcoded pump specifications...")
-    optimizer = create_optimizer_from_data(data_loader)
+    optimizer = create_optimizer_from_data(data_loader, integer_horizon_steps=args.integer_horizon)
     print(f"  Configured {len(optimizer.pumps)} pumps (2 small ~0.5 m³/s, 5 big ~1.0 m³/s, 1 offline)")
     print()
     
@@ -250,7 +344,7 @@ def main():
             llm_explainer = LLMExplainer(
                 api_base=api_base,
                 api_key=api_key,
-                model=os.getenv("LLM_MODEL", "llama-3.1-8b-instruct"),
+                model=os.getenv("LLM_MODEL", DEFAULT_LLM_MODEL),
             )
             logger.info("✓ LLM explainer enabled")
             logger.info(f"  API Base: {api_base}")
@@ -284,6 +378,8 @@ def main():
         generate_explanations=args.explanations and (llm_explainer is not None),  # Only if explicitly requested
         generate_strategic_plan=(llm_explainer is not None) and not args.no_strategic_plan,  # Enabled by default if LLM available
         suppress_prefix=not args.show_log_prefix,  # Suppress prefix unless flag is set
+        batch_explanations=not args.inline_explanations,
+        async_logging=args.async_logging,
     )
     
     # Run simulation
@@ -292,17 +388,30 @@ def main():
     print()
     
     try:
-        simulation = simulator.simulate(
-            start_time=simulation_start,
-            end_time=simulation_end,
-            horizon_minutes=120,  # 2-hour tactical horizon
-        )
+        if args.open_loop:
+            simulation = simulator.simulate_open_loop(
+                start_time=simulation_start,
+                end_time=simulation_end,
+                horizon_minutes=120,  # 2-hour tactical horizon
+                max_workers=args.workers,
+            )
+        else:
+            simulation = simulator.simulate(
+                start_time=simulation_start,
+                end_time=simulation_end,
+                horizon_minutes=120,  # 2-hour tactical horizon
+                sink_path=args.sink,
+                keep_results=args.keep_results,
+            )
         
-        print(f"Simulation completed: {len(simulation.results)} optimization steps")
+        print(f"Simulation completed: {simulation.num_steps} optimization steps")
         if args.use_llm and llm_explainer:
-            explanations_generated = sum(1 for r in simulation.results if r.explanation is not None)
-            print(f"  Generated {explanations_generated} LLM explanations (one per optimization step)")
+            print(f"  Generated {simulation.num_explanations} LLM explanations (one per optimization step)")
         print()
+
+        if not simulation.num_steps:
+            print("No simulation steps produced; skipping baseline comparison.")
+            return 0
         
         # Compare with baseline
         print("Calculating metrics and comparing with baseline...")
@@ -337,28 +446,29 @@ def main():
         if args.output:
             output_path = Path(args.output)
             if output_path.suffix.lower() == '.json':
-                import json
                 output_data = {
                     'simulation': {
-                        'start_time': simulation.start_time.isoformat(),
-                        'end_time': simulation.end_time.isoformat(),
-                        'num_steps': len(simulation.results),
+                        'start_time': simulation.start_time,
+                        'end_time': simulation.end_time,
+                        'num_steps': simulation.num_steps,
                     },
                     'metrics': report.metrics,
                     'key_findings': report.key_findings,
                 }
-                with open(output_path, 'w') as f:
-                    json.dump(output_data, f, indent=2)
+                write_json_output(output_path, output_data)
                 print(f"Results saved to: {output_path}")
             else:
                 print(f"Warning: Unsupported output format: {output_path.suffix}")
         
         return 0
         
-    except Exception as e:
-        print(f"Error during simulation: {e}")
-        import traceback
-        traceback.print_exc()
+    except FileNotFoundError as e:
+        print(f"Data not found: {e}")
+        return 1
+    except (ValueError, RuntimeError) as e:
+        # Expected simulation failures (e.g. no data in window, solver errors);
+        # anything else propagates with the interpreter's own traceback
+        logger.exception(f"Error during simulation: {e}")
         return 1
 
 
@@ -8,8 +8,11 @@ from pathlib import Path
 from datetime import timedelta
 import logging
 
+_HERE = Path(__file__).resolve().parent
+_PROJECT_ROOT = _HERE.parent.parent
+
 # Add parent to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(_PROJECT_ROOT))
 
 from agents.optimizer_agent.test_data_loader import HSYDataLoader
 from agents.optimizer_agent.test_optimizer_with_data import create_optimizer_from_data
@@ -25,7 +28,7 @@ logger = logging.getLogger(__name__)
 
 def main():
     # Load data
-    data_file = Path(__file__).parent / "Hackathon_HSY_data.xlsx"
+    data_file = _HERE / "Hackathon_HSY_data.xlsx"
     logger.info(f"Loading data from {data_file}")
     data_loader = HSYDataLoader(str(data_file), price_type="normal")
     
@@ -73,13 +76,9 @@ def main():
                 pump_hours[pump_id] = pump_hours.get(pump_id, 0.0) + dt_hours
     
     # Group by capacity
-    small_pumps = []
-    big_pumps = []
-    for pid in optimizer.pumps.keys():
-        if optimizer.pumps[pid].max_flow_m3_s <= 0.5 + 1e-6:
-            small_pumps.append(pid)
-        else:
-            big_pumps.append(pid)
+    is_small = optimizer.max_flow <= 0.5 + 1e-6
+    small_pumps = [pid for pid, i in optimizer.pump_index.items() if is_small[i]]
+    big_pumps = [pid for pid, i in optimizer.pump_index.items() if not is_small[i]]
     
     print("\n" + "=" * 80)
     print("PUMP OPERATING HOURS (8-hour simulation)")
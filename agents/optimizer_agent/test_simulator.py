@@ -2,30 +2,52 @@
 
 from __future__ import annotations
 
+from collections import deque
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from typing import Any, Coroutine, Iterable, Iterator, List, Optional, Dict, Tuple
 
 import numpy as np
 
+try:
+    import pyarrow as pa
+except ImportError:
+    # pyarrow is optional; only needed to stream results to a sink file
+    pa = None
+
 from typing import Optional
 import asyncio
+import concurrent.futures
+import functools
+import os
 import logging
+import logging.handlers
+import queue
+import re
+import sys
+import traceback
 
 from .optimizer import MPCOptimizer, OptimizationResult, CurrentState, ForecastData, OptimizationMode
-from .test_data_loader import HSYDataLoader
+from .test_data_loader import BaselineSchedules, HSYDataLoader
 from .explainability import LLMExplainer, ScheduleMetrics, StrategicPlan, ForecastQualityTracker
 
-def run_async_in_sync(coro, timeout: float = 15.0):
+def run_async_in_sync(coro, timeout: float = 15.0, runner: Optional[asyncio.Runner] = None):
     """Run an async coroutine from a sync context, handling running event loops.
     
     Args:
         coro: Coroutine to run
         timeout: Timeout in seconds (default: 15.0)
+        runner: Optional long-lived asyncio.Runner to reuse when no loop is running
     
     Returns:
         Result of the coroutine
     """
+    if runner is not None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop - reuse the caller's event loop instead of creating one
+            return runner.run(coro)
     try:
         loop = asyncio.get_event_loop()
         # Check if loop is already running (e.g., in WebSocket/async context)
@@ -59,28 +81,79 @@ def run_async_in_sync(coro, timeout: float = 15.0):
 
 logger = logging.getLogger(__name__)
 
+# Box-drawing characters for log tables and boxes
+BORDER_CHAR = "─"
+BORDER_VERTICAL = "│"
+CORNER_TL = "┌"
+CORNER_TR = "┐"
+CORNER_BL = "└"
+CORNER_BR = "┘"
+CORNER_TOP_T = "┬"
+CORNER_BOT_T = "┴"
+CORNER_LEFT_T = "├"
+CORNER_CROSS = "┼"
 
-def format_table(headers: List[str], rows: List[List[str]], width: int = 80) -> List[str]:
-    """Format data as a table with borders.
-    
-    Args:
-        headers: List of column headers
-        rows: List of rows, each row is a list of cell values
-        width: Total table width in characters
+# Fixed pieces of table/box content rows (1 space of padding inside each border)
+ROW_START = BORDER_VERTICAL + " "
+ROW_END = " " + BORDER_VERTICAL
+CELL_SEP = " " + BORDER_VERTICAL + " "
+
+# Status cells of the step tables
+CHECK_MARK = "✓"
+CROSS_MARK = "✗"
+STATUS_OK = "✓ OK"
+STATUS_VIOLATED = "✗ VIOLATED"
+STATUS_IN_RANGE = "✓ IN RANGE"
+STATUS_VIOLATION = "✗ VIOLATION"
+STATUS_WARNING = "⚠ WARNING"
+STATUS_TIME_BASED = "⚠ Time-based"
+
+# Per-request LLM timeouts (seconds) for the step-critical calls
+EMERGENCY_RESPONSE_TIMEOUT_S = 15.0
+STRATEGIC_PLAN_TIMEOUT_S = 30.0
+
+# Sentence boundary (kept as a separate split item) for breaking up long LLM text lines
+_SENT_SPLIT_RE = re.compile(r'([.!?]\s+)')
+
+# Optimizer instance for open-loop worker processes (set once per worker)
+_worker_optimizer: Optional[MPCOptimizer] = None
+
+
+def _init_open_loop_worker(optimizer: MPCOptimizer) -> None:
+    """Process pool initializer: keep one optimizer copy per worker."""
+    global _worker_optimizer
+    _worker_optimizer = optimizer
+
+
+def _solve_open_loop_step(current_state: CurrentState, forecast: ForecastData) -> OptimizationResult:
+    """Solve a single open-loop step in a worker process."""
+    try:
+        return _worker_optimizer.solve_optimization(
+            current_state=current_state,
+            forecast=forecast,
+            mode=OptimizationMode.FULL,
+            timeout_seconds=30,
+        )
+    except Exception:
+        return _worker_optimizer.solve_optimization(
+            current_state=current_state,
+            forecast=forecast,
+            mode=OptimizationMode.RULE_BASED,
+            timeout_seconds=10,
+        )
+
+
+def _column_widths(headers: List[str], rows: List[List[str]], width: int) -> Tuple[int, ...]:
+    """Column widths (including padding) for a table of the given total width.
     
-    Returns:
-        List of formatted table lines
+    Cells must already be strings.
     """
-    if not headers:
-        return []
-    
     # Calculate column widths (ensure headers fit)
     num_cols = len(headers)
     col_widths = [len(str(h)) for h in headers]
     for row in rows:
         for i, cell in enumerate(row[:num_cols]):
-            if i < len(col_widths):
-                col_widths[i] = max(col_widths[i], len(str(cell)))
+            col_widths[i] = max(col_widths[i], len(cell))
     
     # Add padding (minimum 2 spaces on each side)
     col_widths = [max(w + 4, 10) for w in col_widths]
@@ -91,91 +164,126 @@ def format_table(headers: List[str], rows: List[List[str]], width: int = 80) ->
         # Scale down proportionally
         scale = (width - num_cols - 1) / sum(col_widths)
         col_widths = [max(int(w * scale), 8) for w in col_widths]
+    return tuple(col_widths)
+
+
+@functools.lru_cache(maxsize=256)
+def _table_frame(col_widths: Tuple[int, ...]) -> Tuple[str, str, str]:
+    """Top border, header separator and bottom border for the given column widths."""
+    segments = [BORDER_CHAR * w for w in col_widths]
+    return (
+        CORNER_TL + CORNER_TOP_T.join(segments) + CORNER_TR,
+        CORNER_LEFT_T + CORNER_CROSS.join(segments),
+        CORNER_BL + CORNER_BOT_T.join(segments) + CORNER_BR,
+    )
+
+
+def format_table_simple(headers: List[str], rows: List[List[str]], col_widths: Tuple[int, ...]) -> List[str]:
+    """Format a table whose cells are strings that fit their columns unwrapped.
     
-    lines = []
-    border_char = "─"
-    corner_tl = "┌"
-    corner_tr = "┐"
-    corner_bl = "└"
-    corner_br = "┘"
-    corner_cross = "┼"
-    border_vertical = "│"
-    border_horizontal = border_char * sum(col_widths) + border_char * (num_cols - 1)
-    
-    # Top border
-    top_row = corner_tl
-    for i, w in enumerate(col_widths):
-        top_row += border_char * w
-        if i < len(col_widths) - 1:
-            top_row += corner_cross.replace("┼", "┬")
-    top_row += corner_tr
-    lines.append(top_row)
-    
-    # Header row
-    header_row = border_vertical
-    for i, (header, w) in enumerate(zip(headers, col_widths)):
-        header_row += f" {str(header):<{w-2}} {border_vertical}"
-    lines.append(header_row)
-    
-    # Separator row
-    sep_row = corner_tl.replace("┌", "├")
-    for i, w in enumerate(col_widths):
-        sep_row += border_char * w
-        if i < len(col_widths) - 1:
-            sep_row += corner_cross
-    sep_row = sep_row.replace("├", "├").replace("┐", "┤")
-    lines.append(sep_row)
+    Same layout as format_table, without any wrapping or width computation.
     
-    # Data rows - handle cell wrapping
+    Args:
+        headers: List of column headers
+        rows: List of rows of string cells (missing trailing cells are left blank)
+        col_widths: Column widths including padding (see _column_widths)
+    
+    Returns:
+        List of formatted table lines
+    """
+    top, separator, bottom = _table_frame(col_widths)
+    pads = [w - 2 for w in col_widths]  # 1 space of padding on each side
+    
+    lines = [top, ROW_START + CELL_SEP.join(str(header).ljust(pad) for header, pad in zip(headers, pads)) + ROW_END, separator]
     for row in rows:
+        lines.append(ROW_START + CELL_SEP.join(row[i].ljust(pad) if i < len(row) else " " * pad for i, pad in enumerate(pads)) + ROW_END)
+    lines.append(bottom)
+    return lines
+
+
+def format_table(headers: List[str], rows: List[List[str]], width: int = 80) -> List[str]:
+    """Format data as a table with borders.
+    
+    Args:
+        headers: List of column headers
+        rows: List of rows, each row is a list of cell values
+        width: Total table width in characters
+    
+    Returns:
+        List of formatted table lines
+    """
+    if not headers:
+        return []
+    
+    # Stringify every cell once (missing trailing cells are blank); reused for widths and rendering
+    num_cols = len(headers)
+    cell_rows = [[str(row[i]) if i < len(row) else "" for i in range(num_cols)] for row in rows]
+    col_widths = _column_widths(headers, cell_rows, width)
+    
+    # Cell text width per column (1 space of padding on each side)
+    pads = [w - 2 for w in col_widths]
+    
+    # Fast path: every cell fits its column as-is (wrap_text would return it unchanged)
+    if all(
+        len(cell) <= pad and (not cell or " ".join(cell.split()) == cell)
+        for cells in cell_rows
+        for cell, pad in zip(cells, pads)
+    ):
+        return format_table_simple(headers, cell_rows, col_widths)
+    
+    top, separator, bottom = _table_frame(col_widths)
+    lines = [
+        top,
+        # Header row
+        ROW_START + CELL_SEP.join(str(header).ljust(pad) for header, pad in zip(headers, pads)) + ROW_END,
+        separator,
+    ]
+    
+    # Data rows - handle cell wrapping
+    for cells in cell_rows:
         # Wrap each cell value to fit column width
         wrapped_cells = []
         max_wrapped_lines = 1
-        for i, w in enumerate(col_widths):
-            cell_value = str(row[i]) if i < len(row) else ""
-            cell_width = w - 2  # Account for padding spaces
-            wrapped = wrap_text(cell_value, cell_width)
+        for cell_value, pad in zip(cells, pads):
+            wrapped = wrap_text(cell_value, pad)
             wrapped_cells.append(wrapped)
             max_wrapped_lines = max(max_wrapped_lines, len(wrapped))
         
         # Create multiple rows if cells wrap
         for line_idx in range(max_wrapped_lines):
-            data_row = border_vertical
-            for i, w in enumerate(col_widths):
-                wrapped = wrapped_cells[i]
-                # Get the line for this cell, or empty if no more lines
-                cell_line = wrapped[line_idx] if line_idx < len(wrapped) else ""
-                data_row += f" {cell_line:<{w-2}} {border_vertical}"
-            lines.append(data_row)
-    
-    # Bottom border
-    bot_row = corner_bl
-    for i, w in enumerate(col_widths):
-        bot_row += border_char * w
-        if i < len(col_widths) - 1:
-            bot_row += corner_cross.replace("┼", "┴")
-    bot_row += corner_br
-    lines.append(bot_row)
+            # Get the line for each cell, or empty if no more lines
+            lines.append(
+                ROW_START
+                + CELL_SEP.join(
+                    (wrapped[line_idx] if line_idx < len(wrapped) else "").ljust(pad)
+                    for wrapped, pad in zip(wrapped_cells, pads)
+                )
+                + ROW_END
+            )
     
+    lines.append(bottom)
     return lines
 
 
-def wrap_text(text: str, max_width: int) -> List[str]:
+@functools.lru_cache(maxsize=4096)
+def wrap_text(text: str, max_width: int) -> Tuple[str, ...]:
     """Wrap text at word boundaries, respecting max width.
     
+    Memoized: table labels and pump IDs recur on every simulation step.
+    
     Args:
         text: Text to wrap
         max_width: Maximum width per line
     
     Returns:
-        List of wrapped lines
+        Tuple of wrapped lines
     """
     if not text:
-        return []
+        return ()
     
     words = text.split()
     if not words:
-        return [text]
+        return (text,)
     
     lines = []
     current_line = []
@@ -205,7 +313,75 @@ def wrap_text(text: str, max_width: int) -> List[str]:
     if current_line:
         lines.append(" ".join(current_line))
     
-    return lines if lines else [text[:max_width]]
+    return tuple(lines) if lines else (text[:max_width],)
+
+
+@functools.lru_cache(maxsize=256)
+def _box_frame(title: str, width: int) -> Tuple[str, str, str]:
+    """Top border (with title), empty content row and bottom border of a box."""
+    horizontal = BORDER_CHAR * (width - 2)
+    
+    # Top border with title
+    title_line = f" {title} "
+    top_border = CORNER_TL + horizontal + CORNER_TR
+    if len(title_line) <= width - 4:
+        # Insert title into top border
+        title_start = (width - len(title_line) - 2) // 2
+        top_border = CORNER_TL + BORDER_CHAR * (title_start - 1) + title_line + BORDER_CHAR * (width - title_start - len(title_line) - 1) + CORNER_TR
+    
+    return top_border, BORDER_VERTICAL + " " * (width - 2) + BORDER_VERTICAL, CORNER_BL + horizontal + CORNER_BR
+
+
+def _split_long_line(line: str, limit: int = 200) -> List[str]:
+    """Break a long line at sentence ends into chunks of at most ~limit characters.
+    
+    Sentences are packed greedily; a single sentence longer than limit stays whole.
+    """
+    if '.' not in line and '!' not in line and '?' not in line:
+        # No sentence end (e.g. a URL or list of values): nothing to split at
+        return [line.strip()] if line else []
+    parts = _SENT_SPLIT_RE.split(line)
+    # Pair each sentence with the boundary that follows it
+    sentences = [parts[i] + parts[i + 1] if i + 1 < len(parts) else parts[i] for i in range(0, len(parts), 2)]
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for sentence in sentences:
+        if current_len + len(sentence) > limit:
+            if current_len:
+                chunks.append("".join(current).strip())
+            current = [sentence]
+            current_len = len(sentence)
+        else:
+            current.append(sentence)
+            current_len += len(sentence)
+    if current_len:
+        chunks.append("".join(current).strip())
+    return chunks
+
+
+def _iter_wrapped_lines(text: str, limit: int = 200, paragraph_gap: bool = True) -> Iterator[str]:
+    """Yield the stripped non-blank lines of LLM text, splitting lines over limit at sentence ends.
+    
+    Paragraphs (separated by an empty line) are separated by one "" line if paragraph_gap is set.
+    """
+    started = False
+    gap = False
+    for raw_line in text.split('\n'):
+        if not raw_line:
+            gap = started
+            continue
+        line = raw_line.strip()
+        if not line:
+            continue
+        if gap and paragraph_gap:
+            yield ""
+        gap = False
+        started = True
+        if len(line) > limit:
+            yield from _split_long_line(line, limit)
+        else:
+            yield line
 
 
 def format_boxed_text(title: str, lines: List[str], width: int = 80) -> List[str]:
@@ -219,44 +395,101 @@ def format_boxed_text(title: str, lines: List[str], width: int = 80) -> List[str
     Returns:
         List of formatted box lines
     """
-    result = []
-    border_char = "─"
-    corner_tl = "┌"
-    corner_tr = "┐"
-    corner_bl = "└"
-    corner_br = "┘"
-    border_vertical = "│"
+    top_border, empty_row, bottom_border = _box_frame(title, width)
+    result = [top_border]
     
     # Content width (accounting for borders and padding)
     content_width = width - 4  # 2 spaces + 2 border chars
     
-    # Top border with title
-    title_line = f" {title} "
-    top_border = corner_tl + border_char * (width - 2) + corner_tr
-    if len(title_line) <= width - 4:
-        # Insert title into top border
-        title_start = (width - len(title_line) - 2) // 2
-        top_border = corner_tl + border_char * (title_start - 1) + title_line + border_char * (width - title_start - len(title_line) - 1) + corner_tr
-    result.append(top_border)
-    
     # Content lines with proper word wrapping
     if not lines:
         # Empty box - just add border
-        result.append(f"{border_vertical}{' ' * (width - 2)}{border_vertical}")
+        result.append(empty_row)
     else:
         for line in lines:
             # Wrap long lines at word boundaries
-            wrapped_lines = wrap_text(line, content_width)
-            for wrapped_line in wrapped_lines:
-                result.append(f"{border_vertical} {wrapped_line:<{content_width}} {border_vertical}")
+            for wrapped_line in wrap_text(line, content_width):
+                result.append(ROW_START + wrapped_line.ljust(content_width) + ROW_END)
     
     # Bottom border
-    result.append(corner_bl + border_char * (width - 2) + corner_br)
+    result.append(bottom_border)
     
     return result
 
 
-def log_table(logger, headers: List[str], rows: List[List[str]], width: int = 80, include_header: bool = False, suppress_prefix: bool = True):
+# Record attribute marking prefix-free stdout output queued by _write_lines
+_PLAIN_OUTPUT = "plain_output"
+# Queue handler of the active async logging session, if any (see _start_async_logging)
+_plain_output_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def _is_plain_output(record: logging.LogRecord) -> bool:
+    """Handler filter passing only _write_lines output."""
+    return getattr(record, _PLAIN_OUTPUT, False)
+
+
+def _is_log_record(record: logging.LogRecord) -> bool:
+    """Handler filter passing only regular log records."""
+    return not getattr(record, _PLAIN_OUTPUT, False)
+
+
+def _write_lines(lines: List[str]) -> None:
+    """Write lines to stdout in a single call (same output as print() per line).
+    
+    While async logging is active the lines are queued behind the log records before them.
+    """
+    if not lines:
+        return
+    text = "\n".join(lines)
+    if _plain_output_handler is not None:
+        _plain_output_handler.handle(logging.makeLogRecord(
+            {"msg": text, "levelno": logging.INFO, "levelname": "INFO", _PLAIN_OUTPUT: True}
+        ))
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def _start_async_logging() -> Tuple[logging.handlers.QueueListener, logging.handlers.QueueHandler]:
+    """Route the optimizer agent's log records through a queue drained by a background thread.
+    
+    Records are handed to the root logger's current handlers, so output format is unchanged.
+    Lines written by _write_lines share the queue (and so keep their order) and go to stdout bare.
+    """
+    global _plain_output_handler
+    package_logger = logging.getLogger(__name__.rpartition('.')[0])
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    plain_handler = logging.StreamHandler(sys.stdout)
+    plain_handler.addFilter(_is_plain_output)
+    root_handlers = logging.getLogger().handlers
+    for handler in root_handlers:
+        handler.addFilter(_is_log_record)
+    listener = logging.handlers.QueueListener(
+        log_queue, plain_handler, *root_handlers, respect_handler_level=True
+    )
+    package_logger.addHandler(queue_handler)
+    package_logger.propagate = False
+    _plain_output_handler = queue_handler
+    listener.start()
+    return listener, queue_handler
+
+
+def _stop_async_logging(
+    listener: logging.handlers.QueueListener,
+    queue_handler: logging.handlers.QueueHandler,
+) -> None:
+    """Flush queued records and restore synchronous logging."""
+    global _plain_output_handler
+    package_logger = logging.getLogger(__name__.rpartition('.')[0])
+    package_logger.removeHandler(queue_handler)
+    package_logger.propagate = True
+    _plain_output_handler = None
+    listener.stop()  # Drains the queue before returning
+    for handler in listener.handlers:
+        handler.removeFilter(_is_log_record)
+
+
+def log_table(logger, headers: List[str], rows: List[List[str]], width: int = 80, include_header: bool = False, suppress_prefix: bool = True, fast: bool = False):
     """Log a table using the logger. Header only on first line if include_header=True.
     
     Args:
@@ -266,15 +499,20 @@ def log_table(logger, headers: List[str], rows: List[List[str]], width: int = 80
         width: Table width in characters
         include_header: Whether to include timestamp/module/level on first line
         suppress_prefix: If True, use print() for continuation lines (cleaner output)
+        fast: Rows are short strings that never wrap (uses format_table_simple)
     """
     import datetime
-    table_lines = format_table(headers, rows, width)
+    if not suppress_prefix and not logger.isEnabledFor(logging.INFO):
+        return  # Nobody would see the lines: skip formatting
+    if fast:
+        table_lines = format_table_simple(headers, rows, _column_widths(headers, rows, width))
+    else:
+        table_lines = format_table(headers, rows, width)
     
     # Log lines based on suppress_prefix setting
     if suppress_prefix:
-        # All lines clean (no prefix) - use print for all
-        for line in table_lines:
-            print(line)
+        # All lines clean (no prefix) - one buffered write for the whole table
+        _write_lines(table_lines)
     else:
         # All lines with prefix - use logger for all
         for line in table_lines:
@@ -293,6 +531,8 @@ def log_boxed(logger, title: str, lines: List[str], width: int = 80, include_tim
         suppress_prefix: If True, use print() for continuation lines (cleaner output)
     """
     import datetime
+    if not suppress_prefix and not logger.isEnabledFor(logging.INFO):
+        return  # Nobody would see the lines: skip formatting
     
     # Add timestamp to title if requested
     if include_timestamp:
@@ -305,16 +545,78 @@ def log_boxed(logger, title: str, lines: List[str], width: int = 80, include_tim
     
     # Log lines based on suppress_prefix setting
     if suppress_prefix:
-        # All lines clean (no prefix) - use print for all
-        for line in box_lines:
-            print(line)
+        # All lines clean (no prefix) - one buffered write for the whole box
+        _write_lines(box_lines)
     else:
         # All lines with prefix - use logger for all
         for line in box_lines:
             logger.info(line)  # Formatter adds prefix automatically
 
 
-@dataclass
+@dataclass(slots=True)
+class StepAggregate:
+    """Totals over the running pumps of one schedule's first time step."""
+    energy_kwh: float = 0.0
+    cost_eur: float = 0.0
+    outflow_m3_s: float = 0.0
+    running_pumps: List[str] = field(default_factory=list)
+
+
+def _reduce_first_step(
+    running: Iterable[Tuple[str, float, float]],
+    dt_hours: float,
+    price_eur_per_kwh: float,
+) -> StepAggregate:
+    """Accumulate energy, cost, outflow and running pumps in a single pass.
+    
+    Args:
+        running: (pump_id, flow_m3_s, power_kw) of each pump running in the first step
+        dt_hours: Step length in hours
+        price_eur_per_kwh: Electricity price for the step
+    """
+    agg = StepAggregate()
+    power_kw_total = 0.0
+    for pump_id, flow_m3_s, power_kw in running:
+        power_kw_total += power_kw
+        agg.outflow_m3_s += flow_m3_s
+        agg.running_pumps.append(pump_id)
+    # Step duration and price are the same for every pump: scale the total once
+    agg.energy_kwh = power_kw_total * dt_hours
+    agg.cost_eur = power_kw_total * (dt_hours * price_eur_per_kwh)
+    return agg
+
+
+def _reduce_baseline_steps(
+    baseline: BaselineSchedules,
+    dt_hours: float,
+    price_eur_per_kwh: np.ndarray,
+) -> List[StepAggregate]:
+    """Per-tick energy, cost, outflow and running pumps of the historical schedules.
+    
+    Args:
+        baseline: Baseline schedules as (ticks, pumps) arrays
+        dt_hours: Step length in hours
+        price_eur_per_kwh: Electricity price of each tick
+    """
+    power_kw = np.where(baseline.is_on, baseline.power_kw, 0.0).sum(axis=1)
+    energy_kwh = power_kw * dt_hours
+    cost_eur = power_kw * (dt_hours * price_eur_per_kwh)
+    outflow_m3_s = np.where(baseline.is_on, baseline.flow_m3_s, 0.0).sum(axis=1)
+    pump_ids = np.asarray(baseline.pump_ids)
+    return [
+        StepAggregate(
+            energy_kwh=energy,
+            cost_eur=cost,
+            outflow_m3_s=outflow,
+            running_pumps=pump_ids[is_on].tolist(),
+        )
+        for energy, cost, outflow, is_on in zip(
+            energy_kwh.tolist(), cost_eur.tolist(), outflow_m3_s.tolist(), baseline.is_on
+        )
+    ]
+
+
+@dataclass(slots=True)
 class SimulationResult:
     """Results from rolling MPC simulation."""
     timestamp: datetime
@@ -324,25 +626,236 @@ class SimulationResult:
     explanation: Optional[str] = None  # LLM explanation for this step
     strategy: Optional[str] = None  # Strategic guidance for this step
     strategic_plan: Optional[StrategicPlan] = None  # LLM-generated 24h strategic plan
+    optimized_step: StepAggregate = field(default_factory=StepAggregate)  # First-step totals (optimized)
+    baseline_step: StepAggregate = field(default_factory=StepAggregate)  # First-step totals (baseline)
+
+
+# Per-step numeric series of a RollingSimulation (row order of RollingSimulation._series)
+STEP_SERIES = (
+    'optimized_l1_trajectory',
+    'baseline_l1_trajectory',
+    'optimized_energy',
+    'baseline_energy',
+    'optimized_cost',
+    'baseline_cost',
+    'optimized_outflow',
+    'baseline_outflow',
+    'inflow',
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class RollingSimulation:
-    """Results from full rolling simulation."""
+    """Results from full rolling simulation.
+    
+    Per-step series are stored column-wise in preallocated NumPy arrays; the
+    properties below return views of the steps recorded so far.
+    """
     start_time: datetime
     end_time: datetime
     results: List[SimulationResult] = field(default_factory=list)
-    optimized_l1_trajectory: List[float] = field(default_factory=list)
-    baseline_l1_trajectory: List[float] = field(default_factory=list)
-    optimized_energy: List[float] = field(default_factory=list)
-    baseline_energy: List[float] = field(default_factory=list)
-    optimized_cost: List[float] = field(default_factory=list)
-    baseline_cost: List[float] = field(default_factory=list)
+    num_explanations: int = 0  # Steps with a generated LLM explanation
+    sink_path: Optional[str] = None  # Arrow IPC stream holding every step (results may be trimmed)
+    _series: np.ndarray = field(default_factory=lambda: np.empty((len(STEP_SERIES), 0)), init=False, repr=False)
+    _timestamps: np.ndarray = field(default_factory=lambda: np.empty(0, dtype='datetime64[s]'), init=False, repr=False)
+    _num_steps: int = field(default=0, init=False, repr=False)
+
+    def reserve(self, capacity: int) -> None:
+        """Grow the per-step arrays to hold at least capacity steps."""
+        if capacity <= self._series.shape[1]:
+            return
+        series = np.empty((len(STEP_SERIES), capacity))
+        timestamps = np.empty(capacity, dtype='datetime64[s]')
+        series[:, :self._num_steps] = self._series[:, :self._num_steps]
+        timestamps[:self._num_steps] = self._timestamps[:self._num_steps]
+        self._series = series
+        self._timestamps = timestamps
+
+    def record_step(
+        self,
+        timestamp: datetime,
+        optimized_l1: float,
+        baseline_l1: float,
+        optimized_energy: float,
+        baseline_energy: float,
+        optimized_cost: float,
+        baseline_cost: float,
+        optimized_outflow: float,
+        baseline_outflow: float,
+        inflow: float,
+    ) -> None:
+        """Store one step's values (arguments in STEP_SERIES order)."""
+        i = self._num_steps
+        if i == self._series.shape[1]:
+            self.reserve(max(2 * i, 96))
+        series = self._series
+        series[0, i] = optimized_l1
+        series[1, i] = baseline_l1
+        series[2, i] = optimized_energy
+        series[3, i] = baseline_energy
+        series[4, i] = optimized_cost
+        series[5, i] = baseline_cost
+        series[6, i] = optimized_outflow
+        series[7, i] = baseline_outflow
+        series[8, i] = inflow
+        self._timestamps[i] = timestamp
+        self._num_steps = i + 1
+
+    @property
+    def num_steps(self) -> int:
+        """Number of simulated steps (results may hold only the most recent ones)."""
+        return self._num_steps
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self._num_steps]
+
+    @property
+    def optimized_l1_trajectory(self) -> np.ndarray:
+        return self._series[0, :self._num_steps]
+
+    @property
+    def baseline_l1_trajectory(self) -> np.ndarray:
+        return self._series[1, :self._num_steps]
+
+    @property
+    def optimized_energy(self) -> np.ndarray:
+        return self._series[2, :self._num_steps]
+
+    @property
+    def baseline_energy(self) -> np.ndarray:
+        return self._series[3, :self._num_steps]
+
+    @property
+    def optimized_cost(self) -> np.ndarray:
+        return self._series[4, :self._num_steps]
+
+    @property
+    def baseline_cost(self) -> np.ndarray:
+        return self._series[5, :self._num_steps]
+
+    @property
+    def optimized_outflow(self) -> np.ndarray:
+        return self._series[6, :self._num_steps]
+
+    @property
+    def baseline_outflow(self) -> np.ndarray:
+        return self._series[7, :self._num_steps]
+
+    @property
+    def inflow(self) -> np.ndarray:
+        return self._series[8, :self._num_steps]
+
+
+@dataclass(slots=True)
+class StepColumns:
+    """Per-step columns used by compare_with_baseline."""
+    optimized_outflow_m3_s: np.ndarray
+    baseline_outflow_m3_s: np.ndarray
+    inflow_m3_s: np.ndarray
+    optimized_running_pumps: List[str]  # Running pump IDs of all steps, flattened
+    baseline_running_pumps: List[str]
+
+
+class _ErrorWindow:
+    """Fixed-size ring buffer of (forecast, actual, error) samples.
+    
+    The errors of the last `recent` samples are also kept as Python floats for recent_mean().
+    """
+    
+    __slots__ = ('forecast', 'actual', 'error', '_next', '_count', '_recent')
+    
+    def __init__(self, size: int, recent: int = 5):
+        self.forecast = np.zeros(size)
+        self.actual = np.zeros(size)
+        self.error = np.zeros(size)
+        self._next = 0
+        self._count = 0
+        self._recent: deque = deque(maxlen=recent)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, forecast: float, actual: float, error: float) -> None:
+        i = self._next
+        self.forecast[i] = forecast
+        self.actual[i] = actual
+        self.error[i] = error
+        self._next = (i + 1) % len(self.error)
+        self._count = min(self._count + 1, len(self.error))
+        self._recent.append(error)
+    
+    def recent_mean(self) -> float:
+        """Mean error of the last `recent` samples (0.0 if empty)."""
+        # A sum over at most `recent` floats: no NumPy dispatch, and unlike a running
+        # sum it cannot drift (e.g. to -0.0 once large errors leave the window)
+        return sum(self._recent) / len(self._recent) if self._recent else 0.0
+
+
+class _StepSink:
+    """Append-only Arrow IPC stream with one row per simulation step."""
+
+    SCHEMA = pa.schema([
+        ('timestamp', pa.timestamp('us')),
+        ('inflow_m3_s', pa.float64()),
+        ('optimized_outflow_m3_s', pa.float64()),
+        ('baseline_outflow_m3_s', pa.float64()),
+        ('optimized_running_pumps', pa.list_(pa.string())),
+        ('baseline_running_pumps', pa.list_(pa.string())),
+    ]) if pa is not None else None
+
+    def __init__(self, path: str, batch_size: int = 96):
+        if pa is None:
+            raise ImportError("pyarrow is required to stream simulation results to a sink file")
+        self.path = path
+        self.batch_size = batch_size
+        self._rows: Dict[str, list] = {name: [] for name in self.SCHEMA.names}
+        self._writer = pa.ipc.new_stream(path, self.SCHEMA)
+
+    def write(self, result: SimulationResult) -> None:
+        """Buffer one step; full buffers are flushed as a record batch."""
+        rows = self._rows
+        rows['timestamp'].append(result.timestamp)
+        rows['inflow_m3_s'].append(result.current_state.inflow_m3_s)
+        rows['optimized_outflow_m3_s'].append(result.optimized_step.outflow_m3_s)
+        rows['baseline_outflow_m3_s'].append(result.baseline_step.outflow_m3_s)
+        rows['optimized_running_pumps'].append(result.optimized_step.running_pumps)
+        rows['baseline_running_pumps'].append(result.baseline_step.running_pumps)
+        if len(rows['timestamp']) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows['timestamp']:
+            self._writer.write_batch(pa.record_batch(self._rows, schema=self.SCHEMA))
+            self._rows = {name: [] for name in self.SCHEMA.names}
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+    @staticmethod
+    def read_columns(path: str) -> StepColumns:
+        """Read a sink file back as contiguous per-step columns."""
+        if pa is None:
+            raise ImportError("pyarrow is required to read a simulation sink file")
+        with pa.ipc.open_stream(path) as reader:
+            table = reader.read_all()
+        return StepColumns(
+            optimized_outflow_m3_s=table.column('optimized_outflow_m3_s').to_numpy(),
+            baseline_outflow_m3_s=table.column('baseline_outflow_m3_s').to_numpy(),
+            inflow_m3_s=table.column('inflow_m3_s').to_numpy(),
+            optimized_running_pumps=table.column('optimized_running_pumps').combine_chunks().flatten().to_pylist(),
+            baseline_running_pumps=table.column('baseline_running_pumps').combine_chunks().flatten().to_pylist(),
+        )
 
 
 class RollingMPCSimulator:
     """Simulate rolling MPC optimization on historical data."""
 
+    # Large forecast-error warnings are logged together every N steps (or once this many are queued)
+    WARNING_FLUSH_STEPS = 10
+    WARNING_FLUSH_LINES = 20
+
     def __init__(
         self,
         data_loader: HSYDataLoader,
@@ -353,6 +866,10 @@ class RollingMPCSimulator:
         generate_explanations: bool = False,  # Default to False - explanations are slow
         generate_strategic_plan: bool = True,  # Default to True - strategic planning is fast and useful
         suppress_prefix: bool = True,
+        batch_explanations: bool = False,
+        explanation_concurrency: int = 16,
+        explanation_failure_limit: int = 5,
+        async_logging: bool = False,
     ):
         """Initialize simulator.
         
@@ -365,6 +882,13 @@ class RollingMPCSimulator:
             generate_explanations: Whether to generate explanations for each optimization step (default: False - slow)
             generate_strategic_plan: Whether to generate 24h strategic plan (default: True - fast and useful)
             suppress_prefix: If True, suppress timestamp/module/level prefix on continuation lines (default: True)
+            batch_explanations: If True, defer per-step explanations and request them concurrently
+                after the simulation loop instead of blocking each step on the LLM (default: False)
+            explanation_concurrency: Max in-flight LLM requests when batching explanations (default: 16)
+            explanation_failure_limit: Consecutive failed inline explanations after which explanations
+                are skipped for the rest of the run (default: 5)
+            async_logging: If True, log records and tables of the optimizer agent are queued during
+                simulate() and written by a background thread (default: False)
         """
         self.data_loader = data_loader
         self.optimizer = optimizer
@@ -374,19 +898,115 @@ class RollingMPCSimulator:
         self.generate_explanations = generate_explanations and (llm_explainer is not None)
         self.generate_strategic_plan = generate_strategic_plan and (llm_explainer is not None)
         self.suppress_prefix = suppress_prefix
+        self.batch_explanations = batch_explanations
+        self.explanation_concurrency = explanation_concurrency
+        self.explanation_failure_limit = explanation_failure_limit
+        self.async_logging = async_logging
+        # Circuit breaker for inline explanations (reset at the start of each run)
+        self._explain_failures = 0
+        self._explain_disabled = False
         # Initialize forecast quality tracker for recalibration loop
         self.forecast_quality_tracker = ForecastQualityTracker()
         # Track cumulative pump usage hours for fairness/rotation
         self.pump_usage_hours: Dict[str, float] = {}
-        # Track how long each pump has been on/off (in minutes) for rotation-aware min duration
-        # Format: {pump_id: {"on_minutes": float, "off_minutes": float}}
-        self.pump_durations: Dict[str, Dict[str, float]] = {}
+        # Track how long each pump has been on/off (in minutes) for rotation-aware min duration,
+        # one array slot per pump (see _register_pumps); pump_durations gives the optimizer's dict view
+        self._pump_index: Dict[str, int] = {}
+        self._pump_on_minutes = np.zeros(0)
+        self._pump_off_minutes = np.zeros(0)
+        # Constraint values and display strings used every step (see _prime_constants)
+        self._prime_constants()
+        # Event loop shared by the LLM calls of the current simulate() run
+        self._runner: Optional[asyncio.Runner] = None
+        # Step output settings, refreshed by simulate() in case logging is configured
+        # (or suppress_prefix changed) after construction
+        self._configure_output()
 
+    def _prime_constants(self) -> None:
+        """Cache per-step constants derived from the optimizer's pump specs and constraints.
+        
+        Called on construction and at the start of each simulate() run, so changes made
+        to the optimizer between runs are picked up.
+        """
+        constraints = self.optimizer.constraints
+        self._l1_min = constraints.l1_min_m
+        self._l1_max = constraints.l1_max_m
+        self._l1_range = self._l1_max - self._l1_min
+        self._min_pumps_on = constraints.min_pumps_on
+        # Mass-balance fallback multiplies by this instead of dividing every step
+        self._inv_tunnel_volume_m3 = 1.0 / constraints.tunnel_volume_m3
+        
+        # (min, max) frequency of each pump, for the per-step frequency check
+        self._pump_freq_bounds = {
+            pump_id: (spec.min_frequency_hz, spec.max_frequency_hz)
+            for pump_id, spec in self.optimizer.pumps.items()
+        }
+        # Frequency range from pump specs (min/max over all pumps)
+        self._freq_range_str = "47.8-50.0 Hz"  # Default
+        if self._pump_freq_bounds:
+            min_freq = min(low for low, _ in self._pump_freq_bounds.values())
+            max_freq = max(high for _, high in self._pump_freq_bounds.values())
+            if min_freq == max_freq:
+                self._freq_range_str = f"{min_freq:.1f} Hz"
+            else:
+                self._freq_range_str = f"{min_freq:.1f}-{max_freq:.1f} Hz"
+        
+        # Constraints table rows whose value is fixed, indexed by whether the constraint holds
+        l1_min_str = f"{self._l1_min:.2f} m"
+        l1_max_str = f"{self._l1_max:.2f} m"
+        self._l1_min_rows = (["L1 Min", l1_min_str, STATUS_VIOLATED], ["L1 Min", l1_min_str, STATUS_OK])
+        self._l1_max_rows = (["L1 Max", l1_max_str, STATUS_VIOLATED], ["L1 Max", l1_max_str, STATUS_OK])
+        self._min_pumps_on_str = f"{self._min_pumps_on}"
+        self._l1_bounds_str = f"[{self._l1_min:.1f} - {self._l1_max:.1f} m]"
+        
+        # Constraints table rows that do not depend on the current state
+        static_rows = [
+            ["Min On Duration", f"{constraints.min_pump_on_duration_minutes} min", STATUS_TIME_BASED],
+            ["Min Off Duration", f"{constraints.min_pump_off_duration_minutes} min", STATUS_TIME_BASED],
+            ["Allow L1 Violations", f"{'Yes' if constraints.allow_l1_violations else 'No'}", ""],
+        ]
+        if constraints.allow_l1_violations:
+            static_rows.append(["Violation Tolerance", f"{constraints.l1_violation_tolerance_m:.2f} m", ""])
+            static_rows.append(["Violation Penalty", f"{constraints.l1_violation_penalty:.1f}", ""])
+        self._static_constraint_rows = static_rows
+    
+    def _configure_output(self) -> None:
+        """Pick how step output is written for the current suppress_prefix and log level."""
+        # Whether the per-step tables/boxes would be seen (printed output always is)
+        self._show_tables = self.suppress_prefix or logger.isEnabledFor(logging.INFO)
+        # Blank separator line before a table or box
+        if self.suppress_prefix:
+            self._emit_blank = functools.partial(_write_lines, [""])
+        else:
+            self._emit_blank = functools.partial(logger.info, "")
+    
+    @property
+    def pump_durations(self) -> Dict[str, Dict[str, float]]:
+        """On/off minutes per pump: {pump_id: {"on_minutes": float, "off_minutes": float}}."""
+        on_minutes = self._pump_on_minutes.tolist()
+        off_minutes = self._pump_off_minutes.tolist()
+        return {
+            pump_id: {"on_minutes": on_minutes[i], "off_minutes": off_minutes[i]}
+            for pump_id, i in self._pump_index.items()
+        }
+    
+    def _register_pumps(self, pump_ids: Iterable[str]) -> None:
+        """Give unseen pumps an on/off duration slot starting at 0 minutes."""
+        new_ids = [pump_id for pump_id in pump_ids if pump_id not in self._pump_index]
+        if not new_ids:
+            return
+        for pump_id in new_ids:
+            self._pump_index[pump_id] = len(self._pump_index)
+        self._pump_on_minutes = np.concatenate([self._pump_on_minutes, np.zeros(len(new_ids))])
+        self._pump_off_minutes = np.concatenate([self._pump_off_minutes, np.zeros(len(new_ids))])
+    
     def simulate(
         self,
         start_time: datetime,
         end_time: datetime,
         horizon_minutes: int = 120,  # 2-hour tactical horizon
+        sink_path: Optional[str] = None,
+        keep_results: Optional[int] = None,
     ) -> RollingSimulation:
         """Run rolling MPC simulation.
         
@@ -394,15 +1014,64 @@ class RollingMPCSimulator:
             start_time: Start time for simulation
             end_time: End time for simulation
             horizon_minutes: Optimization horizon in minutes (default 120 = 2h)
+            sink_path: Optional Arrow IPC stream file receiving one row per step (requires pyarrow)
+            keep_results: With sink_path, keep only the last N results in memory (default: all)
         
         Returns:
-            RollingSimulation with all results
+            RollingSimulation with all results (or the last keep_results of them)
         """
-        simulation = RollingSimulation(start_time=start_time, end_time=end_time)
+        if keep_results is not None and (sink_path is None or keep_results < 1):
+            raise ValueError("keep_results requires sink_path and must be at least 1")
+        
+        self._explain_failures = 0
+        self._explain_disabled = False
+        self._configure_output()
+        self._prime_constants()
+        sink = _StepSink(sink_path) if sink_path is not None else None
+        log_queue = _start_async_logging() if self.async_logging else None
+        # One event loop for every LLM call of the run (and the pooled HTTP client bound to it)
+        with asyncio.Runner() as runner:
+            self._runner = runner
+            try:
+                return self._simulate_closed_loop(start_time, end_time, horizon_minutes, sink, keep_results)
+            finally:
+                if sink is not None:
+                    sink.close()
+                if self.llm_explainer is not None:
+                    run_async_in_sync(self.llm_explainer.aclose(), runner=runner)
+                self._runner = None
+                if log_queue is not None:
+                    _stop_async_logging(*log_queue)
+
+    def _simulate_closed_loop(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        horizon_minutes: int,
+        sink: Optional[_StepSink],
+        keep_results: Optional[int],
+    ) -> RollingSimulation:
+        """Closed-loop simulation body; see simulate()."""
+        simulation = RollingSimulation(
+            start_time=start_time,
+            end_time=end_time,
+            sink_path=sink.path if sink is not None else None,
+        )
         
-        current_time = start_time
         horizon_steps = horizon_minutes // self.optimizer.time_step_minutes
         
+        # Prefetch per-tick historical inputs (environmental inputs only: inflow,
+        # price, L1) with one index lookup each. Pump states always come from
+        # the previous optimization (or initial default).
+        tick_times = self._tick_times(start_time, end_time)
+        simulation.reserve(len(tick_times))
+        tick_states = self.data_loader.get_states_for_range(tick_times, include_pump_states=False)
+        tick_forecasts = self.data_loader.get_forecasts_for_range(
+            tick_times, horizon_steps, method=self.forecast_method
+        )
+        tick_baselines = self.data_loader.get_baseline_arrays_for_range(tick_times)
+        tick_baseline_steps = self._reduce_baseline_steps(tick_baselines, tick_states)
+        
         # Track simulated L1 (starts from historical value)
         # For the FIRST step, we start with a fresh/sensible default pump state
         # (not copying old system decisions). We'll start with one small pump ON
@@ -422,10 +1091,20 @@ class RollingMPCSimulator:
             else:
                 initial_pump_states.append((pump_id, False, 0.0))  # OFF
         initial_state.pump_states = initial_pump_states
+        # Position of each pump in the data loader's pump_states (same order on every tick)
+        pump_position = {pump_id: i for i, (pump_id, _, _) in enumerate(initial_pump_states)}
 
         simulated_l1 = initial_state.l1_m
         
-        dt_hours = self.reoptimize_interval_minutes / 60.0
+        # Loop-invariant step sizes and limits
+        dt_minutes = float(self.reoptimize_interval_minutes)
+        dt_hours = dt_minutes / 60.0
+        dt_seconds = dt_minutes * 60
+        forecast_24h_steps = 24 * 60 // self.optimizer.time_step_minutes  # 96 steps of 15 minutes
+        l1_min = self._l1_min
+        l1_max = self._l1_max
+        l1_range = self._l1_range
+        min_pumps_on = self._min_pumps_on
         
         # Track which pumps are currently running (for reference only)
         currently_running_pumps: Set[str] = {'2.1'}  # Start with initial pump
@@ -433,24 +1112,39 @@ class RollingMPCSimulator:
         # Track flush events: when L1 last reached flush_target_level_m
         last_flush_time: Optional[datetime] = None
         flush_target = self.optimizer.constraints.flush_target_level_m
+        flush_level = flush_target + 0.1  # L1 at or below this counts as a flush (0.1m tolerance)
+        flush_cooldown = timedelta(hours=1)  # At least this long between two flushes
         
-        # Forecast error tracking
+        # Forecast error tracking over the last N steps
+        window_size = 10
         forecast_errors = {
-            'inflow': [],  # List of (forecast, actual, error_pct) tuples
-            'price': [],
-            'l1': [],  # Predicted vs actual L1
+            'inflow': _ErrorWindow(window_size, recent=5),  # (forecast, actual, error_pct)
+            'price': _ErrorWindow(window_size, recent=5),
+            'l1': _ErrorWindow(window_size, recent=5),  # Predicted vs actual L1 (error in m)
         }
-        window_size = 10  # Track last N steps for error analysis
+        # Per-step error inputs, columns (inflow, price, L1): row 0 forecast/predicted, row 1 actual
+        error_inputs = np.empty((2, 3))
+        error_is_pct = np.array([True, True, False])  # Inflow/price errors in %, L1 error in m
+        error_floors = np.array([0.1, 1.0, 1.0])  # Minimum denominators for % errors
+        error_thresholds = np.array([20.0, 30.0, 0.5])  # Inflow %, price %, L1 m
+        forecast_warnings: List[str] = []  # Large forecast errors awaiting a batched log call
         
-        while current_time <= end_time:
-            # Get current state from historical data (environmental inputs only: inflow, price, L1)
-            # Pump states always come from previous optimization (or initial default)
-            current_state = self.data_loader.get_state_at_time(current_time, include_pump_states=False)
+        # Deferred explanation requests: (step number, result, generate_explanation kwargs)
+        pending_explanations: List[Tuple[int, SimulationResult, Dict[str, Any]]] = []
+        
+        # Number of the current optimization step (ticks without data or forecast are skipped)
+        step_num = 0
+        
+        for tick, current_time in enumerate(tick_times):
+            # Current state from historical data (prefetched above)
+            current_state = tick_states[tick]
             if current_state is None:
                 # Skip if no data
-                current_time += timedelta(minutes=self.reoptimize_interval_minutes)
                 continue
             
+            # Keep the historical L1 for the baseline trajectory before overwriting it
+            baseline_l1 = current_state.l1_m
+            
             # Update simulated L1 (in real MPC, this would come from plant/simulator)
             # For testing, we use historical L1 but could simulate it forward
             current_state.l1_m = simulated_l1
@@ -458,392 +1152,311 @@ class RollingMPCSimulator:
             # Set pump states from previous optimization result (for continuity constraints)
             # This is what the optimizer needs to know: which pumps were on/off in the previous step
             # Also update pump durations for rotation-aware min duration constraints
-            if len(simulation.results) > 0:
-                prev_result = simulation.results[-1]
-                if prev_result.optimization_result.success and prev_result.optimization_result.schedules:
-                    # Get pump states from previous optimization's first step
-                    # Map schedules to pump_states format: (pump_id, is_on, frequency_hz)
-                    prev_pump_states = {}
-                    for schedule in prev_result.optimization_result.schedules[:len(current_state.pump_states)]:
-                        prev_pump_states[schedule.pump_id] = (schedule.pump_id, schedule.is_on, schedule.frequency_hz)
-                    
-                    # Update current_state pump_states with previous optimization results
-                    updated_pump_states = []
-                    for pump_id, _, _ in current_state.pump_states:
-                        if pump_id in prev_pump_states:
-                            updated_pump_states.append(prev_pump_states[pump_id])
-                        else:
-                            updated_pump_states.append((pump_id, False, 0.0))
+            prev_result = simulation.results[-1] if simulation.results else None
+            if prev_result is not None:
+                if prev_result.optimization_result.success and prev_result.optimization_result.step0_schedules:
+                    # Get pump states from previous optimization's first step, written into
+                    # the loader's all-off pump_states at each pump's position (the optimizer
+                    # may list pumps in another order, e.g. by usage hours; pumps the loader
+                    # does not know are ignored)
+                    updated_pump_states = list(current_state.pump_states)
+                    for schedule in prev_result.optimization_result.step0_schedules:
+                        pos = pump_position.get(schedule.pump_id)
+                        if pos is not None:
+                            updated_pump_states[pos] = (schedule.pump_id, schedule.is_on, schedule.frequency_hz)
                     current_state.pump_states = updated_pump_states
                     
-                    # Update pump durations: increment on/off time for each pump
-                    dt_minutes = self.reoptimize_interval_minutes
-                    for pump_id, is_on, _ in updated_pump_states:
-                        if pump_id not in self.pump_durations:
-                            self.pump_durations[pump_id] = {"on_minutes": 0.0, "off_minutes": 0.0}
-                        
-                        if is_on:
-                            # Pump is on: increment on time, reset off time
-                            self.pump_durations[pump_id]["on_minutes"] += dt_minutes
-                            self.pump_durations[pump_id]["off_minutes"] = 0.0
-                        else:
-                            # Pump is off: increment off time, reset on time
-                            self.pump_durations[pump_id]["off_minutes"] += dt_minutes
-                            self.pump_durations[pump_id]["on_minutes"] = 0.0
+                    # Update pump durations: running pumps add to on time and reset off time,
+                    # stopped pumps the other way round
+                    is_on = np.zeros(len(self._pump_index), dtype=bool)
+                    is_on[[self._pump_index[pump_id] for pump_id, on, _ in updated_pump_states if on]] = True
+                    self._pump_on_minutes = np.where(is_on, self._pump_on_minutes + dt_minutes, 0.0)
+                    self._pump_off_minutes = np.where(is_on, 0.0, self._pump_off_minutes + dt_minutes)
             else:
                 # First step: initialize pump durations based on initial pump states
-                for pump_id, is_on, _ in current_state.pump_states:
-                    if pump_id not in self.pump_durations:
-                        self.pump_durations[pump_id] = {"on_minutes": 0.0, "off_minutes": 0.0}
-                    # Start with 0 duration (will be updated after first optimization)
+                # Start with 0 duration (will be updated after first optimization)
+                self._register_pumps(pump_id for pump_id, _, _ in current_state.pump_states)
             # else: use default pump states (all off) from data loader
             
+            # First step of the previous forecast, shared by error tracking and divergence detection
+            prev_forecast = None
+            if prev_result is not None and prev_result.optimization_result.success and prev_result.optimization_result.l1_trajectory:
+                prev_forecast = self.data_loader.get_forecast_from_time(
+                    prev_result.timestamp, 1, method=self.forecast_method  # Just first step
+                )
+            
             # Track forecast errors from previous step (compare forecast vs actual)
-            if len(simulation.results) > 0:
-                prev_result = simulation.results[-1]
-                if prev_result.optimization_result.success and prev_result.optimization_result.l1_trajectory:
-                    # Get actual values for the previous forecast's first step
-                    prev_time = prev_result.timestamp
-                    prev_forecast = self.data_loader.get_forecast_from_time(
-                        prev_time, 1, method=self.forecast_method  # Just first step
-                    )
-                    if prev_forecast and len(prev_forecast.inflow_m3_s) > 0:
-                        # Compare forecast vs actual
-                        forecast_inflow = prev_forecast.inflow_m3_s[0]
-                        actual_inflow = current_state.inflow_m3_s
-                        forecast_price = prev_forecast.price_c_per_kwh[0]
-                        actual_price = current_state.price_c_per_kwh
-                        
-                        # Calculate errors
-                        inflow_error_pct = abs(actual_inflow - forecast_inflow) / max(forecast_inflow, 0.1) * 100 if forecast_inflow > 0 else 0
-                        price_error_pct = abs(actual_price - forecast_price) / max(forecast_price, 1.0) * 100 if forecast_price > 0 else 0
-                        
-                        forecast_errors['inflow'].append((forecast_inflow, actual_inflow, inflow_error_pct))
-                        forecast_errors['price'].append((forecast_price, actual_price, price_error_pct))
-                        
-                        # Track L1 prediction error
-                        predicted_l1 = prev_result.optimization_result.l1_trajectory[0] if prev_result.optimization_result.l1_trajectory else simulated_l1
-                        l1_error_m = abs(simulated_l1 - predicted_l1)
-                        forecast_errors['l1'].append((predicted_l1, simulated_l1, l1_error_m))
-                        
-                        # Recalibration Loop: Feed errors back into quality tracker
-                        self.forecast_quality_tracker.add_error(
-                            inflow_error=inflow_error_pct,
-                            price_error=price_error_pct,
-                            l1_error=l1_error_m,
-                            timestamp=current_time
-                        )
-                        
-                        # Keep only last N errors
-                        for key in forecast_errors:
-                            if len(forecast_errors[key]) > window_size:
-                                forecast_errors[key].pop(0)
-                        
-                        # Log significant errors
-                        if inflow_error_pct > 20:
-                            logger.warning(f"⚠ Large inflow forecast error: {inflow_error_pct:.1f}% (forecast={forecast_inflow:.2f}, actual={actual_inflow:.2f} m³/s)")
-                        if price_error_pct > 30:
-                            logger.warning(f"⚠ Large price forecast error: {price_error_pct:.1f}% (forecast={forecast_price:.1f}, actual={actual_price:.1f} c/kWh)")
-                        if l1_error_m > 0.5:
-                            logger.warning(f"⚠ Large L1 prediction error: {l1_error_m:.2f}m (predicted={predicted_l1:.2f}, actual={simulated_l1:.2f} m)")
+            if prev_forecast and len(prev_forecast.inflow_m3_s) > 0:
+                # Compare forecast vs actual
+                forecast_inflow = prev_forecast.inflow_m3_s[0]
+                actual_inflow = current_state.inflow_m3_s
+                forecast_price = prev_forecast.price_c_per_kwh[0]
+                actual_price = current_state.price_c_per_kwh
+                
+                predicted_l1 = prev_result.optimization_result.l1_trajectory[0] if prev_result.optimization_result.l1_trajectory else simulated_l1
+                
+                # Calculate all three errors at once (no error for a non-positive inflow/price forecast)
+                error_inputs[0] = (forecast_inflow, forecast_price, predicted_l1)
+                error_inputs[1] = (actual_inflow, actual_price, simulated_l1)
+                forecasts = error_inputs[0]
+                abs_errors = np.abs(error_inputs[1] - forecasts)
+                errors = np.where(
+                    error_is_pct,
+                    np.where(forecasts > 0, abs_errors / np.maximum(forecasts, error_floors) * 100, 0.0),
+                    abs_errors,
+                )
+                inflow_error_pct, price_error_pct, l1_error_m = errors.tolist()
+                
+                forecast_errors['inflow'].append(forecast_inflow, actual_inflow, inflow_error_pct)
+                forecast_errors['price'].append(forecast_price, actual_price, price_error_pct)
+                forecast_errors['l1'].append(predicted_l1, simulated_l1, l1_error_m)
+                
+                # Recalibration Loop: Feed errors back into quality tracker
+                self.forecast_quality_tracker.add_error(
+                    inflow_error=inflow_error_pct,
+                    price_error=price_error_pct,
+                    l1_error=l1_error_m,
+                    timestamp=current_time
+                )
+                
+                # Collect significant errors (logged in batches, see _flush_forecast_warnings)
+                large = errors > error_thresholds
+                if large.any():
+                    stamp = current_time.strftime('%Y-%m-%d %H:%M')
+                    if large[0]:
+                        forecast_warnings.append(f"{stamp} ⚠ Large inflow forecast error: {inflow_error_pct:.1f}% (forecast={forecast_inflow:.2f}, actual={actual_inflow:.2f} m³/s)")
+                    if large[1]:
+                        forecast_warnings.append(f"{stamp} ⚠ Large price forecast error: {price_error_pct:.1f}% (forecast={forecast_price:.1f}, actual={actual_price:.1f} c/kWh)")
+                    if large[2]:
+                        forecast_warnings.append(f"{stamp} ⚠ Large L1 prediction error: {l1_error_m:.2f}m (predicted={predicted_l1:.2f}, actual={simulated_l1:.2f} m)")
+            
+            if tick % self.WARNING_FLUSH_STEPS == 0 or len(forecast_warnings) > self.WARNING_FLUSH_LINES:
+                self._flush_forecast_warnings(forecast_warnings)
             
             # Calculate forecast quality (optimizer will handle safety margins)
             forecast_quality = self._assess_forecast_quality(forecast_errors)
             
-            # Get forecast (2h tactical)
-            forecast = self.data_loader.get_forecast_from_time(
-                current_time, horizon_steps, method=self.forecast_method
-            )
+            # Forecast (2h tactical, prefetched above)
+            forecast = tick_forecasts[tick]
             if forecast is None:
-                current_time += timedelta(minutes=self.reoptimize_interval_minutes)
                 continue
             
             # Detect divergence and generate emergency response if needed
             divergence = None
             emergency_response = None
-            if len(simulation.results) > 0:
-                prev_result = simulation.results[-1]
-                if prev_result.optimization_result.success and prev_result.optimization_result.l1_trajectory:
-                    # Get previous forecast values for divergence detection
-                    prev_time = prev_result.timestamp
-                    prev_forecast = self.data_loader.get_forecast_from_time(
-                        prev_time, 1, method=self.forecast_method
-                    )
-                    
-                    predicted_l1 = prev_result.optimization_result.l1_trajectory[0]
-                    prev_forecast_inflow = prev_forecast.inflow_m3_s[0] if prev_forecast and len(prev_forecast.inflow_m3_s) > 0 else None
-                    prev_forecast_price = prev_forecast.price_c_per_kwh[0] if prev_forecast and len(prev_forecast.price_c_per_kwh) > 0 else None
-                    
-                    # Detect divergence
-                    divergence = self.optimizer.detect_divergence(
-                        current_state=current_state,
-                        forecast=forecast,  # Use current forecast for structure
-                        previous_prediction=predicted_l1,
-                        previous_forecast_inflow=prev_forecast_inflow,
-                        previous_forecast_price=prev_forecast_price,
+            emergency_request = None
+            if prev_result is not None and prev_result.optimization_result.success and prev_result.optimization_result.l1_trajectory:
+                predicted_l1 = prev_result.optimization_result.l1_trajectory[0]
+                prev_forecast_inflow = prev_forecast.inflow_m3_s[0] if prev_forecast and len(prev_forecast.inflow_m3_s) > 0 else None
+                prev_forecast_price = prev_forecast.price_c_per_kwh[0] if prev_forecast and len(prev_forecast.price_c_per_kwh) > 0 else None
+                
+                # Detect divergence
+                divergence = self.optimizer.detect_divergence(
+                    current_state=current_state,
+                    forecast=forecast,  # Use current forecast for structure
+                    previous_prediction=predicted_l1,
+                    previous_forecast_inflow=prev_forecast_inflow,
+                    previous_forecast_price=prev_forecast_price,
+                )
+                
+                # Emergency response if divergence detected and LLM available
+                # (requested below, concurrently with the strategic plan)
+                if divergence and self.llm_explainer:
+                    emergency_request = self.llm_explainer.generate_emergency_response(
+                        error_type=divergence['error_type'],
+                        error_magnitude=divergence['error_magnitude'],
+                        forecast_value=divergence['forecast_value'],
+                        actual_value=divergence['actual_value'],
+                        current_l1_m=current_state.l1_m,
+                        l1_min_m=l1_min,
+                        l1_max_m=l1_max,
+                        predicted_l1_m=predicted_l1,
                     )
-                    
-                    # Generate emergency response if divergence detected and LLM available
-                    if divergence and self.llm_explainer:
-                        try:
-                            emergency_response = run_async_in_sync(
-                                self.llm_explainer.generate_emergency_response(
-                                    error_type=divergence['error_type'],
-                                    error_magnitude=divergence['error_magnitude'],
-                                    forecast_value=divergence['forecast_value'],
-                                    actual_value=divergence['actual_value'],
-                                    current_l1_m=current_state.l1_m,
-                                    l1_min_m=self.optimizer.constraints.l1_min_m,
-                                    l1_max_m=self.optimizer.constraints.l1_max_m,
-                                    predicted_l1_m=predicted_l1,
-                                )
-                            )
-                            if emergency_response:
-                                logger.warning("")
-                                emergency_lines = [
-                                    f"🚨 EMERGENCY RESPONSE TRIGGERED",
-                                    f"Error Type: {divergence['error_type'].upper()}",
-                                    f"Severity: {emergency_response.severity.upper()}",
-                                    f"Magnitude: {divergence['error_magnitude']:.2f}",
-                                    "",
-                                    f"Forecast: {divergence['forecast_value']:.2f}",
-                                    f"Actual: {divergence['actual_value']:.2f}",
-                                    "",
-                                    f"Reasoning: {emergency_response.reasoning[:200]}...",
-                                ]
-                                log_boxed(logger, "EMERGENCY RESPONSE", emergency_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
-                        except Exception as e:
-                            logger.warning(f"  Failed to generate emergency response: {e}")
             
             # Get 24h forecast for strategic planning (if LLM available and enabled)
             strategic_plan = None
+            strategic_request = None
             if self.generate_strategic_plan and self.llm_explainer:
                 try:
-                    # Request 24h forecast (96 steps of 15 minutes)
-                    forecast_24h_steps = 24 * 60 // self.optimizer.time_step_minutes  # 96 steps
+                    # Request 24h forecast
                     forecast_24h = self.data_loader.get_forecast_from_time(
                         current_time, forecast_24h_steps, method=self.forecast_method
                     )
                     if forecast_24h:
-                        try:
-                            strategic_plan = run_async_in_sync(
-                                self.llm_explainer.generate_strategic_plan(
-                                    forecast_24h_timestamps=forecast_24h.timestamps,
-                                    forecast_24h_inflow=forecast_24h.inflow_m3_s,
-                                    forecast_24h_price=forecast_24h.price_c_per_kwh,
-                                    current_l1_m=current_state.l1_m,
-                                    l1_min_m=self.optimizer.constraints.l1_min_m,
-                                    l1_max_m=self.optimizer.constraints.l1_max_m,
-                                    forecast_quality_tracker=self.forecast_quality_tracker,  # Feed learnings back
-                                ),
-                                timeout=30.0  # Strategic plan can take longer
-                            )
-                        except Exception as e:
-                            logger.warning(f"  Failed to generate strategic plan: {e}")
-                            strategic_plan = None
+                        strategic_request = self.llm_explainer.generate_strategic_plan(
+                            forecast_24h_timestamps=forecast_24h.timestamps,
+                            forecast_24h_inflow=forecast_24h.inflow_m3_s,
+                            forecast_24h_price=forecast_24h.price_c_per_kwh,
+                            current_l1_m=current_state.l1_m,
+                            l1_min_m=l1_min,
+                            l1_max_m=l1_max,
+                            forecast_quality_tracker=self.forecast_quality_tracker,  # Feed learnings back
+                        )
+                except Exception as e:
+                    logger.warning(f"  Failed to generate strategic plan: {e}")
+            
+            # The emergency response and strategic plan are independent: await them together
+            emergency_outcome, strategic_outcome = self._run_llm_requests(
+                (emergency_request, EMERGENCY_RESPONSE_TIMEOUT_S),
+                (strategic_request, STRATEGIC_PLAN_TIMEOUT_S),
+            )
+            
+            if emergency_request is not None:
+                try:
+                    if isinstance(emergency_outcome, Exception):
+                        raise emergency_outcome
+                    emergency_response = emergency_outcome
+                    if emergency_response:
+                        logger.warning("")
+                        emergency_lines = [
+                            f"🚨 EMERGENCY RESPONSE TRIGGERED",
+                            f"Error Type: {divergence['error_type'].upper()}",
+                            f"Severity: {emergency_response.severity.upper()}",
+                            f"Magnitude: {divergence['error_magnitude']:.2f}",
+                            "",
+                            f"Forecast: {divergence['forecast_value']:.2f}",
+                            f"Actual: {divergence['actual_value']:.2f}",
+                            "",
+                            f"Reasoning: {emergency_response.reasoning[:200]}...",
+                        ]
+                        log_boxed(logger, "EMERGENCY RESPONSE", emergency_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+                except Exception as e:
+                    logger.warning(f"  Failed to generate emergency response: {e}")
+            
+            if strategic_request is not None:
+                try:
+                    if isinstance(strategic_outcome, Exception):
+                        raise strategic_outcome
+                    strategic_plan = strategic_outcome
+                    if strategic_plan and self._show_tables:
+                        # Blank line before plan table
+                        self._emit_blank()
+                        # Plan type and confidence in table
+                        plan_rows = [
+                            ["Plan Type", strategic_plan.plan_type],
+                        ]
+                        if strategic_plan.forecast_confidence:
+                            plan_rows.append(["Forecast Confidence", strategic_plan.forecast_confidence.upper()])
+                        
+                        log_table(logger, ["Field", "Value"], plan_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
+                        
+                        # Description in boxed section for full-width display and proper wrapping
+                        if strategic_plan.description:
+                            # Wrap description text properly
+                            desc_lines = wrap_text(strategic_plan.description, 76)  # 80 - 4 for borders
+                            # Blank line before description box
+                            self._emit_blank()
+                            log_boxed(logger, "STRATEGIC PLAN DESCRIPTION", desc_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+                        
+                        # Time periods table
+                        if strategic_plan.time_periods:
+                            period_rows = []
+                            for start_hour, end_hour, strategy in strategic_plan.time_periods[:4]:  # Show first 4 periods
+                                period_rows.append([f"{start_hour:02d}:00 - {end_hour:02d}:00", strategy])
+                            # Blank line before time periods table
+                            self._emit_blank()
+                            log_table(logger, ["Time Period", "Strategy"], period_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
                         
-                        if strategic_plan:
-                            # Blank line before plan table
-                            if self.suppress_prefix:
-                                print()
-                            else:
-                                logger.info("")
-                            # Plan type and confidence in table
-                            plan_rows = [
-                                ["Plan Type", strategic_plan.plan_type],
+                        # Reasoning in box (full text, properly wrapped)
+                        if strategic_plan.reasoning:
+                            # Keep line breaks, blank line between paragraphs, split very long lines by sentences
+                            reasoning_lines = list(_iter_wrapped_lines(strategic_plan.reasoning))
+                            # Blank line before reasoning box
+                            self._emit_blank()
+                            log_boxed(logger, "STRATEGIC REASONING", reasoning_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+                        
+                        # Log recalibration loop status
+                        quality_patterns = self.forecast_quality_tracker.get_error_patterns()
+                        if quality_patterns['sample_size'] > 0:
+                            recal_rows = [
+                                ["Quality", quality_patterns['overall_quality']],
+                                ["Trend", quality_patterns['trend']],
+                                ["Confidence", quality_patterns['confidence']],
+                                ["Sample Size", str(quality_patterns['sample_size'])],
                             ]
-                            if strategic_plan.forecast_confidence:
-                                plan_rows.append(["Forecast Confidence", strategic_plan.forecast_confidence.upper()])
-                            
-                            log_table(logger, ["Field", "Value"], plan_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
-                            
-                            # Description in boxed section for full-width display and proper wrapping
-                            if strategic_plan.description:
-                                # Wrap description text properly
-                                desc_lines = wrap_text(strategic_plan.description, 76)  # 80 - 4 for borders
-                                # Blank line before description box
-                                if self.suppress_prefix:
-                                    print()
-                                else:
-                                    logger.info("")
-                                log_boxed(logger, "STRATEGIC PLAN DESCRIPTION", desc_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
-                            
-                            # Time periods table
-                            if strategic_plan.time_periods:
-                                period_rows = []
-                                for start_hour, end_hour, strategy in strategic_plan.time_periods[:4]:  # Show first 4 periods
-                                    period_rows.append([f"{start_hour:02d}:00 - {end_hour:02d}:00", strategy])
-                                # Blank line before time periods table
-                                if self.suppress_prefix:
-                                    print()
-                                else:
-                                    logger.info("")
-                                log_table(logger, ["Time Period", "Strategy"], period_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
-                            
-                            # Reasoning in box (full text, properly wrapped)
-                            if strategic_plan.reasoning:
-                                # Split by newlines and process each paragraph
-                                paragraphs = [p.strip() for p in strategic_plan.reasoning.split('\n\n') if p.strip()]
-                                reasoning_lines = []
-                                for para in paragraphs:
-                                    # Split each paragraph by newlines (preserve intentional line breaks)
-                                    para_lines = [line.strip() for line in para.split('\n') if line.strip()]
-                                    for line in para_lines:
-                                        # Wrap very long lines by sentences for better readability
-                                        if len(line) > 200:
-                                            import re
-                                            sentences = re.split(r'([.!?]\s+)', line)
-                                            current_sentence = ""
-                                            for i in range(0, len(sentences), 2):
-                                                if i + 1 < len(sentences):
-                                                    sentence = sentences[i] + sentences[i+1]
-                                                else:
-                                                    sentence = sentences[i]
-                                                if len(current_sentence) + len(sentence) > 200:
-                                                    if current_sentence:
-                                                        reasoning_lines.append(current_sentence.strip())
-                                                    current_sentence = sentence
-                                                else:
-                                                    current_sentence += sentence
-                                            if current_sentence:
-                                                reasoning_lines.append(current_sentence.strip())
-                                        else:
-                                            reasoning_lines.append(line)
-                                    # Add blank line between paragraphs
-                                    if para != paragraphs[-1]:
-                                        reasoning_lines.append("")
-                                # Blank line before reasoning box
-                                if self.suppress_prefix:
-                                    print()
-                                else:
-                                    logger.info("")
-                                log_boxed(logger, "STRATEGIC REASONING", reasoning_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
-                            
-                            # Log recalibration loop status
-                            quality_patterns = self.forecast_quality_tracker.get_error_patterns()
-                            if quality_patterns['sample_size'] > 0:
-                                recal_rows = [
-                                    ["Quality", quality_patterns['overall_quality']],
-                                    ["Trend", quality_patterns['trend']],
-                                    ["Confidence", quality_patterns['confidence']],
-                                    ["Sample Size", str(quality_patterns['sample_size'])],
-                                ]
-                                # Blank line before recalibration table
-                                if self.suppress_prefix:
-                                    print()
-                                else:
-                                    logger.info("")
-                                log_table(logger, ["Metric", "Value"], recal_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
+                            # Blank line before recalibration table
+                            self._emit_blank()
+                            log_table(logger, ["Metric", "Value"], recal_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
                 except Exception as e:
                     logger.warning(f"  Failed to generate strategic plan: {e}")
             
             # Get baseline schedule for comparison
-            baseline_schedule = self.data_loader.get_baseline_schedule_at_time(current_time)
+            baseline_schedule = tick_baselines.schedule_at(tick)
             
             # Log current state in readable format
-            step_num = len(simulation.results) + 1
-            # Blank line before step header
-            if self.suppress_prefix:
-                print()
-            else:
-                logger.info("")
-            log_boxed(logger, f"OPTIMIZATION STEP {step_num} | {current_time.strftime('%Y-%m-%d %H:%M:%S')}", [], width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
-            
-            # Log system state as table
-            system_state_rows = [
-                ["Tunnel Level (L1)", f"{current_state.l1_m:.2f} m", f"[{self.optimizer.constraints.l1_min_m:.1f} - {self.optimizer.constraints.l1_max_m:.1f} m]"],
-                ["Inflow (F1)", f"{current_state.inflow_m3_s:.2f} m³/s", ""],
-                ["Outflow (F2)", f"{current_state.outflow_m3_s:.2f} m³/s", ""],
-                ["Electricity Price", f"{current_state.price_c_per_kwh:.1f} c/kWh", ""],
-            ]
-            log_table(logger, ["Parameter", "Value", "Range/Status"], system_state_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
-            
-            # Log constraints table
-            l1_min = self.optimizer.constraints.l1_min_m
-            l1_max = self.optimizer.constraints.l1_max_m
-            l1_current = current_state.l1_m
-            
-            # Check individual constraint compliance
-            l1_above_min = l1_current >= l1_min
-            l1_below_max = l1_current <= l1_max
-            l1_in_range = l1_above_min and l1_below_max
-            
-            # Check pump constraints
-            num_active_pumps = len([s for s in current_state.pump_states if s[1]])  # Count pumps that are ON
-            min_pumps_ok = num_active_pumps >= self.optimizer.constraints.min_pumps_on
-            
-            constraints_rows = [
-                ["L1 Min", f"{l1_min:.2f} m", f"{'✓ OK' if l1_above_min else '✗ VIOLATED'}"],
-                ["L1 Max", f"{l1_max:.2f} m", f"{'✓ OK' if l1_below_max else '✗ VIOLATED'}"],
-                ["L1 Current", f"{l1_current:.2f} m", f"{'✓ IN RANGE' if l1_in_range else '✗ VIOLATION'}"],
-                ["Min Pumps On", f"{self.optimizer.constraints.min_pumps_on}", f"{'✓ OK' if min_pumps_ok else f'✗ VIOLATED (only {num_active_pumps})'}"],
-                ["Active Pumps", f"{num_active_pumps}", f"{'✓' if min_pumps_ok else '✗'}"],
-                ["Min On Duration", f"{self.optimizer.constraints.min_pump_on_duration_minutes} min", "⚠ Time-based"],
-                ["Min Off Duration", f"{self.optimizer.constraints.min_pump_off_duration_minutes} min", "⚠ Time-based"],
-            ]
-            
-            # Show frequency range from pump specs (use min/max from all pumps)
-            freq_range_str = "47.8-50.0 Hz"  # Default
-            if self.optimizer.pumps:
-                # Get min/max from all pumps
-                all_min_freqs = [spec.min_frequency_hz for spec in self.optimizer.pumps.values()]
-                all_max_freqs = [spec.max_frequency_hz for spec in self.optimizer.pumps.values()]
-                if all_min_freqs and all_max_freqs:
-                    min_freq = min(all_min_freqs)
-                    max_freq = max(all_max_freqs)
-                    if min_freq == max_freq:
-                        freq_range_str = f"{min_freq:.1f} Hz"
+            step_num += 1
+            if self._show_tables:
+                # Blank line before step header
+                self._emit_blank()
+                log_boxed(logger, f"OPTIMIZATION STEP {step_num} | {current_time.strftime('%Y-%m-%d %H:%M:%S')}", [], width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+                
+                # Log system state as table
+                system_state_rows = [
+                    ["Tunnel Level (L1)", f"{current_state.l1_m:.2f} m", self._l1_bounds_str],
+                    ["Inflow (F1)", f"{current_state.inflow_m3_s:.2f} m³/s", ""],
+                    ["Outflow (F2)", f"{current_state.outflow_m3_s:.2f} m³/s", ""],
+                    ["Electricity Price", f"{current_state.price_c_per_kwh:.1f} c/kWh", ""],
+                ]
+                log_table(logger, ["Parameter", "Value", "Range/Status"], system_state_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
+                
+                # Log constraints table
+                l1_current = current_state.l1_m
+                
+                # Check individual constraint compliance
+                l1_above_min = l1_current >= l1_min
+                l1_below_max = l1_current <= l1_max
+                l1_in_range = l1_above_min and l1_below_max
+                
+                # Pump table rows and running pumps in one pass over the pump states
+                pump_rows = []
+                active_pumps = []
+                for pump_id, is_on, freq in current_state.pump_states:
+                    if is_on:
+                        pump_rows.append([pump_id, "ON", f"{freq:.1f} Hz"])
+                        active_pumps.append(pump_id)
                     else:
-                        freq_range_str = f"{min_freq:.1f}-{max_freq:.1f} Hz"
-            
-            # Note: Frequency violation check and constraints table logging
-            # will be done after optimization result is available (see below)
-            constraints_rows.append(["Allow L1 Violations", f"{'Yes' if self.optimizer.constraints.allow_l1_violations else 'No'}", ""])
-            if self.optimizer.constraints.allow_l1_violations:
-                constraints_rows.append(["Violation Tolerance", f"{self.optimizer.constraints.l1_violation_tolerance_m:.2f} m", ""])
-                constraints_rows.append(["Violation Penalty", f"{self.optimizer.constraints.l1_violation_penalty:.1f}", ""])
-            
-            # Log pump states as table
-            pump_rows = []
-            active_pumps = []
-            for pump_id, is_on, freq in current_state.pump_states:
-                status = "ON" if is_on else "OFF"
-                freq_str = f"{freq:.1f} Hz" if is_on else "---"
-                pump_rows.append([pump_id, status, freq_str])
-                if is_on:
-                    active_pumps.append(pump_id)
-            
-            if pump_rows:
-                # Blank line before pump table
-                if self.suppress_prefix:
-                    print()
-                else:
-                    logger.info("")
-                log_table(logger, ["Pump ID", "Status", "Frequency"], pump_rows, width=80, include_header=True, suppress_prefix=self.suppress_prefix)
-                logger.info(f"  Active pumps: {len(active_pumps)} ({', '.join(active_pumps) if active_pumps else 'None'})")
-            
-            # Run optimization (with strategic plan if available)
-            # Blank line before optimization box
-            if self.suppress_prefix:
-                print()
-            else:
-                logger.info("")
-            opt_info_lines = ["Running optimization..."]
-            if strategic_plan:
-                opt_info_lines.append(f"Strategic Plan: {strategic_plan.plan_type}")
-            if len(forecast_errors['inflow']) > 0:
-                avg_inflow_error = np.mean([e[2] for e in forecast_errors['inflow'][-5:]])  # Last 5 steps
-                avg_price_error = np.mean([e[2] for e in forecast_errors['price'][-5:]])
-                opt_info_lines.append(f"Forecast Quality: Inflow MAE={avg_inflow_error:.1f}%, Price MAE={avg_price_error:.1f}%")
-                if forecast_quality['quality_level'] != 'good':
-                    opt_info_lines.append(f"Quality Level: {forecast_quality['quality_level'].upper()} - Applying safety margins")
-            log_boxed(logger, "OPTIMIZATION", opt_info_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+                        pump_rows.append([pump_id, "OFF", "---"])
+                
+                # Check pump constraints
+                num_active_pumps = len(active_pumps)
+                min_pumps_ok = num_active_pumps >= min_pumps_on
+                
+                constraints_rows = [
+                    self._l1_min_rows[l1_above_min],
+                    self._l1_max_rows[l1_below_max],
+                    ["L1 Current", f"{l1_current:.2f} m", STATUS_IN_RANGE if l1_in_range else STATUS_VIOLATION],
+                    ["Min Pumps On", self._min_pumps_on_str, STATUS_OK if min_pumps_ok else f"{STATUS_VIOLATED} (only {num_active_pumps})"],
+                    ["Active Pumps", str(num_active_pumps), CHECK_MARK if min_pumps_ok else CROSS_MARK],
+                    *self._static_constraint_rows,
+                ]
+                # Note: Frequency violation check and constraints table logging
+                # will be done after optimization result is available (see below)
+                
+                # Log pump states as table
+                if pump_rows:
+                    # Blank line before pump table
+                    self._emit_blank()
+                    log_table(logger, ["Pump ID", "Status", "Frequency"], pump_rows, width=80, include_header=True, suppress_prefix=self.suppress_prefix, fast=True)
+                    logger.info("  Active pumps: %d (%s)", num_active_pumps, ', '.join(active_pumps) if active_pumps else 'None')
+                
+                # Run optimization (with strategic plan if available)
+                # Blank line before optimization box
+                self._emit_blank()
+                opt_info_lines = ["Running optimization..."]
+                if strategic_plan:
+                    opt_info_lines.append(f"Strategic Plan: {strategic_plan.plan_type}")
+                if len(forecast_errors['inflow']) > 0:
+                    avg_inflow_error = forecast_quality['inflow_mae']  # Last 5 steps
+                    avg_price_error = forecast_quality['price_mae']
+                    opt_info_lines.append(f"Forecast Quality: Inflow MAE={avg_inflow_error:.1f}%, Price MAE={avg_price_error:.1f}%")
+                    if forecast_quality['quality_level'] != 'good':
+                        opt_info_lines.append(f"Quality Level: {forecast_quality['quality_level'].upper()} - Applying safety margins")
+                log_boxed(logger, "OPTIMIZATION", opt_info_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
             
             # Check if we're in critical conditions (disable rotation for safety)
             l1 = current_state.l1_m
-            l1_range = self.optimizer.constraints.l1_max_m - self.optimizer.constraints.l1_min_m
-            dist_to_min = (l1 - self.optimizer.constraints.l1_min_m) / l1_range
-            dist_to_max = (self.optimizer.constraints.l1_max_m - l1) / l1_range
+            dist_to_min = (l1 - l1_min) / l1_range
+            dist_to_max = (l1_max - l1) / l1_range
             is_critical = (dist_to_min < 0.15 or dist_to_max < 0.15)  # Within 15% of bounds
             
             # Calculate hours since last flush (for daily flush constraint)
@@ -867,30 +1480,30 @@ class RollingMPCSimulator:
                     pump_usage_hours=self.pump_usage_hours,  # Pass usage for fairness/rotation
                     pump_durations=self.pump_durations,  # Pass durations for rotation-aware min duration
                 )
-                result_rows = [
-                    ["Mode", opt_result.mode.value.upper()],
-                    ["Success", "✓" if opt_result.success else "✗"],
-                    ["Solve Time", f"{opt_result.solve_time_seconds:.2f} s"],
-                ]
-                # Add violation info if present
-                if opt_result.l1_violations > 0:
-                    result_rows.append(["L1 Violations", f"{opt_result.l1_violations}", "⚠ WARNING"])
-                    result_rows.append(["Max Violation", f"{opt_result.max_violation_m:.3f} m", "⚠ WARNING"])
-                log_table(logger, ["Status", "Value", "Note"], result_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
+                if self._show_tables:
+                    result_rows = [
+                        ["Mode", opt_result.mode.value.upper()],
+                        ["Success", CHECK_MARK if opt_result.success else CROSS_MARK],
+                        ["Solve Time", f"{opt_result.solve_time_seconds:.2f} s"],
+                    ]
+                    # Add violation info if present
+                    if opt_result.l1_violations > 0:
+                        result_rows.append(["L1 Violations", f"{opt_result.l1_violations}", STATUS_WARNING])
+                        result_rows.append(["Max Violation", f"{opt_result.max_violation_m:.3f} m", STATUS_WARNING])
+                    log_table(logger, ["Status", "Value", "Note"], result_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
             except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
+                error_message = str(e)
                 logger.warning("")
                 error_lines = [
-                    f"Error: {str(e)}",
+                    f"Error: {error_message}",
                     f"Error Type: {type(e).__name__}",
                     "Falling back to RULE_BASED mode"
                 ]
-                # Add traceback if it's a division by zero error
-                if "division by zero" in str(e).lower() or "ZeroDivisionError" in str(type(e)):
+                # Add traceback if it's a division by zero error (only formatted then)
+                if "division by zero" in error_message.lower() or "ZeroDivisionError" in str(type(e)):
                     error_lines.append("")
                     error_lines.append("Traceback (last 5 lines):")
-                    tb_lines = error_details.strip().split('\n')
+                    tb_lines = traceback.format_exc().strip().split('\n')
                     error_lines.extend(tb_lines[-5:])
                 log_boxed(logger, "OPTIMIZATION FAILED", error_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
                 # Fallback on error
@@ -906,199 +1519,140 @@ class RollingMPCSimulator:
                     pump_usage_hours=self.pump_usage_hours,  # Pass usage for fairness/rotation (unused in rule-based)
                     pump_durations=self.pump_durations,  # Pass durations for rotation-aware min duration
                 )
-                fallback_rows = [
-                    ["Mode", opt_result.mode.value.upper()],
-                    ["Success", "✓" if opt_result.success else "✗"],
-                ]
-                log_table(logger, ["Status", "Value"], fallback_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
+                if self._show_tables:
+                    fallback_rows = [
+                        ["Mode", opt_result.mode.value.upper()],
+                        ["Success", CHECK_MARK if opt_result.success else CROSS_MARK],
+                    ]
+                    log_table(logger, ["Status", "Value"], fallback_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
             
-            # Check frequency constraints from optimization result (not from current_state)
-            # This checks the frequencies that were actually optimized, not historical values
-            freq_ok = True
-            freq_violations = []
-            if opt_result.success and opt_result.schedules:
-                # Check frequencies from optimization result schedules (time_step == 0)
-                for sched in opt_result.schedules:
-                    if sched.time_step == 0 and sched.is_on:
-                        # Get pump spec for this pump
-                        pump_spec = self.optimizer.pumps.get(sched.pump_id)
-                        if pump_spec:
-                            min_freq = pump_spec.min_frequency_hz
-                            max_freq = pump_spec.max_frequency_hz
+            # First-step schedules, shared by the checks, tables and aggregates below
+            step0_schedules = opt_result.step0_schedules
+            
+            if self._show_tables:
+                # Check frequency constraints from optimization result (not from current_state)
+                # This checks the frequencies that were actually optimized, not historical values
+                freq_violations = []
+                if opt_result.success:
+                    # Check frequencies from optimization result schedules (time_step == 0)
+                    pump_freq_bounds = self._pump_freq_bounds
+                    for sched in step0_schedules:
+                        if not sched.is_on:
+                            continue
+                        freq = sched.frequency_hz
+                        bounds = pump_freq_bounds.get(sched.pump_id)
+                        if bounds is not None:
                             # Check if frequency is within valid range for this specific pump
-                            if sched.frequency_hz < min_freq or sched.frequency_hz > max_freq:
-                                freq_ok = False
-                                freq_violations.append(f"{sched.pump_id}: {sched.frequency_hz:.1f} Hz (range: {min_freq:.1f}-{max_freq:.1f} Hz)")
-                        else:
+                            min_freq, max_freq = bounds
+                            if freq < min_freq or freq > max_freq:
+                                freq_violations.append(f"{sched.pump_id}: {freq:.1f} Hz (range: {min_freq:.1f}-{max_freq:.1f} Hz)")
+                        elif freq < 47.8 or freq > 50.0:
                             # Fallback: use default range if pump spec not found
-                            if sched.frequency_hz < 47.8 or sched.frequency_hz > 50.0:
-                                freq_ok = False
-                                freq_violations.append(f"{sched.pump_id}: {sched.frequency_hz:.1f} Hz (spec not found)")
-            
-            # Add frequency constraint row with actual results from optimization
-            constraints_rows.append(["Pump Frequency", freq_range_str, f"{'✓ OK' if freq_ok else '✗ VIOLATED (' + ', '.join(freq_violations) + ')'}"])
-            
-            # Log constraints table now that we have optimization results
-            # Blank line before constraints table
-            if self.suppress_prefix:
-                print()
-            else:
-                logger.info("")
-            log_table(logger, ["Constraint", "Value", "Status"], constraints_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
-            
-            # Log optimization result
-            if opt_result.success:
-                next_step_schedules = [s for s in opt_result.schedules if s.time_step == 0]
-                # Blank line before schedule table
-                if self.suppress_prefix:
-                    print()
+                            freq_violations.append(f"{sched.pump_id}: {freq:.1f} Hz (spec not found)")
+                
+                # Add frequency constraint row with actual results from optimization
+                # (the violation list is only joined when there is one)
+                if freq_violations:
+                    freq_status = f"{STATUS_VIOLATED} ({', '.join(freq_violations)})"
                 else:
-                    logger.info("")
-                schedule_rows = []
-                optimized_pumps = []
-                total_flow = 0.0
-                total_power = 0.0
-                for sched in next_step_schedules:
-                    if sched.is_on:
-                        optimized_pumps.append(sched.pump_id)
-                        schedule_rows.append([
-                            sched.pump_id,
-                            f"{sched.frequency_hz:.1f} Hz",
-                            f"{sched.flow_m3_s:.2f} m³/s",
-                            f"{sched.power_kw:.1f} kW"
-                        ])
-                        total_flow += sched.flow_m3_s
-                        total_power += sched.power_kw
+                    freq_status = STATUS_OK
+                constraints_rows.append(["Pump Frequency", self._freq_range_str, freq_status])
                 
-                if schedule_rows:
-                    log_table(logger, ["Pump", "Frequency", "Flow", "Power"], schedule_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
-                    summary_rows = [
-                        ["Active Pumps", f"{len(optimized_pumps)} ({', '.join(optimized_pumps)})"],
-                        ["Total Outflow", f"{total_flow:.2f} m³/s"],
-                        ["Total Power", f"{total_power:.1f} kW"],
-                    ]
-                    if opt_result.l1_trajectory:
-                        predicted_l1 = opt_result.l1_trajectory[0] if len(opt_result.l1_trajectory) > 0 else current_state.l1_m
-                        # Check constraint compliance
-                        l1_status = "✓" if self.optimizer.constraints.l1_min_m <= predicted_l1 <= self.optimizer.constraints.l1_max_m else "✗"
-                        summary_rows.append(["Predicted L1 (next)", f"{predicted_l1:.2f} m", f"{l1_status} [{self.optimizer.constraints.l1_min_m:.1f} - {self.optimizer.constraints.l1_max_m:.1f} m]"])
-                        # Check if predicted L1 violates constraints
-                        if predicted_l1 < self.optimizer.constraints.l1_min_m:
-                            violation = self.optimizer.constraints.l1_min_m - predicted_l1
-                            summary_rows.append(["⚠ L1 Violation (below)", f"{violation:.3f} m", f"BELOW MIN ({self.optimizer.constraints.l1_min_m:.2f} m)"])
-                        elif predicted_l1 > self.optimizer.constraints.l1_max_m:
-                            violation = predicted_l1 - self.optimizer.constraints.l1_max_m
-                            summary_rows.append(["⚠ L1 Violation (above)", f"{violation:.3f} m", f"ABOVE MAX ({self.optimizer.constraints.l1_max_m:.2f} m)"])
-                    # Add overall violation summary if any
-                    if opt_result.l1_violations > 0:
-                        summary_rows.append(["⚠ Total Violations", f"{opt_result.l1_violations} steps", f"Max: {opt_result.max_violation_m:.3f} m"])
-                        # Log detailed violation info
-                        logger.warning(f"⚠ Constraint Violations: {opt_result.l1_violations} L1 violations detected (max: {opt_result.max_violation_m:.3f} m)")
-                    log_table(logger, ["Metric", "Value", "Range/Status"], summary_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
+                # Log constraints table now that we have optimization results
+                # Blank line before constraints table
+                self._emit_blank()
+                log_table(logger, ["Constraint", "Value", "Status"], constraints_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
+            
+            # Log optimization result
+            if self._show_tables:
+                if opt_result.success:
+                    # Blank line before schedule table
+                    self._emit_blank()
+                    schedule_rows = []
+                    optimized_pumps = []
+                    total_flow = 0.0
+                    total_power = 0.0
+                    for sched in step0_schedules:
+                        if sched.is_on:
+                            optimized_pumps.append(sched.pump_id)
+                            schedule_rows.append([
+                                sched.pump_id,
+                                f"{sched.frequency_hz:.1f} Hz",
+                                f"{sched.flow_m3_s:.2f} m³/s",
+                                f"{sched.power_kw:.1f} kW"
+                            ])
+                            total_flow += sched.flow_m3_s
+                            total_power += sched.power_kw
+                    
+                    if schedule_rows:
+                        log_table(logger, ["Pump", "Frequency", "Flow", "Power"], schedule_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix, fast=True)
+                        summary_rows = [
+                            ["Active Pumps", f"{len(optimized_pumps)} ({', '.join(optimized_pumps)})"],
+                            ["Total Outflow", f"{total_flow:.2f} m³/s"],
+                            ["Total Power", f"{total_power:.1f} kW"],
+                        ]
+                        if opt_result.l1_trajectory:
+                            predicted_l1 = opt_result.l1_trajectory[0] if len(opt_result.l1_trajectory) > 0 else current_state.l1_m
+                            # Check constraint compliance
+                            l1_status = CHECK_MARK if l1_min <= predicted_l1 <= l1_max else CROSS_MARK
+                            summary_rows.append(["Predicted L1 (next)", f"{predicted_l1:.2f} m", f"{l1_status} {self._l1_bounds_str}"])
+                            # Check if predicted L1 violates constraints
+                            if predicted_l1 < l1_min:
+                                violation = l1_min - predicted_l1
+                                summary_rows.append(["⚠ L1 Violation (below)", f"{violation:.3f} m", f"BELOW MIN ({l1_min:.2f} m)"])
+                            elif predicted_l1 > l1_max:
+                                violation = predicted_l1 - l1_max
+                                summary_rows.append(["⚠ L1 Violation (above)", f"{violation:.3f} m", f"ABOVE MAX ({l1_max:.2f} m)"])
+                        # Add overall violation summary if any
+                        if opt_result.l1_violations > 0:
+                            summary_rows.append(["⚠ Total Violations", f"{opt_result.l1_violations} steps", f"Max: {opt_result.max_violation_m:.3f} m"])
+                            # Log detailed violation info
+                            logger.warning(f"⚠ Constraint Violations: {opt_result.l1_violations} L1 violations detected (max: {opt_result.max_violation_m:.3f} m)")
+                        log_table(logger, ["Metric", "Value", "Range/Status"], summary_rows, width=80, include_header=False, suppress_prefix=self.suppress_prefix)
+                    else:
+                        log_boxed(logger, "OPTIMIZED SCHEDULE", ["No pumps active"], width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
                 else:
-                    log_boxed(logger, "OPTIMIZED SCHEDULE", ["No pumps active"], width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
-            else:
-                log_boxed(logger, "OPTIMIZATION RESULT", ["✗ Optimization failed - using fallback"], width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+                    log_boxed(logger, "OPTIMIZATION RESULT", ["✗ Optimization failed - using fallback"], width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+            elif opt_result.success and opt_result.l1_violations > 0 and any(s.is_on for s in step0_schedules):
+                logger.warning(f"⚠ Constraint Violations: {opt_result.l1_violations} L1 violations detected (max: {opt_result.max_violation_m:.3f} m)")
             
             # Generate explanation for this step if enabled
             explanation = None
             strategy = None
-            if self.generate_explanations and self.llm_explainer:
-                # Get strategic guidance
-                strategic_guidance = self.optimizer.derive_strategic_guidance(forecast)
-                strategy = ", ".join(set(strategic_guidance[:4]))
-                
-                # Blank line before strategy guidance box
-                if self.suppress_prefix:
-                    print()
-                else:
-                    logger.info("")
-                log_boxed(logger, "STRATEGY GUIDANCE", [strategy], width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
-                
-                # Compute metrics for this step
-                metrics = self._compute_step_metrics(opt_result, forecast, current_state)
-                
-                # Build comprehensive state description for LLM
-                pump_state_desc = "; ".join([
-                    f"{pid}: {'ON' if on else 'OFF'}" + (f" @ {freq:.1f}Hz" if on else "")
-                    for pid, on, freq in current_state.pump_states
-                ])
-                
-                current_state_desc = (
-                    f"System State: Tunnel level L1={current_state.l1_m:.2f}m, "
-                    f"Inflow F1={current_state.inflow_m3_s:.2f} m³/s, "
-                    f"Outflow F2={current_state.outflow_m3_s:.2f} m³/s, "
-                    f"Electricity price={current_state.price_c_per_kwh:.1f} c/kWh. "
-                    f"Pump states: {pump_state_desc}"
+            deferred_kwargs = None
+            if self.generate_explanations and not self._explain_disabled:
+                strategy, explanation_kwargs = self._explanation_request(
+                    opt_result, forecast, current_state, strategic_plan
                 )
-                
-                # Generate LLM explanation asynchronously
-                logger.debug("GENERATING LLM EXPLANATION...")
-                try:
-                    explanation = run_async_in_sync(
-                        self.llm_explainer.generate_explanation(
-                            metrics=metrics,
-                            strategic_guidance=strategic_guidance,
-                            current_state_description=current_state_desc,
-                            strategic_plan=strategic_plan,
-                        ),
-                        timeout=15.0
-                    )
-                    # Blank line before LLM explanation box
-                    if self.suppress_prefix:
-                        print()
-                    else:
-                        logger.info("")
-                    # Split explanation by newlines and ensure proper word wrapping
-                    if explanation:
-                        # First split by explicit newlines, then by sentences for better line breaks
-                        # Split by double newlines first (paragraph breaks)
-                        paragraphs = [p.strip() for p in explanation.split('\n\n') if p.strip()]
-                        explanation_lines = []
-                        for para in paragraphs:
-                            # Split each paragraph by newlines (preserve intentional line breaks)
-                            para_lines = [line.strip() for line in para.split('\n') if line.strip()]
-                            for line in para_lines:
-                                # Further split very long lines by sentences for better wrapping
-                                # If a line is very long (>200 chars), split by sentence endings
-                                if len(line) > 200:
-                                    import re
-                                    sentences = re.split(r'([.!?]\s+)', line)
-                                    # Rejoin sentences in pairs to avoid too many short lines
-                                    current_sentence = ""
-                                    for i in range(0, len(sentences), 2):
-                                        if i + 1 < len(sentences):
-                                            sentence = sentences[i] + sentences[i+1]
-                                        else:
-                                            sentence = sentences[i]
-                                        if len(current_sentence) + len(sentence) > 200:
-                                            if current_sentence:
-                                                explanation_lines.append(current_sentence.strip())
-                                            current_sentence = sentence
-                                        else:
-                                            current_sentence += sentence
-                                    if current_sentence:
-                                        explanation_lines.append(current_sentence.strip())
-                                else:
-                                    explanation_lines.append(line)
-                        if not explanation_lines:
-                            explanation_lines = ["❌ No LLM explanation available (no fallback)"]
-                    else:
-                        explanation_lines = ["❌ No LLM explanation available (no fallback)"]
-                    log_boxed(logger, "LLM EXPLANATION", explanation_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
-                except Exception as e:
-                    logger.error(f"  ❌ Failed to generate LLM explanation: {e} - returning None (no fallback)")
-                    explanation = None  # No fallback - return None on error
+                if self.batch_explanations:
+                    # Requested concurrently after the loop (see _generate_deferred_explanations)
+                    deferred_kwargs = explanation_kwargs
+                else:
+                    # Generate LLM explanation asynchronously
+                    logger.debug("GENERATING LLM EXPLANATION...")
+                    try:
+                        explanation = run_async_in_sync(
+                            self.llm_explainer.generate_explanation(**explanation_kwargs),
+                            timeout=15.0,
+                            runner=self._runner,
+                        )
+                        self._log_explanation(explanation)
+                    except Exception as e:
+                        logger.error(f"  ❌ Failed to generate LLM explanation: {e} - returning None (no fallback)")
+                        explanation = None  # No fallback - return None on error
+                    self._track_explanation_outcome(explanation)
             
             # Update currently running pumps (for reference only)
-            if opt_result.success and opt_result.schedules:
-                for schedule in opt_result.schedules:
-                    if schedule.time_step == 0:
-                        pump_id = schedule.pump_id
-                        if schedule.is_on:
-                            currently_running_pumps.add(pump_id)
-                        else:
-                            currently_running_pumps.discard(pump_id)
+            if opt_result.success:
+                for schedule in step0_schedules:
+                    pump_id = schedule.pump_id
+                    if schedule.is_on:
+                        currently_running_pumps.add(pump_id)
+                    else:
+                        currently_running_pumps.discard(pump_id)
+            
+            # First-step energy/cost/outflow (baseline totals were reduced up front)
+            optimized_step = self._reduce_optimized_step(opt_result, current_state)
             
             # Store result
             simulation_result = SimulationResult(
@@ -1109,59 +1663,33 @@ class RollingMPCSimulator:
                 explanation=explanation,
                 strategy=strategy,
                 strategic_plan=strategic_plan,
+                optimized_step=optimized_step,
+                baseline_step=tick_baseline_steps[tick],
             )
             simulation.results.append(simulation_result)
-            
-            # Track trajectories
-            simulation.optimized_l1_trajectory.append(simulated_l1)
-            baseline_state = self.data_loader.get_state_at_time(current_time)
-            if baseline_state:
-                simulation.baseline_l1_trajectory.append(baseline_state.l1_m)
+            if explanation is not None:
+                simulation.num_explanations += 1
+            if deferred_kwargs is not None:
+                pending_explanations.append((step_num, simulation_result, deferred_kwargs))
+            if sink is not None:
+                sink.write(simulation_result)
+                if keep_results is not None and len(simulation.results) > keep_results:
+                    del simulation.results[0]  # Only the previous step feeds the next one
             
             # Check if flush occurred (L1 reached flush_target_level_m)
             # Consider it a flush if L1 is at or below flush target (within 0.1m tolerance)
-            if simulated_l1 <= flush_target + 0.1:
-                if last_flush_time is None or (current_time - last_flush_time).total_seconds() > 3600:  # At least 1h since last flush
+            if simulated_l1 <= flush_level:
+                if last_flush_time is None or current_time - last_flush_time > flush_cooldown:
                     last_flush_time = current_time
-                    logger.debug(f"Flush detected: L1={simulated_l1:.3f}m reached flush target {flush_target}m at {current_time}")
-            
-            # Calculate energy and cost for this time step
-            dt_hours = self.reoptimize_interval_minutes / 60.0
+                    logger.debug("Flush detected: L1=%.3fm reached flush target %sm at %s", simulated_l1, flush_target, current_time)
             
             # Update cumulative pump usage hours for fairness/rotation (only first step of horizon)
             if opt_result.success and opt_result.schedules:
-                for schedule in opt_result.schedules:
-                    if schedule.time_step == 0 and schedule.is_on:
-                        pid = schedule.pump_id
-                        self.pump_usage_hours[pid] = self.pump_usage_hours.get(pid, 0.0) + dt_hours
+                for pid in optimized_step.running_pumps:
+                    self.pump_usage_hours[pid] = self.pump_usage_hours.get(pid, 0.0) + dt_hours
             
-            # Optimized energy/cost (from optimization result, but only for current step)
-            # For rolling simulation, we track cumulative
-            if opt_result.success and opt_result.schedules:
-                # Sum up power from schedules for first time step
-                step_energy = 0.0
-                step_cost = 0.0
-                for schedule in opt_result.schedules:
-                    if schedule.time_step == 0 and schedule.is_on:
-                        step_energy += schedule.power_kw * dt_hours
-                        step_cost += schedule.power_kw * dt_hours * (current_state.price_c_per_kwh / 100.0)
-                
-                simulation.optimized_energy.append(step_energy)
-                simulation.optimized_cost.append(step_cost)
-            else:
-                simulation.optimized_energy.append(0.0)
-                simulation.optimized_cost.append(0.0)
-            
-            # Baseline energy/cost
-            baseline_energy = 0.0
-            baseline_cost = 0.0
-            for pump_id, pump_data in baseline_schedule.items():
-                if pump_data['is_on']:
-                    baseline_energy += pump_data['power_kw'] * dt_hours
-                    baseline_cost += pump_data['power_kw'] * dt_hours * (current_state.price_c_per_kwh / 100.0)
-            
-            simulation.baseline_energy.append(baseline_energy)
-            simulation.baseline_cost.append(baseline_cost)
+            # Track trajectories and this step's energy/cost
+            self._record_step(simulation, simulation_result, simulated_l1, baseline_l1)
             
             # Update simulated L1 for next step (simplified: use historical inflow/outflow change)
             # In real MPC, this would come from executing the schedule
@@ -1170,25 +1698,259 @@ class RollingMPCSimulator:
                 simulated_l1 = opt_result.l1_trajectory[0] if len(opt_result.l1_trajectory) > 0 else simulated_l1
             else:
                 # Fallback: use simple mass balance
-                total_outflow = sum(
-                    s.flow_m3_s for s in opt_result.schedules 
-                    if s.time_step == 0 and s.is_on
-                ) if opt_result.success else current_state.outflow_m3_s
+                total_outflow = optimized_step.outflow_m3_s if opt_result.success else current_state.outflow_m3_s
                 
-                dt_seconds = self.reoptimize_interval_minutes * 60
                 volume_change_m3 = (current_state.inflow_m3_s - total_outflow) * dt_seconds
-                level_change_m = volume_change_m3 / self.optimizer.constraints.tunnel_volume_m3
-                simulated_l1 = max(
-                    self.optimizer.constraints.l1_min_m,
-                    min(self.optimizer.constraints.l1_max_m, simulated_l1 + level_change_m)
-                )
-            
-            # Advance time
-            current_time += timedelta(minutes=self.reoptimize_interval_minutes)
+                level_change_m = volume_change_m3 * self._inv_tunnel_volume_m3
+                simulated_l1 = max(l1_min, min(l1_max, simulated_l1 + level_change_m))
+        
+        self._flush_forecast_warnings(forecast_warnings)
+        if pending_explanations:
+            self._generate_deferred_explanations(simulation, pending_explanations)
         
         return simulation
     
-    def _assess_forecast_quality(self, forecast_errors: Dict) -> Dict:
+    def _tick_times(self, start_time: datetime, end_time: datetime) -> List[datetime]:
+        """Re-optimization times from start_time to end_time (inclusive)."""
+        step = timedelta(minutes=self.reoptimize_interval_minutes)
+        times = []
+        current_time = start_time
+        while current_time <= end_time:
+            times.append(current_time)
+            current_time += step
+        return times
+    
+    def _reduce_optimized_step(
+        self,
+        opt_result: OptimizationResult,
+        current_state: CurrentState,
+    ) -> StepAggregate:
+        """First-step aggregate of the optimized schedule.
+        
+        Args:
+            opt_result: Optimization result of the step
+            current_state: State the step was optimized from (for the price)
+        """
+        return _reduce_first_step(
+            ((s.pump_id, s.flow_m3_s, s.power_kw) for s in opt_result.step0_schedules if s.is_on),
+            self.reoptimize_interval_minutes / 60.0,
+            current_state.price_c_per_kwh / 100.0,
+        )
+    
+    def _reduce_baseline_steps(
+        self,
+        baseline: BaselineSchedules,
+        states: List[Optional[CurrentState]],
+    ) -> List[StepAggregate]:
+        """Per-tick aggregates of the baseline schedules (ticks without a state cost NaN)."""
+        price_eur_per_kwh = np.fromiter(
+            (state.price_c_per_kwh / 100.0 if state is not None else np.nan for state in states),
+            dtype=float,
+            count=len(states),
+        )
+        return _reduce_baseline_steps(baseline, self.reoptimize_interval_minutes / 60.0, price_eur_per_kwh)
+    
+    @staticmethod
+    def _record_step(
+        simulation: RollingSimulation,
+        result: SimulationResult,
+        optimized_l1: float,
+        baseline_l1: float,
+    ) -> None:
+        """Record this step's L1 levels, optimized/baseline energy, cost and outflow, and inflow."""
+        # Optimized energy/cost (from optimization result, but only for current step)
+        if result.optimization_result.success and result.optimization_result.schedules:
+            optimized_energy = result.optimized_step.energy_kwh
+            optimized_cost = result.optimized_step.cost_eur
+        else:
+            optimized_energy = optimized_cost = 0.0
+        simulation.record_step(
+            result.timestamp,
+            optimized_l1,
+            baseline_l1,
+            optimized_energy,
+            result.baseline_step.energy_kwh,
+            optimized_cost,
+            result.baseline_step.cost_eur,
+            result.optimized_step.outflow_m3_s,
+            result.baseline_step.outflow_m3_s,
+            result.current_state.inflow_m3_s,  # Each step's state holds its historical inflow
+        )
+    
+    def simulate_open_loop(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        horizon_minutes: int = 120,
+        max_workers: Optional[int] = None,
+    ) -> RollingSimulation:
+        """Run an open-loop backtest, solving all steps in parallel.
+        
+        Unlike simulate(), each step starts from the recorded plant state
+        (historical L1 and pump states) instead of the previous step's
+        optimized result, so steps are independent and are solved in a
+        process pool. Rotation, flush tracking, strategic plans and
+        explanations are not applied.
+        
+        Args:
+            start_time: Start time for simulation
+            end_time: End time for simulation
+            horizon_minutes: Optimization horizon in minutes (default 120 = 2h)
+            max_workers: Worker processes (default: os.cpu_count())
+        
+        Returns:
+            RollingSimulation with all results
+        """
+        simulation = RollingSimulation(start_time=start_time, end_time=end_time)
+        horizon_steps = horizon_minutes // self.optimizer.time_step_minutes
+        
+        # Phase 1: gather per-step inputs (historical data only)
+        tick_times = self._tick_times(start_time, end_time)
+        steps = [
+            (current_time, current_state, forecast)
+            for current_time, current_state, forecast in zip(
+                tick_times,
+                self.data_loader.get_states_for_range(tick_times, include_pump_states=True),
+                self.data_loader.get_forecasts_for_range(tick_times, horizon_steps, method=self.forecast_method),
+            )
+            if current_state is not None and forecast is not None
+        ]
+        
+        # Phase 2: solve all steps in parallel (results come back in step order)
+        logger.info(f"Solving {len(steps)} open-loop steps with {max_workers or os.cpu_count()} workers...")
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_open_loop_worker,
+            initargs=(self.optimizer,),
+        ) as executor:
+            opt_results = list(executor.map(
+                _solve_open_loop_step,
+                [state for _, state, _ in steps],
+                [forecast for _, _, forecast in steps],
+            ))
+        
+        # Phase 3: serial pass to assemble trajectories and energy/cost
+        baseline = self.data_loader.get_baseline_arrays_for_range([timestamp for timestamp, _, _ in steps])
+        baseline_steps = self._reduce_baseline_steps(baseline, [state for _, state, _ in steps])
+        simulation.reserve(len(steps))
+        for i, ((timestamp, current_state, _), opt_result) in enumerate(zip(steps, opt_results)):
+            result = SimulationResult(
+                timestamp=timestamp,
+                current_state=current_state,
+                optimization_result=opt_result,
+                baseline_schedule=baseline.schedule_at(i),
+                optimized_step=self._reduce_optimized_step(opt_result, current_state),
+                baseline_step=baseline_steps[i],
+            )
+            simulation.results.append(result)
+            if opt_result.success and opt_result.l1_trajectory:
+                optimized_l1 = opt_result.l1_trajectory[0]
+            else:
+                optimized_l1 = current_state.l1_m
+            self._record_step(simulation, result, optimized_l1, current_state.l1_m)
+        
+        return simulation
+    
+    def _generate_deferred_explanations(
+        self,
+        simulation: RollingSimulation,
+        pending: List[Tuple[int, SimulationResult, Dict[str, Any]]],
+    ) -> None:
+        """Request deferred step explanations concurrently and attach them to their results."""
+        logger.info(f"Generating {len(pending)} LLM explanations (concurrency={self.explanation_concurrency})...")
+        try:
+            explanations = run_async_in_sync(
+                self.llm_explainer.explain_many(
+                    [kwargs for _, _, kwargs in pending],
+                    concurrency=self.explanation_concurrency,
+                ),
+                timeout=None,
+                runner=self._runner,
+            )
+        except Exception as e:
+            logger.error(f"  ❌ Failed to generate LLM explanations: {e} - returning None (no fallback)")
+            return
+        
+        for (step_num, result, _), explanation in zip(pending, explanations):
+            result.explanation = explanation
+            if explanation is not None:
+                simulation.num_explanations += 1
+            logger.info(f"Step {step_num} ({result.timestamp.strftime('%Y-%m-%d %H:%M')})")
+            self._log_explanation(explanation)
+    
+    def _run_llm_requests(self, *requests: Tuple[Optional[Coroutine], float]) -> Tuple[Any, ...]:
+        """Await LLM request coroutines concurrently on the run's event loop.
+        
+        Args:
+            requests: (coroutine, timeout in seconds) pairs; each request is
+                bounded by its own timeout, the coroutine may be None
+        
+        Returns:
+            One outcome per request: its result, the exception it raised
+            (TimeoutError past its timeout), or None where no request was given
+        """
+        pending = [(request, timeout) for request, timeout in requests if request is not None]
+        if not pending:
+            return (None,) * len(requests)
+        
+        async def bounded(request: Coroutine, timeout: float) -> Any:
+            try:
+                return await asyncio.wait_for(request, timeout)
+            except asyncio.TimeoutError:
+                raise asyncio.TimeoutError(f"no response within {timeout:g}s") from None
+        
+        async def gather() -> List[Any]:
+            return await asyncio.gather(
+                *(bounded(request, timeout) for request, timeout in pending),
+                return_exceptions=True,
+            )
+        
+        try:
+            outcomes = iter(run_async_in_sync(
+                gather(), timeout=max(timeout for _, timeout in pending), runner=self._runner
+            ))
+        except Exception as e:
+            # e.g. timeout: every request failed
+            outcomes = iter([e] * len(pending))
+        return tuple(next(outcomes) if request is not None else None for request, _ in requests)
+    
+    @staticmethod
+    def _flush_forecast_warnings(warnings: List[str]) -> None:
+        """Log queued forecast-error warnings as one record and clear the queue."""
+        if warnings:
+            logger.warning("\n".join(warnings))
+            warnings.clear()
+    
+    def _track_explanation_outcome(self, explanation: Optional[str]) -> None:
+        """Count consecutive failed explanations and stop requesting them past the limit."""
+        if explanation is not None:
+            self._explain_failures = 0
+            return
+        self._explain_failures += 1
+        if self._explain_failures >= self.explanation_failure_limit:
+            self._explain_disabled = True
+            logger.warning(
+                f"  ⚠ {self._explain_failures} consecutive LLM explanation failures - "
+                f"skipping explanations for the rest of the run"
+            )
+    
+    def _log_explanation(self, explanation: Optional[str]) -> None:
+        """Log an LLM explanation as a boxed, word-wrapped block."""
+        if not self._show_tables:
+            return
+        # Blank line before LLM explanation box
+        self._emit_blank()
+        # Split explanation by newlines and ensure proper word wrapping
+        if explanation:
+            # Keep explicit line breaks; split very long lines (>200 chars) by sentence endings
+            explanation_lines = list(_iter_wrapped_lines(explanation, paragraph_gap=False))
+            if not explanation_lines:
+                explanation_lines = ["❌ No LLM explanation available (no fallback)"]
+        else:
+            explanation_lines = ["❌ No LLM explanation available (no fallback)"]
+        log_boxed(logger, "LLM EXPLANATION", explanation_lines, width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+    
+    def _assess_forecast_quality(self, forecast_errors: Dict[str, _ErrorWindow]) -> Dict:
         """Assess forecast quality based on recent errors.
         
         Returns:
@@ -1197,14 +1959,10 @@ class RollingMPCSimulator:
         if len(forecast_errors['inflow']) == 0:
             return {'quality_level': 'good', 'inflow_mae': 0, 'price_mae': 0, 'l1_mae': 0}
         
-        # Calculate mean absolute errors over recent window
-        recent_inflow_errors = [e[2] for e in forecast_errors['inflow'][-5:]]  # Last 5 steps
-        recent_price_errors = [e[2] for e in forecast_errors['price'][-5:]]
-        recent_l1_errors = [e[2] for e in forecast_errors['l1'][-5:]]
-        
-        inflow_mae = np.mean(recent_inflow_errors) if recent_inflow_errors else 0
-        price_mae = np.mean(recent_price_errors) if recent_price_errors else 0
-        l1_mae = np.mean(recent_l1_errors) if recent_l1_errors else 0
+        # Mean absolute errors over the last 5 steps
+        inflow_mae = forecast_errors['inflow'].recent_mean()
+        price_mae = forecast_errors['price'].recent_mean()
+        l1_mae = forecast_errors['l1'].recent_mean()
         
         # Determine quality level
         # Good: errors < 10%, Fair: 10-25%, Poor: > 25%
@@ -1268,6 +2026,52 @@ class RollingMPCSimulator:
             'l1_max_m': adjusted_max,
         }
     
+    def _explanation_request(
+        self,
+        opt_result: OptimizationResult,
+        forecast: ForecastData,
+        current_state: CurrentState,
+        strategic_plan: Optional[StrategicPlan],
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Log the step's strategy guidance and build its generate_explanation kwargs.
+        
+        Returns:
+            Tuple of (strategy label, keyword arguments for LLMExplainer.generate_explanation)
+        """
+        # Get strategic guidance
+        strategic_guidance = self.optimizer.derive_strategic_guidance(forecast)
+        strategy = ", ".join(dict.fromkeys(strategic_guidance[:4]))  # Dedup, keep forecast order
+        
+        if self._show_tables:
+            # Blank line before strategy guidance box
+            self._emit_blank()
+            log_boxed(logger, "STRATEGY GUIDANCE", [strategy], width=80, include_timestamp=False, suppress_prefix=self.suppress_prefix)
+        
+        # Compute metrics for this step
+        metrics = self._compute_step_metrics(opt_result, forecast, current_state)
+        
+        # Build comprehensive state description for LLM (only reached when an explanation is requested)
+        pump_state_desc = "; ".join([
+            f"{pid}: ON @ {freq:.1f}Hz" if on else f"{pid}: OFF"
+            for pid, on, freq in current_state.pump_states
+        ])
+        
+        current_state_desc = (
+            f"System State: Tunnel level L1={current_state.l1_m:.2f}m, "
+            f"Inflow F1={current_state.inflow_m3_s:.2f} m³/s, "
+            f"Outflow F2={current_state.outflow_m3_s:.2f} m³/s, "
+            f"Electricity price={current_state.price_c_per_kwh:.1f} c/kWh. "
+            f"Pump states: {pump_state_desc}"
+        )
+        
+        explanation_kwargs = dict(
+            metrics=metrics,
+            strategic_guidance=strategic_guidance,
+            current_state_description=current_state_desc,
+            strategic_plan=strategic_plan,
+        )
+        return strategy, explanation_kwargs
+    
     def _compute_step_metrics(
         self,
         result: OptimizationResult,
@@ -1275,38 +2079,113 @@ class RollingMPCSimulator:
         current_state: CurrentState,
     ) -> ScheduleMetrics:
         """Compute metrics for a single optimization step."""
+        # Single pass over the schedules: first-step pumps/outflow and all pumps used
+        num_on_t0 = 0
+        outflow_t0 = 0.0
+        pumps_used = set()
+        for s in result.schedules:
+            if s.is_on:
+                pumps_used.add(s.pump_id)
+                if s.time_step == 0:
+                    num_on_t0 += 1
+                    outflow_t0 += s.flow_m3_s
+        
+        # Forecast prices are already in c/kWh in ForecastData
+        price_range = forecast.price_range()
+        
         if not result.l1_trajectory:
-            # Forecast prices are already in c/kWh in ForecastData
-            min_price = min(forecast.price_c_per_kwh)
-            max_price = max(forecast.price_c_per_kwh)
             return ScheduleMetrics(
                 total_energy_kwh=result.total_energy_kwh,
                 total_cost_eur=result.total_cost_eur,
                 avg_l1_m=current_state.l1_m,
                 min_l1_m=current_state.l1_m,
                 max_l1_m=current_state.l1_m,
-                num_pumps_used=len([s for s in result.schedules if s.time_step == 0 and s.is_on]),
-                avg_outflow_m3_s=sum(s.flow_m3_s for s in result.schedules if s.time_step == 0 and s.is_on),
-                price_range_c_per_kwh=(min_price, max_price),
+                num_pumps_used=num_on_t0,
+                avg_outflow_m3_s=outflow_t0,
+                price_range_c_per_kwh=price_range,
                 risk_level="normal",
                 optimization_mode=result.mode.value,
             )
         
-        min_price = min(forecast.price_c_per_kwh)
-        max_price = max(forecast.price_c_per_kwh)
+        l1 = np.asarray(result.l1_trajectory, dtype=float)
         return ScheduleMetrics(
             total_energy_kwh=result.total_energy_kwh,
             total_cost_eur=result.total_cost_eur,
-            avg_l1_m=sum(result.l1_trajectory) / len(result.l1_trajectory),
-            min_l1_m=min(result.l1_trajectory),
-            max_l1_m=max(result.l1_trajectory),
-            num_pumps_used=len(set(s.pump_id for s in result.schedules if s.is_on)),
-            avg_outflow_m3_s=sum(s.flow_m3_s for s in result.schedules if s.time_step == 0 and s.is_on),
-            price_range_c_per_kwh=(min_price, max_price),
+            avg_l1_m=float(l1.mean()),
+            min_l1_m=float(l1.min()),
+            max_l1_m=float(l1.max()),
+            num_pumps_used=len(pumps_used),
+            avg_outflow_m3_s=outflow_t0,
+            price_range_c_per_kwh=price_range,
             risk_level="normal",
             optimization_mode=result.mode.value,
         )
 
+    @staticmethod
+    def _l1_violations(trajectory: np.ndarray, l1_min: float, l1_max: float) -> Tuple[int, float]:
+        """Count L1 bound violations and find the largest one.
+        
+        Returns:
+            (number of violating steps, signed largest violation in m: negative
+            below l1_min, positive above l1_max, 0.0 if none)
+        """
+        l1 = trajectory
+        below = l1 < l1_min
+        above = l1 > l1_max
+        num_below = int(np.count_nonzero(below))
+        num_above = int(np.count_nonzero(above))
+        # Masked selections only when there is something to select (rare)
+        max_below = float(l1[below].min()) - l1_min if num_below else 0.0
+        max_above = float(l1[above].max()) - l1_max if num_above else 0.0
+        max_violation = max_below if abs(max_below) > abs(max_above) else max_above
+        return num_below + num_above, max_violation
+    
+    @staticmethod
+    def _step_columns(simulation: RollingSimulation) -> StepColumns:
+        """Per-step columns of an untrimmed simulation.
+        
+        Flows come from the recorded series; results appended without record_step
+        (e.g. by DemoSimulator) are reduced from the results themselves.
+        """
+        results = simulation.results
+        optimized_pumps: List[str] = []
+        baseline_pumps: List[str] = []
+        for r in results:
+            optimized_pumps.extend(s.pump_id for s in r.optimization_result.step0_schedules if s.is_on)
+            baseline_pumps.extend(r.baseline_step.running_pumps)
+        if simulation.num_steps == len(results):
+            optimized_outflow = simulation.optimized_outflow
+            baseline_outflow = simulation.baseline_outflow
+            inflow = simulation.inflow
+        else:
+            n = len(results)
+            optimized_outflow = np.fromiter(
+                (sum(s.flow_m3_s for s in r.optimization_result.step0_schedules if s.is_on) for r in results),
+                dtype=float,
+                count=n,
+            )
+            baseline_outflow = np.fromiter((r.baseline_step.outflow_m3_s for r in results), dtype=float, count=n)
+            inflow = np.fromiter((r.current_state.inflow_m3_s for r in results), dtype=float, count=n)
+        return StepColumns(
+            optimized_outflow_m3_s=optimized_outflow,
+            baseline_outflow_m3_s=baseline_outflow,
+            inflow_m3_s=inflow,
+            optimized_running_pumps=optimized_pumps,
+            baseline_running_pumps=baseline_pumps,
+        )
+    
+    @staticmethod
+    def _pump_hours(running_pumps: List[str], dt_hours: float) -> Dict[str, float]:
+        """Operating hours per pump that ran at least one step (in first-seen order)."""
+        pump_ids: Dict[str, int] = {}
+        pump_idx = np.fromiter(
+            (pump_ids.setdefault(pump_id, len(pump_ids)) for pump_id in running_pumps),
+            dtype=np.intp,
+            count=len(running_pumps),
+        )
+        counts = np.bincount(pump_idx, minlength=len(pump_ids))
+        return {pump_id: float(counts[i]) * dt_hours for pump_id, i in pump_ids.items()}
+
     def compare_with_baseline(
         self,
         simulation: RollingSimulation,
@@ -1320,75 +2199,42 @@ class RollingMPCSimulator:
             return {}
         
         # Calculate totals
-        total_optimized_energy = sum(simulation.optimized_energy)
-        total_baseline_energy = sum(simulation.baseline_energy)
-        total_optimized_cost = sum(simulation.optimized_cost)
-        total_baseline_cost = sum(simulation.baseline_cost)
+        total_optimized_energy = float(simulation.optimized_energy.sum())
+        total_baseline_energy = float(simulation.baseline_energy.sum())
+        total_optimized_cost = float(simulation.optimized_cost.sum())
+        total_baseline_cost = float(simulation.baseline_cost.sum())
         
         # Calculate L1 constraint violations
-        optimized_violations = 0
-        baseline_violations = 0
-        optimized_max_violation = 0.0
-        baseline_max_violation = 0.0
-        
         l1_min = self.optimizer.constraints.l1_min_m
         l1_max = self.optimizer.constraints.l1_max_m
         
-        for l1 in simulation.optimized_l1_trajectory:
-            if l1 < l1_min:
-                optimized_violations += 1
-                optimized_max_violation = min(optimized_max_violation, l1 - l1_min)
-            elif l1 > l1_max:
-                optimized_violations += 1
-                optimized_max_violation = max(optimized_max_violation, l1 - l1_max)
-        
-        for l1 in simulation.baseline_l1_trajectory:
-            if l1 < l1_min:
-                baseline_violations += 1
-                baseline_max_violation = min(baseline_max_violation, l1 - l1_min)
-            elif l1 > l1_max:
-                baseline_violations += 1
-                baseline_max_violation = max(baseline_max_violation, l1 - l1_max)
+        optimized_violations, optimized_max_violation = self._l1_violations(
+            simulation.optimized_l1_trajectory, l1_min, l1_max
+        )
+        baseline_violations, baseline_max_violation = self._l1_violations(
+            simulation.baseline_l1_trajectory, l1_min, l1_max
+        )
         
-        # Calculate outflow smoothness (variance)
-        optimized_outflows = []
-        baseline_outflows = []
-        
-        for result in simulation.results:
-            # Get outflow from optimized schedule
-            opt_outflow = sum(
-                s.flow_m3_s for s in result.optimization_result.schedules
-                if s.time_step == 0 and s.is_on
-            )
-            optimized_outflows.append(opt_outflow)
-            
-            # Get baseline outflow
-            baseline_outflow = sum(
-                pump_data['flow_m3_s']
-                for pump_data in result.baseline_schedule.values()
-                if pump_data['is_on']
-            )
-            baseline_outflows.append(baseline_outflow)
+        # Per-step totals were reduced once during the simulation (StepAggregate)
+        dt_hours = self.reoptimize_interval_minutes / 60.0
+        dt_seconds = self.reoptimize_interval_minutes * 60.0
         
-        optimized_smoothness = float(np.var(optimized_outflows)) if optimized_outflows else 0.0
-        baseline_smoothness = float(np.var(baseline_outflows)) if baseline_outflows else 0.0
+        # Per-step columns: streamed back from the sink when results were trimmed
+        if simulation.sink_path is not None:
+            columns = _StepSink.read_columns(simulation.sink_path)
+        else:
+            columns = self._step_columns(simulation)
+        optimized_outflows = columns.optimized_outflow_m3_s
+        baseline_outflows = columns.baseline_outflow_m3_s
         
-        # Calculate pump operating hours
-        optimized_pump_hours: Dict[str, float] = {}
-        baseline_pump_hours: Dict[str, float] = {}
-        dt_hours = self.reoptimize_interval_minutes / 60.0
+        # Calculate outflow smoothness (variance)
+        # Population variance (ddof=0) over the contiguous per-step outflows
+        optimized_smoothness = float(optimized_outflows.var())
+        baseline_smoothness = float(baseline_outflows.var())
         
-        for result in simulation.results:
-            # Optimized
-            for schedule in result.optimization_result.schedules:
-                if schedule.time_step == 0 and schedule.is_on:
-                    pump_id = schedule.pump_id
-                    optimized_pump_hours[pump_id] = optimized_pump_hours.get(pump_id, 0.0) + dt_hours
-            
-            # Baseline
-            for pump_id, pump_data in result.baseline_schedule.items():
-                if pump_data['is_on']:
-                    baseline_pump_hours[pump_id] = baseline_pump_hours.get(pump_id, 0.0) + dt_hours
+        # Calculate pump operating hours
+        optimized_pump_hours = self._pump_hours(columns.optimized_running_pumps, dt_hours)
+        baseline_pump_hours = self._pump_hours(columns.baseline_running_pumps, dt_hours)
         
         # Calculate specific energy (kWh/m³)
         # Use mass balance: Total Volume Pumped = Total Inflow - Change in Tunnel Storage
@@ -1396,12 +2242,7 @@ class RollingMPCSimulator:
         # (only differ by tunnel storage changes)
         
         # Calculate total inflow over the period
-        total_inflow_volume = 0.0
-        for result in simulation.results:
-            # Get inflow for this time step
-            current_state = self.data_loader.get_state_at_time(result.timestamp)
-            if current_state:
-                total_inflow_volume += current_state.inflow_m3_s * dt_hours * 3600  # Convert to m³
+        total_inflow_volume = float(columns.inflow_m3_s.sum()) * dt_seconds  # Convert to m³
         
         # Calculate tunnel storage change
         # Tunnel area = tunnel_volume / L1_range = 50000 / 8 = 6250 m²
@@ -1409,10 +2250,10 @@ class RollingMPCSimulator:
         
         # Get initial and final L1 for both trajectories
         if len(simulation.optimized_l1_trajectory) > 0 and len(simulation.baseline_l1_trajectory) > 0:
-            optimized_l1_initial = simulation.optimized_l1_trajectory[0]
-            optimized_l1_final = simulation.optimized_l1_trajectory[-1]
-            baseline_l1_initial = simulation.baseline_l1_trajectory[0]
-            baseline_l1_final = simulation.baseline_l1_trajectory[-1]
+            optimized_l1_initial = float(simulation.optimized_l1_trajectory[0])
+            optimized_l1_final = float(simulation.optimized_l1_trajectory[-1])
+            baseline_l1_initial = float(simulation.baseline_l1_trajectory[0])
+            baseline_l1_final = float(simulation.baseline_l1_trajectory[-1])
             
             # Storage change = (L1_final - L1_initial) × tunnel_area
             optimized_storage_change = (optimized_l1_final - optimized_l1_initial) * tunnel_area_m2
@@ -1423,14 +2264,8 @@ class RollingMPCSimulator:
             total_baseline_volume = total_inflow_volume - baseline_storage_change
         else:
             # Fallback to summing flows if trajectories not available
-            total_optimized_volume = sum(
-                sum(s.flow_m3_s * dt_hours * 3600 for s in result.optimization_result.schedules if s.time_step == 0 and s.is_on)
-                for result in simulation.results
-            )
-            total_baseline_volume = sum(
-                sum(pump_data['flow_m3_s'] * dt_hours * 3600 for pump_data in result.baseline_schedule.values() if pump_data['is_on'])
-                for result in simulation.results
-            )
+            total_optimized_volume = float(optimized_outflows.sum()) * dt_seconds
+            total_baseline_volume = float(baseline_outflows.sum()) * dt_seconds
         
         optimized_specific_energy = (
             total_optimized_energy / total_optimized_volume 
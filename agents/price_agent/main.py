@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import bisect
+import threading
+import time
+from operator import itemgetter
 from datetime import datetime, timedelta, date
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from agents.common import BaseMCPAgent
 
@@ -35,10 +39,22 @@ class ElectricityPriceAgent(BaseMCPAgent):
     fetching data from the Nord Pool spot market.
     """
     
+    # Seconds before a failed or empty day (e.g. tomorrow before the ~14:00 EET
+    # publish time) is fetched from Nord Pool again
+    MISSING_DAY_RETRY_S = 600.0
+    
     def __init__(self) -> None:
         super().__init__(name="electricity-price-agent")
         # Initialize the Nord Pool client, specifying EUR currency
         self.spot_prices = prices.Prices(currency="EUR")
+        # Hourly prices per (delivery date, area); a published day never changes
+        self._hourly_cache: Dict[Tuple[date, str], List[dict]] = {}
+        # Monotonic time until which a failed or empty day is not fetched again
+        self._hourly_retry_at: Dict[Tuple[date, str], float] = {}
+        # One lock per (delivery date, area): the HTTP bridge calls get_forecast from
+        # worker threads, and concurrent misses of a day share one fetch without
+        # blocking requests for other days
+        self._hourly_locks: Dict[Tuple[date, str], threading.Lock] = {}
 
     def configure(self) -> None:
         """
@@ -46,6 +62,46 @@ class ElectricityPriceAgent(BaseMCPAgent):
         """
         self.register_tool("get_electricity_price_forecast", self.get_forecast)
 
+    def _fetch_hourly(self, day: date, area: str, end_date: Optional[date] = None) -> List[dict]:
+        """
+        Hourly price values for one delivery day, fetched from Nord Pool once.
+        
+        Failed or empty fetches are not cached; requests within
+        MISSING_DAY_RETRY_S of one raise LookupError without calling Nord Pool.
+        """
+        key = (day, area)
+        values = self._hourly_cache.get(key)
+        if values is not None:
+            return values
+        with self._hourly_locks.setdefault(key, threading.Lock()):
+            # Another thread may have fetched (or failed to fetch) it while we waited
+            values = self._hourly_cache.get(key)
+            if values is not None:
+                return values
+            if time.monotonic() < self._hourly_retry_at.get(key, 0.0):
+                raise LookupError(f"{area} prices for {day} not available yet")
+            try:
+                if end_date is None:
+                    data = self.spot_prices.hourly(areas=[area])
+                else:
+                    data = self.spot_prices.hourly(end_date=end_date, areas=[area])
+                values = data['areas'][area]['values']
+            except Exception:
+                self._hourly_retry_at[key] = time.monotonic() + self.MISSING_DAY_RETRY_S
+                raise
+            if not values:
+                self._hourly_retry_at[key] = time.monotonic() + self.MISSING_DAY_RETRY_S
+                return values
+            self._hourly_retry_at.pop(key, None)
+            # Drop days that are already over before adding the new one
+            for stale in list(self._hourly_locks):
+                if stale[0] < day - timedelta(days=1):
+                    self._hourly_cache.pop(stale, None)
+                    self._hourly_locks.pop(stale, None)
+                    self._hourly_retry_at.pop(stale, None)
+            self._hourly_cache[key] = values
+        return values
+
     def get_forecast(self, request: PriceRequest) -> List[PricePoint]:
         """
         Implementation of the 'get_electricity_price_forecast' tool.
@@ -63,8 +119,7 @@ class ElectricityPriceAgent(BaseMCPAgent):
         # 1. Fetch today's prices
         try:
             # We fetch for the 'FI' (Finland) bidding area
-            today_data = self.spot_prices.hourly(areas=['FI'])
-            all_prices_data.extend(today_data['areas']['FI']['values'])
+            all_prices_data.extend(self._fetch_hourly(now.date(), 'FI'))
         except Exception as e:
             # This can happen if prices for today aren't published yet (e.g., late night)
             print(f"Warning: Could not fetch today's prices: {e}")
@@ -73,25 +128,21 @@ class ElectricityPriceAgent(BaseMCPAgent):
         # Note: These are typically published by Nord Pool around 14:00 EET
         try:
             tomorrow_date = now.date() + timedelta(days=1)
-            tomorrow_data = self.spot_prices.hourly(end_date=tomorrow_date, areas=['FI'])
-            all_prices_data.extend(tomorrow_data['areas']['FI']['values'])
+            all_prices_data.extend(self._fetch_hourly(tomorrow_date, 'FI', end_date=tomorrow_date))
         except Exception as e:
             # This is normal if it's before the ~14:00 publish time
             print(f"Info: Could not fetch tomorrow's prices (may not be published yet): {e}")
 
         # 3. Filter the combined data to match the request
-        forecast_points = []
-        for price_data in all_prices_data:
-            # 'value' is the price in C/kWh
-            # 'start_time' is a datetime object
-            price_timestamp = price_data['start_time']
-            price_value = price_data['value']
-            
-            # Ensure the data is within our requested time window
-            if price_timestamp >= now and price_timestamp <= end_date_needed:
-                forecast_points.append(
-                    PricePoint(timestamp=price_timestamp, eur_mwh=price_value)
-                )
+        # Today's then tomorrow's hours are in time order, so the requested window
+        # is one contiguous slice: bisect on 'start_time' (a datetime object)
+        lo = bisect.bisect_left(all_prices_data, now, key=itemgetter('start_time'))
+        hi = bisect.bisect_right(all_prices_data, end_date_needed, lo=lo, key=itemgetter('start_time'))
+        # 'value' is the price in C/kWh
+        forecast_points = [
+            PricePoint(timestamp=price_data['start_time'], eur_mwh=price_data['value'])
+            for price_data in all_prices_data[lo:hi]
+        ]
 
         print(f"Found {len(forecast_points)} price points for the requested period.")
         return forecast_points
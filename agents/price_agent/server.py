@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from typing import List
 
 from fastapi import FastAPI, HTTPException
@@ -23,7 +24,8 @@ async def health() -> dict[str, str]:
 @app.post("/price/forecast", response_model=List[PricePoint])
 async def price_forecast(request: PriceRequest) -> List[PricePoint]:
     try:
-        return _agent.get_forecast(request)
+        # Nord Pool is fetched with a blocking client: keep it off the event loop
+        return await asyncio.to_thread(_agent.get_forecast, request)
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -44,6 +44,11 @@ class SystemStatusAgent(BaseMCPAgent):
     replacing the synthetic data previously returned by this agent.
     """
     
+    # Synthetic pump states (validation copies the dicts into each payload)
+    _PUMPS_TEMPLATE = tuple(
+        {"pump_id": f"P{i+1}", "frequency_hz": 48.0, "state": "on"} for i in range(8)
+    )
+    
     def __init__(self) -> None:
         super().__init__(name="system-status-agent")
         import warnings
@@ -66,14 +71,13 @@ class SystemStatusAgent(BaseMCPAgent):
         For production use, call the backend API endpoint /system/state
         which uses the digital twin for real-time data.
         """
-        now = datetime.utcnow()
         return SystemStatePayload(
-            timestamp=now,
+            timestamp=datetime.utcnow(),
             tunnel_level_m=3.4,
             tunnel_level_l2_m=3.1,
             inflow_m3_s=2.2,
             outflow_m3_s=2.0,
-            pumps=[{"pump_id": f"P{i+1}", "frequency_hz": 48.0, "state": "on"} for i in range(8)],
+            pumps=list(self._PUMPS_TEMPLATE),
         )
 
     def get_tunnel_volume(self, request: TunnelVolumeRequest) -> float:
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import time
 from datetime import datetime, timedelta
 from typing import List
 
@@ -34,6 +36,10 @@ class WeatherProviderError(RuntimeError):
 
 class WeatherAgent(BaseMCPAgent):
     MAX_LOOKAHEAD_HOURS = 72
+    # OpenWeatherMap current conditions update roughly every 10 minutes
+    CURRENT_WEATHER_TTL_S = 300.0
+    # Offsets of the hourly forecast points, shared by every request
+    _HOUR_DELTAS = tuple(timedelta(hours=i) for i in range(MAX_LOOKAHEAD_HOURS))
 
     def __init__(
         self,
@@ -44,34 +50,110 @@ class WeatherAgent(BaseMCPAgent):
         super().__init__(name="weather-agent")
         self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
         self.base_url = base_url.rstrip("/")
+        # Pooled keep-alive client, created lazily on the serving event loop
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        # Current weather per location as (monotonic fetch time, point), and one
+        # lock per location so concurrent misses share a single upstream call
+        self._current_cache: dict[str, tuple[float, WeatherPoint]] = {}
+        self._current_locks: dict[str, asyncio.Lock] = {}
 
     def configure(self) -> None:  # noqa: D401
         self.register_tool("get_precipitation_forecast", self.get_precipitation_forecast)
 
-    def get_precipitation_forecast(self, request: WeatherRequest) -> List[WeatherPoint]:
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET with the pooled client of the event loop that opened it.
+
+        httpx connections are bound to the event loop that opened them; calls
+        from any other loop use a client scoped to the request, so no open
+        client is left behind on a loop that may be closed afterwards.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop.is_closed():
+            self._client = self._new_client()
+            self._client_loop = loop
+        if self._client_loop is loop:
+            return await self._client.get(url, **kwargs)
+        async with self._new_client() as client:
+            return await client.get(url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    async def get_precipitation_forecast(self, request: WeatherRequest) -> List[WeatherPoint]:
         hours = min(request.lookahead_hours, self.MAX_LOOKAHEAD_HOURS)
-        current_point = self._fetch_openweather_current(location=request.location)
+        current_point = await self._fetch_openweather_current(location=request.location)
         base_timestamp = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        # Every field is copied from the already validated current point
         return [
-            WeatherPoint(
-                timestamp=base_timestamp + timedelta(hours=i),
+            WeatherPoint.model_construct(
+                timestamp=base_timestamp + delta,
                 precipitation_mm=current_point.precipitation_mm,
                 temperature_c=current_point.temperature_c,
             )
-            for i in range(hours)
+            for delta in self._HOUR_DELTAS[:hours]
         ]
 
-    def _fetch_openweather_current(self, *, location: str) -> WeatherPoint:
+    async def _fetch_openweather_current(self, *, location: str, force_refresh: bool = False) -> WeatherPoint:
+        """Current weather for a location, reusing a fetch younger than CURRENT_WEATHER_TTL_S.
+
+        force_refresh=True always calls the upstream API (health checks use it).
+        """
+        if not force_refresh:
+            cached = self._cached_current(location)
+            if cached is not None:
+                return cached
+        lock = self._current_locks.setdefault(location, asyncio.Lock())
+        async with lock:
+            if not force_refresh:
+                # Another request may have fetched it while we waited
+                cached = self._cached_current(location)
+                if cached is not None:
+                    return cached
+            point = await self._request_openweather_current(location=location)
+            now = time.monotonic()
+            self._prune_current_cache(now)
+            self._current_cache[location] = (now, point)
+            return point
+
+    def _cached_current(self, location: str) -> WeatherPoint | None:
+        entry = self._current_cache.get(location)
+        if entry is not None and time.monotonic() - entry[0] < self.CURRENT_WEATHER_TTL_S:
+            return entry[1]
+        return None
+
+    def _prune_current_cache(self, now: float) -> None:
+        """Drop expired locations (and their idle locks) so the cache stays small."""
+        for location in [
+            key for key, (fetched_at, _) in self._current_cache.items()
+            if now - fetched_at >= self.CURRENT_WEATHER_TTL_S
+        ]:
+            del self._current_cache[location]
+            lock = self._current_locks.get(location)
+            if lock is not None and not lock.locked():
+                del self._current_locks[location]
+
+    async def _request_openweather_current(self, *, location: str) -> WeatherPoint:
         """Call OpenWeatherMap's current weather endpoint per the official guide and normalize data."""
         api_key = self._require_api_key()
-        url = f"{self.base_url}/weather"
         params = {
             **self._build_location_params(location),
             "appid": api_key,
             "units": "metric",
         }
         try:
-            response = httpx.get(url, params=params, timeout=httpx.Timeout(10.0))
+            response = await self._get("/weather", params=params)
             response.raise_for_status()
         except httpx.HTTPError as exc:
             raise WeatherProviderError(f"OpenWeatherMap request failed: {exc}") from exc
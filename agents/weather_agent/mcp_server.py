@@ -32,7 +32,7 @@ mcp = FastMCP(NAME, log_level="INFO", port=port, host="0.0.0.0")
 
 
 @mcp.tool()
-def get_precipitation_forecast(
+async def get_precipitation_forecast(
     lookahead_hours: int = 24,
     location: str = "Helsinki",
 ) -> List[Dict[str, Any]]:
@@ -50,7 +50,7 @@ def get_precipitation_forecast(
             lookahead_hours=lookahead_hours,
             location=location,
         )
-        weather_points = _weather_agent.get_precipitation_forecast(request)
+        weather_points = await _weather_agent.get_precipitation_forecast(request)
         
         # Convert WeatherPoint objects to dictionaries for JSON serialization
         return [
@@ -70,7 +70,7 @@ def get_precipitation_forecast(
 
 
 @mcp.tool()
-def get_current_weather(location: str = "Helsinki") -> Dict[str, Any]:
+async def get_current_weather(location: str = "Helsinki") -> Dict[str, Any]:
     """Get current weather conditions for a location.
     
     Args:
@@ -80,7 +80,7 @@ def get_current_weather(location: str = "Helsinki") -> Dict[str, Any]:
         Current weather point with timestamp, precipitation_mm, temperature_c
     """
     try:
-        current_point = _weather_agent._fetch_openweather_current(location=location)
+        current_point = await _weather_agent._fetch_openweather_current(location=location)
         return {
             "timestamp": current_point.timestamp.isoformat(),
             "precipitation_mm": current_point.precipitation_mm,
@@ -102,7 +102,7 @@ def get_current_weather(location: str = "Helsinki") -> Dict[str, Any]:
 
 
 @mcp.tool()
-def check_weather_agent_health() -> Dict[str, Any]:
+async def check_weather_agent_health() -> Dict[str, Any]:
     """Check if weather agent is healthy and can fetch weather data.
     
     Returns:
@@ -111,7 +111,7 @@ def check_weather_agent_health() -> Dict[str, Any]:
     try:
         # Try to fetch current weather to verify connectivity
         test_location = "Helsinki"
-        current_point = _weather_agent._fetch_openweather_current(location=test_location)
+        current_point = await _weather_agent._fetch_openweather_current(location=test_location, force_refresh=True)
         
         return {
             "status": "healthy",
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from typing import List
 
 from fastapi import FastAPI, HTTPException
@@ -11,11 +12,21 @@ from agents.weather_agent.main import (
     WeatherRequest,
 )
 
-app = FastAPI(title="Weather Agent HTTP Bridge", version="0.1.0")
 _agent = WeatherAgent()
 _agent.configure()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):  # noqa: ARG001
+    try:
+        yield
+    finally:
+        await _agent.aclose()
+
+
+app = FastAPI(title="Weather Agent HTTP Bridge", version="0.1.0", lifespan=lifespan)
+
+
 @app.get("/health", summary="Liveness probe")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
@@ -24,7 +35,7 @@ async def health() -> dict[str, str]:
 @app.post("/weather/forecast", response_model=List[WeatherPoint])
 async def weather_forecast(request: WeatherRequest) -> List[WeatherPoint]:
     try:
-        return _agent.get_precipitation_forecast(request)
+        return await _agent.get_precipitation_forecast(request)
     except WeatherProviderError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 